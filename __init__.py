@@ -1 +1 @@
-from .lib import writer, json_deconstructor, json_formatter,csv_file_manager, csv_transformer
\ No newline at end of file
+from .lib import writer, json_deconstructor, json_formatter, json_table,csv_file_manager, csv_transformer, json_streamer, json_traverser, batch_writer, dataframe_backend, table_sink, id_generator, schema_cache, json_lines, json_array, metrics
\ No newline at end of file
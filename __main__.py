@@ -0,0 +1,4 @@
+from .lib.batch_writer import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""
+Module: batch_writer
+Package Path: json_to_csv\lib\batch_writer.py
+
+This module provides a class for converting many JSON files to table CSV files in parallel, and the
+command line interface of the package.
+
+Class
+------------------
+    1. `batch_writer`: This class converts a batch of JSON files over a process pool and merges the tables.
+
+Function
+------------------
+    1. `main`: This function runs the command line interface.
+
+"""
+from . import writer, csv_file_manager
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import csv
+import glob
+import io
+import os
+import shutil
+
+def _convert_file(task):
+    """
+    Converts one JSON file to table CSV files in a worker process.
+
+    Args:
+        task (tuple): The source file path, the output directory, the ID prefix and the options of the
+            table_writer.
+
+    Returns:
+        list: The names of the tables written for the file.
+    """
+    source_path, output_path, id_prefix, has_random_id, is_streaming = task
+    os.makedirs(output_path, exist_ok=True)
+    with open(source_path, encoding='utf-8') as source_file:
+        table = writer.table_writer(source_file, output_path, has_random_id=has_random_id,
+                                    is_streaming=is_streaming, id_prefix=id_prefix)
+        table.transform()
+        table.write_to_file()
+    return sorted(name[:-4] for name in os.listdir(output_path) if name.endswith('.csv'))
+
+def _header_bytes(header):
+    buffer = io.StringIO(newline='')
+    csv.writer(buffer).writerow(header)
+    return buffer.getvalue().encode('utf-8')
+
+class batch_writer:
+    """
+    A class for converting a batch of JSON files to table CSV files over a process pool.
+
+    Each file is converted by a worker process with `table_writer`. The sequential IDs of a file are
+    prefixed with the index of the file in the sorted batch, so the IDs are deterministic and do not
+    collide between files. The per-file tables are then merged into one CSV file per table, or kept
+    in one folder per file.
+
+    Attributes
+    ------------------
+        - __source_files (list): The sorted paths of the JSON files in the batch.
+        - __output_path (str): The output path for the CSV files.
+        - __max_workers (int): The maximum number of worker processes.
+        - __has_random_id (bool): Flag to indicate whether to use random IDs for records.
+        - __is_streaming (bool): Flag to indicate whether the workers parse the files incrementally.
+        - __is_merged (bool): Flag to indicate whether the per-file tables are merged into one CSV file per table.
+
+    Methods
+    ------------------
+    1. `write_to_file(self)`:
+    - Method to convert the files and write the CSV files.
+    - Returns: None
+
+    Properties
+    ------------------
+        - source_files (list): Property to access the sorted paths of the JSON files in the batch.
+
+    Typical Usage
+    ------------------
+    1. Create an instance of `batch_writer` with a glob pattern or a folder of JSON files and an output path.
+    2. Call the `write_to_file` method to convert the files.
+
+    Example:
+    >>> batch = batch_writer('./test/src/*.json', './test/result', max_workers=4)
+    >>> batch.write_to_file()
+    >>> # The tables of all files are written to './test/result/<table>.csv'.
+    """
+    def __init__(self, source, output_path: str, max_workers: int = None, has_random_id: bool = False,
+                 is_streaming: bool = False, is_merged: bool = True):
+        """
+        Initializes a batch_writer instance with the source files and configuration options.
+
+        Args:
+            source (str or list): A glob pattern, a folder which is searched for '*.json' files recursively,
+                or a list of file paths.
+            output_path (str): The output path for the CSV files.
+            max_workers (int): The maximum number of worker processes (default is the number of CPUs).
+            has_random_id (bool): Flag to indicate whether to use random IDs for records.
+            is_streaming (bool): Flag to indicate whether the workers parse the files incrementally.
+            is_merged (bool): Flag to indicate whether the per-file tables are merged into one CSV file
+                per table (default is True). If it is False, the tables of each file are written to a
+                folder named after the path of the file without its extension, relative to the common
+                folder of the files, and the files whose folders would be the same are rejected.
+
+        Returns: None
+
+        Example: None
+        """
+        if isinstance(source, (list, tuple)):
+            source_files = list(source)
+        elif os.path.isdir(source):
+            source_files = glob.glob(os.path.join(source, '**', '*.json'), recursive=True)
+        else:
+            source_files = glob.glob(source, recursive=True)
+
+        self.__source_files = sorted(source_files)
+        self.__output_path = output_path
+        self.__max_workers = max_workers
+        self.__has_random_id = has_random_id
+        self.__is_streaming = is_streaming
+        self.__is_merged = is_merged
+        if not is_merged and self.__source_files:
+            folders = {}
+            for path, folder in zip(self.__source_files, self.__file_paths()):
+                folder = os.path.normcase(folder)
+                if folder in folders:
+                    raise ValueError("The tables of '" + folders[folder] + "' and '" + path + "' would be written to the same folder.")
+                folders[folder] = path
+
+    def __file_paths(self):
+        common_path = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in self.__source_files])
+        return [os.path.join(self.__output_path, os.path.splitext(os.path.relpath(os.path.abspath(path), common_path))[0])
+                for path in self.__source_files]
+
+    def write_to_file(self):
+        """
+        Method to convert the files over the process pool and write the CSV files.
+
+        Args: None
+
+        Returns: None
+
+        Example: None
+        """
+        if not self.__source_files:
+            return
+
+        os.makedirs(self.__output_path, exist_ok=True)
+        if self.__is_merged:
+            shard_path = os.path.join(self.__output_path, '.shards')
+            # The shards of an interrupted run would be merged with the tables of this run.
+            shutil.rmtree(shard_path, ignore_errors=True)
+            shard_paths = [os.path.join(shard_path, str(index)) for index in range(len(self.__source_files))]
+        else:
+            shard_paths = self.__file_paths()
+
+        tasks = [(path, shard_paths[index], str(index) + "_", self.__has_random_id, self.__is_streaming)
+                 for index, path in enumerate(self.__source_files)]
+        with ProcessPoolExecutor(max_workers=self.__max_workers) as executor:
+            shard_tables = list(executor.map(_convert_file, tasks))
+
+        if not self.__is_merged:
+            return
+
+        tables = {}
+        for index, names in enumerate(shard_tables):
+            for name in names:
+                tables.setdefault(name, []).append(os.path.join(shard_paths[index], name + '.csv'))
+
+        for name, paths in tables.items():
+            self.__merge_table(os.path.join(self.__output_path, name + '.csv'), paths)
+        shutil.rmtree(shard_path)
+
+    def __merge_table(self, file_name, paths):
+        headers = []
+        for path in paths:
+            with open(path, newline='', encoding='utf-8') as shard_file:
+                headers.append(next(csv.reader(shard_file), []))
+
+        if all(header == headers[0] for header in headers):
+            with open(file_name, 'wb') as merged_file:
+                for index, path in enumerate(paths):
+                    with open(path, 'rb') as shard_file:
+                        if index > 0:
+                            shard_file.seek(len(_header_bytes(headers[index])))
+                        shutil.copyfileobj(shard_file, merged_file)
+            return
+
+        merged_header = list(dict.fromkeys(key for header in headers for key in header))
+        with csv_file_manager.csv_file_manager(file_name, 'w') as csv_editor:
+            csv_editor.writerow(merged_header)
+            for path in paths:
+                with open(path, newline='', encoding='utf-8') as shard_file:
+                    for row in csv.DictReader(shard_file):
+                        csv_editor.writerow([row.get(key, '') for key in merged_header])
+
+    @property
+    def source_files(self) -> list:
+        """
+        Property to access the sorted paths of the JSON files in the batch.
+
+        Returns:
+            list: The sorted paths of the JSON files.
+
+        Example: None
+        """
+        return self.__source_files
+
+def main(argv=None):
+    """
+    Runs the command line interface which converts a batch of JSON files to table CSV files.
+
+    Args:
+        argv (list): The command line arguments (default is sys.argv[1:]).
+
+    Returns: None
+
+    Example:
+    ```
+    python -m json_to_csv ./data/*.json ./result --workers 8
+    ```
+    """
+    parser = argparse.ArgumentParser(prog='json_to_csv', description="Convert JSON files to table CSV files in parallel.")
+    parser.add_argument('source', help="A glob pattern or a folder of JSON files.")
+    parser.add_argument('output_path', help="The output path for the CSV files.")
+    parser.add_argument('--workers', type=int, default=None, help="The maximum number of worker processes.")
+    parser.add_argument('--random-id', action='store_true', help="Use random IDs for records.")
+    parser.add_argument('--streaming', action='store_true', help="Parse the files incrementally.")
+    parser.add_argument('--per-file', action='store_true', help="Keep the tables of each file in a folder named after the file.")
+    args = parser.parse_args(argv)
+
+    try:
+        batch = batch_writer(args.source, args.output_path, max_workers=args.workers, has_random_id=args.random_id,
+                             is_streaming=args.streaming, is_merged=not args.per_file)
+    except ValueError as error:
+        parser.error(str(error))
+    batch.write_to_file()
@@ -4,12 +4,17 @@ package path: lib\csv_file_manager.py
 
 This module provides a CSV file management class for reading and writing CSV files.
 
-Class
+Classes
 ------------------
     1. `csv_file_manager`: This class provides methods for creating and managing CSV files.
+    2. `csv_batch_sink`: This class writes the rows of many CSV files in batches with a bounded number of open files.
 
 """
+import collections
 import csv
+import itertools
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
 class csv_file_manager:
     """
     A utility class for managing CSV files using the CSV module.
@@ -21,15 +26,19 @@ class csv_file_manager:
     ------------------
         - __file_name (str): The name of the CSV file to be managed.
         - __mode (str): The file access mode, which can be 'w', 'w+', 'a', or 'a+'.
+        - __encoding (str): The encoding of the CSV file.
+        - __buffer_size (int): The size of the write buffer of the CSV file in bytes.
         - __editor: A CSV writer instance used to write data to the CSV file.
         
     Methods
     ------------------
-    1. `__init__(self, file_name: str, mode: str)`: 
+    1. `__init__(self, file_name: str, mode: str, encoding: str = 'utf-8', buffer_size: int = DEFAULT_BUFFER_SIZE)`: 
     - Constructor to initialize the CSV file manager.
     - Arguments:
         - `file_name` (str): The name of the CSV file.
         - `mode` (str): The mode for opening the file ('w', 'w+', 'a', 'a+').
+        - `encoding` (str): The encoding of the CSV file.
+        - `buffer_size` (int): The size of the write buffer of the CSV file in bytes.
     - Returns: None
 
     2. `__enter__(self) -> csv.writer or None`:
@@ -60,13 +69,18 @@ class csv_file_manager:
     ...     writer.writerow(['Bob', 30])
     >>> # 'example.csv' is closed after the context block.
     """
-    def __init__(self, file_name, mode):
+    def __init__(self, file_name, mode, encoding: str = 'utf-8', buffer_size: int = DEFAULT_BUFFER_SIZE):
         """
         Initializes a csv_file_manager instance with the specified file name and mode.
 
+        The file is opened with `newline=''`, as the csv module requires, so the rows end with '\r\n'
+        on every platform.
+
         Args:
             file_name (str): The name of the CSV file to work with.
             mode (str): The file access mode ('r' for read, 'w' for write, 'a' for append, etc.).
+            encoding (str): The encoding of the CSV file (default is 'utf-8').
+            buffer_size (int): The size of the write buffer of the CSV file in bytes (default is 1 MiB).
         
         Returns: None
 
@@ -74,6 +88,8 @@ class csv_file_manager:
         """
         self.__file_name = file_name
         self.__mode = mode
+        self.__encoding = encoding
+        self.__buffer_size = buffer_size
         self.__editor = None
 
     def __enter__(self):
@@ -89,7 +105,7 @@ class csv_file_manager:
         >>> with csv_file_manager('example.csv', 'w') as writer:
         ...     # Perform write operations using 'writer' within this block.
         """
-        self.__file = open(self.__file_name, self.__mode)
+        self.__file = open(self.__file_name, self.__mode, buffering=self.__buffer_size, encoding=self.__encoding, newline='')
         if self.__mode in ['w', 'w+', 'a', 'a+']:
             self.__editor = csv.writer(self.__file)
         return self.__editor
@@ -113,3 +129,162 @@ class csv_file_manager:
         >>> # 'example.csv' is closed after the context block.
         """
         self.__file.close()
+
+class csv_batch_sink:
+    """
+    A class for writing the rows of many CSV files in batches with a bounded number of open files.
+
+    The rows of each file are collected in a batch and written with one `writerows` call when the
+    batch is full. At most `max_open_files` files are open at the same time. When another file has
+    to be opened, the least recently written file is closed, and it is opened again in the append
+    mode when its next batch is written.
+
+    Attributes
+    ------------------
+        - __max_open_files (int): The maximum number of files which are open at the same time.
+        - __batch_size (int): The number of rows which are written to a file at once.
+        - __encoding (str): The encoding of the CSV files.
+        - __buffer_size (int): The size of the write buffer of each open file in bytes.
+        - __batches (dict): The rows which are not written yet, mapped by the file names.
+        - __open_files (collections.OrderedDict): The open files and their CSV writers, mapped by the file
+          names from the least to the most recently written.
+        - __created_files (set): The names of the files which are created by the sink.
+
+    Methods
+    ------------------
+    1. `writerow(self, file_name: str, row)`:
+    - Method to add a row to a file.
+    - Returns: None
+
+    2. `writerows(self, file_name: str, rows)`:
+    - Method to add rows to a file.
+    - Returns: None
+
+    3. `close(self)`:
+    - Method to write the remaining rows and close all files.
+    - Returns: None
+
+    Typical Usage
+    ------------------
+    1. Create an instance of csv_batch_sink and use it as a context manager.
+    2. Add the rows of each file with `writerow` or `writerows`.
+    3. The remaining rows are written and the files are closed upon exiting the context block.
+
+    Example:
+    >>> with csv_batch_sink(max_open_files=2) as sink:
+    ...     sink.writerow('lion.csv', ['name', 'age'])
+    ...     sink.writerow('tiger.csv', ['name'])
+    ...     sink.writerow('bear.csv', ['name'])
+    ...     sink.writerow('lion.csv', ['leo', 12])
+    >>> # The files are complete after the context block.
+    """
+    def __init__(self, max_open_files: int = 64, batch_size: int = 1024, encoding: str = 'utf-8', buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Initializes a csv_batch_sink instance.
+
+        Args:
+            max_open_files (int): The maximum number of files which are open at the same time (default is 64).
+            batch_size (int): The number of rows which are written to a file at once (default is 1024).
+            encoding (str): The encoding of the CSV files (default is 'utf-8').
+            buffer_size (int): The size of the write buffer of each open file in bytes (default is 1 MiB).
+
+        Returns: None
+
+        Example: None
+        """
+        if max_open_files < 1:
+            raise ValueError("The maximum number of open files must be at least 1.")
+
+        self.__max_open_files = max_open_files
+        self.__batch_size = batch_size
+        self.__encoding = encoding
+        self.__buffer_size = buffer_size
+        self.__batches = {}
+        self.__open_files = collections.OrderedDict()
+        self.__created_files = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def writerow(self, file_name: str, row):
+        """
+        Method to add a row to a file. The file is created when its first batch is written.
+
+        Args:
+            file_name (str): The name of the CSV file.
+            row: The values of the row.
+
+        Returns: None
+
+        Example: None
+        """
+        batch = self.__batches.get(file_name)
+        if batch is None:
+            batch = self.__batches[file_name] = []
+        batch.append(row)
+        if len(batch) >= self.__batch_size:
+            self.__write_batch(file_name)
+
+    def writerows(self, file_name: str, rows):
+        """
+        Method to add rows to a file, which are written in chunks of the batch size.
+
+        Args:
+            file_name (str): The name of the CSV file.
+            rows: The rows to add.
+
+        Returns: None
+
+        Example: None
+        """
+        rows = iter(rows)
+        batch = self.__batches.get(file_name)
+        if batch is None:
+            batch = self.__batches[file_name] = []
+        while True:
+            batch.extend(itertools.islice(rows, self.__batch_size - len(batch)))
+            if len(batch) < self.__batch_size:
+                return
+            self.__write_batch(file_name)
+
+    def close(self):
+        """
+        Method to write the remaining rows and close all files.
+
+        Args: None
+
+        Returns: None
+
+        Example: None
+        """
+        try:
+            for file_name, batch in self.__batches.items():
+                if batch or file_name not in self.__created_files:
+                    self.__write_batch(file_name)
+        finally:
+            while self.__open_files:
+                self.__open_files.popitem(last=False)[1][0].close()
+
+    def __write_batch(self, file_name):
+        batch = self.__batches[file_name]
+        self.__editor(file_name).writerows(batch)
+        batch.clear()
+
+    def __editor(self, file_name):
+        open_file = self.__open_files.get(file_name)
+        if open_file is not None:
+            self.__open_files.move_to_end(file_name)
+            return open_file[1]
+
+        if len(self.__open_files) >= self.__max_open_files:
+            self.__open_files.popitem(last=False)[1][0].close()
+
+        mode = 'a' if file_name in self.__created_files else 'w'
+        csv_file = open(file_name, mode, buffering=self.__buffer_size, encoding=self.__encoding, newline='')
+        self.__created_files.add(file_name)
+        editor = csv.writer(csv_file)
+        self.__open_files[file_name] = (csv_file, editor)
+        return editor
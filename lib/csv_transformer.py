@@ -10,7 +10,52 @@ Class
 
 """
 from abc import ABC, abstractmethod
+from . import json_streamer
+import codecs
+import io
 import json
+import mmap
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Every digit is masked as '0' and every other byte as ' ', so that the runs of digits are found
+# with bytes.find, which is much faster on large files than a regular expression.
+_DIGIT_MASK = bytes(ord('0') if chr(byte).isdigit() and byte < 128 else ord(' ') for byte in range(256))
+_LONG_RUN = b'0' * 19
+_NUMBER_PARTS = frozenset(b'.eE+')
+_SCAN_CHUNK_SIZE = 1 << 22
+_SCAN_OVERLAP = 64
+
+def _has_long_integer(buffer) -> bool:
+    # orjson reads the integers beyond 64 bits as floats, so the documents which may have one are
+    # parsed by the json module, which keeps them as integers. A run of 19 digits is an integer
+    # unless it follows a decimal point or an exponent; the runs in strings are counted too. The
+    # buffer is masked in overlapping chunks, so a run which crosses a chunk boundary starts in the
+    # overlap of the next chunk.
+    size = len(buffer)
+    for chunk_start in range(0, size, _SCAN_CHUNK_SIZE):
+        scan_start = max(chunk_start - _SCAN_OVERLAP, 0)
+        chunk = buffer[scan_start:chunk_start + _SCAN_CHUNK_SIZE]
+        masked = chunk.translate(_DIGIT_MASK)
+        index = masked.find(_LONG_RUN)
+        while index != -1:
+            # A run near the start of an overlap was already checked with its context in the previous chunk.
+            if index >= 2 or scan_start == 0:
+                previous = chunk[index - 1] if index > 0 else None
+                if previous == ord('-'):
+                    if index < 2 or chunk[index - 2] not in b'eE':
+                        return True
+                elif previous not in _NUMBER_PARTS:
+                    return True
+            run_end = masked.find(b' ', index)
+            if run_end == -1:
+                break
+            index = masked.find(_LONG_RUN, run_end)
+    return False
 
 class csv_transformer(ABC):
     """
@@ -66,13 +111,17 @@ class csv_transformer(ABC):
     >>> transformer.write_to_file()
     """
 
-    def __init__(self, source_data: dict, output_path: str = ''):
+    def __init__(self, source_data: dict, output_path: str = '', copy: bool = True):
         """
         Initializes a csv_transformer instance with the source JSON data.
 
         Args:
             source_data (dict): The source JSON data to be transformed into CSV format.
             output_path (str): The output path for the CSV file (default is '').
+            copy (bool): Flag to indicate whether a dict, list or tuple source is deep-copied, with the
+                same result as a JSON round trip but without a depth limit (default is True). If it is
+                False, the source is used as it is after a validation walk, and the tuples inside it are
+                replaced with lists in place.
 
         Returns: None
 
@@ -85,17 +134,197 @@ class csv_transformer(ABC):
         decoder = json.JSONDecoder(object_pairs_hook=self.__checking_duplicate_value)
 
         if type(source_data).__name__== 'TextIOWrapper':
-            self.__source_data = json.load(source_data)
+            start = source_data.tell() if source_data.seekable() else None
+            mapped_file = self.__map_file(source_data) if start == 0 else None
+            if mapped_file is not None:
+                with mapped_file:
+                    self.__source_data = self.__load_mapped_file(mapped_file)
+                source_data.seek(0, io.SEEK_END)
+                return
+
+            try:
+                self.__source_data = json.load(source_data)
+            except RecursionError:
+                if start is None:
+                    raise
+                source_data.seek(start)
+                self.__source_data = json_streamer.json_event_parser(source_data).load()
         elif type(source_data).__name__== 'dict' or type(source_data).__name__== 'list':
-            self.__source_data = json.loads(json.dumps(source_data))
+            if copy:
+                self.__source_data = self.__copy_json(source_data)
+            else:
+                self.__source_data = self.__validate_json(source_data)
         elif type(source_data).__name__ == 'tuple':
             to_dict = dict( (key ,value) for key,value in source_data)
-            self.__source_data = json.loads(json.dumps(to_dict))
+            if copy:
+                self.__source_data = self.__copy_json(to_dict)
+            else:
+                self.__source_data = self.__validate_json(to_dict)
         elif type(source_data).__name__== 'str':
-            self.__source_data = decoder.decode(source_data)
+            try:
+                self.__source_data = decoder.decode(source_data)
+            except RecursionError:
+                self.__source_data = json_streamer.json_event_parser(source_data).load(self.__checking_duplicate_value)
         else:
             raise TypeError("The source data must be a dict or a file-like object.")
 
+    def __map_file(self, source_file):
+        """
+        Memory-maps a UTF-8 source file which is read from its start, or returns None if the file
+        cannot be mapped, so that it is read by `json.load`.
+        """
+        try:
+            file_number = source_file.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+        if codecs.lookup(source_file.encoding).name != 'utf-8' or os.fstat(file_number).st_size == 0:
+            return None
+
+        mapped_file = mmap.mmap(file_number, 0, access=mmap.ACCESS_READ)
+        if mapped_file[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8:
+            # json.load rejects the byte order mark of a text file, which the mapped bytes would hide.
+            mapped_file.close()
+            return None
+        return mapped_file
+
+    def __load_mapped_file(self, mapped_file):
+        """
+        Parses a memory-mapped source file with orjson if it is installed, and with the json module
+        otherwise. The documents which orjson rejects or would read differently, such as NaN, lone
+        surrogates, very deep nesting or integers beyond 64 bits, are parsed by the json module, so
+        the result is always the same as the result of `json.load`.
+        """
+        if orjson is not None and not _has_long_integer(mapped_file):
+            try:
+                with memoryview(mapped_file) as view:
+                    return orjson.loads(view)
+            except orjson.JSONDecodeError:
+                pass
+
+        text = mapped_file[:].decode('utf-8')
+        try:
+            return json.loads(text)
+        except RecursionError:
+            return json_streamer.json_event_parser(text).load()
+
+    def __validate_json(self, source_data):
+        """
+        Walks the source data without recursion and checks that it only contains JSON types.
+
+        Tuples and subclasses of the JSON types are replaced in their containers with the plain
+        type that a JSON round trip would produce, and non-string keys are converted to strings.
+        The source data is returned without being copied.
+        """
+        primitive_types = frozenset((str, int, float, bool, type(None)))
+        container_types = frozenset((dict, list))
+        if type(source_data) is dict:
+            self.__validate_keys(source_data)
+        path = {id(source_data)}
+        stack = [(source_data, iter(source_data.items()) if type(source_data) is dict else enumerate(source_data), id(source_data))]
+
+        while stack:
+            container, items, container_id = stack[-1]
+            for key, value in items:
+                value_type = type(value)
+                if value_type in primitive_types:
+                    continue
+
+                # The original object is on the path, because a converted subclass is a new object.
+                value_id = id(value)
+                if value_type not in container_types:
+                    if isinstance(value, (dict, list, tuple)):
+                        value = dict(value) if isinstance(value, dict) else list(value)
+                    elif isinstance(value, (str, int, float)):
+                        value = json.loads(json.dumps(value))
+                        container[key] = value
+                        continue
+                    else:
+                        raise TypeError("Object of type %s is not JSON serializable" % value_type.__name__)
+                    container[key] = value
+
+                if value_id in path:
+                    raise ValueError("Circular reference detected")
+                path.add(value_id)
+                if type(value) is dict:
+                    self.__validate_keys(value)
+                    stack.append((value, iter(value.items()), value_id))
+                else:
+                    stack.append((value, enumerate(value), value_id))
+                break
+            else:
+                path.discard(container_id)
+                stack.pop()
+
+        return source_data
+
+    def __copy_json(self, source_data):
+        """
+        Deep-copies the source data without recursion, with the same result as a JSON round trip.
+
+        The copy is walked with the same explicit stack as `__validate_json`, so it has no depth
+        limit. Tuples are copied as lists, the subclasses of the JSON types as their plain type, and
+        the non-string keys as strings, and a value which is reached twice is copied twice.
+        """
+        primitive_types = frozenset((str, int, float, bool, type(None)))
+        source_copy = {} if isinstance(source_data, dict) else []
+        path = {id(source_data)}
+        stack = [(source_data, source_copy, self.__json_items(source_data))]
+
+        while stack:
+            container, container_copy, items = stack[-1]
+            is_dict = type(container_copy) is dict
+            for key, value in items:
+                value_type = type(value)
+                if value_type in primitive_types:
+                    pass
+                elif isinstance(value, (dict, list, tuple)):
+                    if id(value) in path:
+                        raise ValueError("Circular reference detected")
+                    path.add(id(value))
+                    value_copy = {} if isinstance(value, dict) else []
+                    if is_dict:
+                        container_copy[key] = value_copy
+                    else:
+                        container_copy.append(value_copy)
+                    stack.append((value, value_copy, self.__json_items(value)))
+                    break
+                elif isinstance(value, (str, int, float)):
+                    value = json.loads(json.dumps(value))
+                else:
+                    raise TypeError("Object of type %s is not JSON serializable" % value_type.__name__)
+
+                if is_dict:
+                    container_copy[key] = value
+                else:
+                    container_copy.append(value)
+            else:
+                path.discard(id(container))
+                stack.pop()
+
+        return source_copy
+
+    def __json_items(self, container):
+        if not isinstance(container, dict):
+            return enumerate(container)
+        if all(type(key) is str for key in container):
+            return iter(container.items())
+        for key in container:
+            if not isinstance(key, (str, int, float, bool, type(None))):
+                raise TypeError("keys must be str, int, float, bool or None, not %s" % type(key).__name__)
+        return ((key if type(key) is str else json.dumps(key), value) for key, value in container.items())
+
+    def __validate_keys(self, json_object):
+        if all(type(key) is str for key in json_object):
+            return
+
+        items = []
+        for key, value in json_object.items():
+            if not isinstance(key, (str, int, float, bool, type(None))):
+                raise TypeError("keys must be str, int, float, bool or None, not %s" % type(key).__name__)
+            items.append((key if type(key) is str else json.dumps(key), value))
+        json_object.clear()
+        json_object.update(items)
+
     def __checking_duplicate_value(self,pairs):
         result = dict()
         for key,val in pairs:
@@ -0,0 +1,92 @@
+"""
+Module: dataframe_backend
+Package Path: json_to_csv\lib\dataframe_backend.py
+
+This module provides an optional pandas backend for building the transformed tables as DataFrames,
+mainly for `to_dataframes`, which hands the tables to pandas without a CSV round trip. The DataFrames
+keep the values as Python objects, so that the CSV files written by pandas are the same as the files
+of the csv backend, and writing them is slower than with csv.writer. The backend is a convenience for
+the callers which work with pandas, not a faster way to write the files. pandas is imported only when
+one of the functions is called, so the package works without pandas as long as the backend is not used.
+
+Function
+------------------
+    1. `table_to_dataframe`: This function builds a DataFrame from a formatted table.
+    2. `records_to_dataframe`: This function builds a DataFrame from a list of records.
+    3. `write_csv`: This function writes a DataFrame to a CSV file in the format of csv_file_manager.
+
+"""
+from . import csv_file_manager
+
+def _import_pandas():
+    try:
+        import pandas
+    except ImportError as error:
+        raise ImportError("The pandas backend requires pandas. Install it with 'pip install pandas'.") from error
+    return pandas
+
+def table_to_dataframe(table, missing=None, dtype=None):
+    """
+    Builds a DataFrame from a formatted table, one column array for each field.
+
+    Args:
+        table (json_table.json_table): The formatted table.
+        missing: The value of the missing fields (default is None).
+        dtype: The data type of the columns, or None to let pandas infer it (default is None).
+
+    Returns:
+        pandas.DataFrame: The table with the columns in header order.
+
+    Example:
+    >>> formatter = json_formatter.json_formatter()
+    >>> formatter.json_to_object_list(source_data)
+    >>> frame = table_to_dataframe(formatter.tables['lion'])
+    """
+    pandas = _import_pandas()
+    header = table.header
+    columns = zip(*table.iter_rows(missing)) if len(table) > 0 else [[] for _ in header]
+    return pandas.DataFrame({key: list(column) for key, column in zip(header, columns)}, columns=header, dtype=dtype)
+
+def records_to_dataframe(records: list, header: list, dtype=None):
+    """
+    Builds a DataFrame from a list of records, with the values of each record in header order.
+
+    Args:
+        records (list): The records as dictionaries.
+        header (list): The fields of the columns.
+        dtype: The data type of the columns, or None to let pandas infer it (default is None).
+
+    Returns:
+        pandas.DataFrame: The records with the columns in header order.
+
+    Example:
+    >>> frame = records_to_dataframe([{"name": "leo", "meal": 6}], ["name", "meal"])
+    """
+    pandas = _import_pandas()
+    return pandas.DataFrame([[record[key] for key in header] for record in records], columns=header, dtype=dtype)
+
+def write_csv(frame, file_name: str):
+    """
+    Writes a DataFrame to a CSV file in the format of csv_file_manager.
+
+    The file is opened in the same way as csv_file_manager opens it, and the rows are terminated
+    with '\\r\\n' like the rows of csv.writer, so the CSV files of both backends are the same for the
+    same data when the DataFrame keeps the values as Python objects.
+
+    pandas writes None and NaN alike as missing values, while csv.writer writes None as an empty
+    field and NaN as 'nan'. The Nones are written as empty strings, and the NaNs as 'nan'.
+
+    Args:
+        frame (pandas.DataFrame): The DataFrame to write.
+        file_name (str): The name of the CSV file.
+
+    Returns: None
+
+    Example: None
+    """
+    nulls = frame.isna().any()
+    if nulls.any():
+        frame = frame.assign(**{key: frame[key].mask([value is None for value in frame[key]], '')
+                                for key in frame.columns[nulls.values]})
+    with open(file_name, 'w', buffering=csv_file_manager.DEFAULT_BUFFER_SIZE, encoding='utf-8', newline='') as csv_file:
+        frame.to_csv(csv_file, index=False, lineterminator='\r\n', na_rep='nan')
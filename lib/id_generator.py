@@ -0,0 +1,375 @@
+"""
+Module: id_generator
+Package Path: json_to_csv\lib\id_generator.py
+
+This module provides the ID strategies for the records and references of the random ID mode.
+
+Classes
+------------------
+    1. `id_generator`: This class is the base class of the ID strategies.
+    2. `uuid_id_generator`: This class generates random UUID4 strings.
+    3. `random_id_generator`: This class generates seeded random 64-bit or 128-bit IDs in batches.
+    4. `content_id_generator`: This class generates IDs from the content and the position of the values.
+    5. `snowflake_id_generator`: This class generates time-ordered 64-bit snowflake IDs in batches.
+
+Function
+------------------
+    1. `get_id_generator`: This function returns the ID generator of an ID strategy.
+
+"""
+from abc import ABC, abstractmethod
+from . import json_traverser
+import hashlib
+import json
+import os
+import random
+import time
+import uuid
+
+class id_generator(ABC):
+    """
+    The base class of the ID strategies of the random ID mode.
+
+    An ID generator returns a new ID for a record or a reference. It receives the table name, the
+    parent ID, the position of the value under its parent (a key or an index) and the value itself,
+    which the strategies may use or ignore.
+
+    Attributes
+    ------------------
+        - is_content_based (bool): Flag to indicate whether the IDs depend on the values, which must then
+          be complete when an ID is requested.
+        - max_workers (int): The number of worker IDs which `for_worker` accepts, or None if it is not limited.
+
+    Methods
+    ------------------
+    1. `next_id(self, table_name: str, parent_id: str, position, value) -> str`:
+    - Method to generate a new ID.
+    - Arguments:
+        - `table_name` (str): The name of the table of the record.
+        - `parent_id` (str): The ID of the parent record.
+        - `position`: The key or the index of the value under its parent.
+        - `value`: The value of the record or the reference.
+    - Returns:
+        - str: The new ID.
+
+    2. `for_worker(self, worker_id: int) -> id_generator`:
+    - Method to get the ID generator of a worker process, whose IDs do not collide with the IDs of the
+      other workers.
+    - Arguments:
+        - `worker_id` (int): The index of the worker.
+    - Returns:
+        - id_generator: The ID generator of the worker.
+
+    Typical Usage
+    ------------------
+    1. Create an instance of a subclass of `id_generator`.
+    2. Pass it as the `id_strategy` of `table_writer` or the `id_generator` of `json_formatter`.
+
+    Example:
+    >>> writer = table_writer(source_data, output_path, id_strategy=random_id_generator(seed=7))
+    """
+    is_content_based = False
+    max_workers = None
+
+    @abstractmethod
+    def next_id(self, table_name: str, parent_id: str, position, value) -> str:
+        pass
+
+    def for_worker(self, worker_id: int) -> 'id_generator':
+        # The strategies whose IDs are unique in any process are shared by the workers as they are.
+        return self
+
+class uuid_id_generator(id_generator):
+    """
+    A class for generating random UUID4 strings, the IDs of the random ID mode before the strategies.
+
+    Example:
+    >>> len(uuid_id_generator().next_id('lion', '', 0, None))
+    36
+    """
+    def next_id(self, table_name: str, parent_id: str, position, value) -> str:
+        return str(uuid.uuid4())
+
+class random_id_generator(id_generator):
+    """
+    A class for generating seeded random 64-bit or 128-bit IDs in batches.
+
+    The IDs are drawn from a Mersenne Twister generator, `batch_size` IDs at a time from one large
+    random number, and formatted as lowercase hexadecimal strings. Without a seed, the generator is
+    seeded from `os.urandom`, so the IDs of different runs and processes do not collide. With a
+    seed, the same seed gives the same IDs for the same data, so the IDs are reproducible. The
+    generator of a worker process is seeded from the seed and the worker ID, so the copies of one
+    generator sent to several workers do not repeat the same IDs.
+
+    Attributes
+    ------------------
+        - __seed (int): The seed of the IDs, or None.
+        - __random (random.Random): The seeded random number generator.
+        - __bits (int): The number of bits of each ID, 64 or 128.
+        - __batch_size (int): The number of IDs generated at a time.
+        - __batch (iterator): The remaining IDs of the current batch.
+
+    Example:
+    >>> generator = random_id_generator(seed=7)
+    >>> generator.next_id('lion', '', 0, None)
+    '298c21ba5a4775f8ec97d7e1030a7221'
+    """
+    def __init__(self, seed: int = None, bits: int = 128, batch_size: int = 1024):
+        """
+        Initializes a random_id_generator instance.
+
+        Args:
+            seed (int): The seed of the IDs, or None to seed from `os.urandom` (default is None).
+            bits (int): The number of bits of each ID, 64 or 128 (default is 128).
+            batch_size (int): The number of IDs generated at a time (default is 1024).
+
+        Returns: None
+
+        Example: None
+        """
+        if bits not in (64, 128):
+            raise ValueError("The number of bits of the IDs must be 64 or 128.")
+
+        self.__seed = seed
+        self.__random = random.Random(seed if seed is not None else int.from_bytes(os.urandom(32), 'big'))
+        self.__bits = bits
+        self.__batch_size = batch_size
+        self.__batch = iter(())
+
+    def next_id(self, table_name: str, parent_id: str, position, value) -> str:
+        new_id = next(self.__batch, None)
+        if new_id is None:
+            width = self.__bits // 4
+            digits = format(self.__random.getrandbits(self.__bits * self.__batch_size), '0' + str(width * self.__batch_size) + 'x')
+            self.__batch = iter([digits[index:index + width] for index in range(0, len(digits), width)])
+            new_id = next(self.__batch)
+        return new_id
+
+    def for_worker(self, worker_id: int) -> id_generator:
+        seed = None
+        if self.__seed is not None:
+            seed = int.from_bytes(hashlib.blake2b((str(self.__seed) + ':' + str(worker_id)).encode(), digest_size=32).digest(), 'big')
+        return random_id_generator(seed, self.__bits, self.__batch_size)
+
+class content_id_generator(id_generator):
+    """
+    A class for generating IDs from the content and the position of the values.
+
+    The ID of a value is a BLAKE2b hash of its table name, its parent ID, its position under the
+    parent and the Merkle digest of its content, so the same data always gets the same IDs, in any
+    run and any process, while the values at different positions get different IDs. The digest of
+    each object and array is computed once, from the digests of its children, and memoized, so the
+    whole data is hashed only once although an ID is requested for every nested value.
+
+    Attributes
+    ------------------
+        - __digest_size (int): The number of bytes of each ID.
+        - __memo (dict): The digests of the objects and arrays, mapped by their `id()`.
+
+    Example:
+    >>> generator = content_id_generator()
+    >>> generator.next_id('lion', 'root_0', 'lion', {"name": "leo"}) == generator.next_id('lion', 'root_0', 'lion', {"name": "leo"})
+    True
+    """
+    is_content_based = True
+
+    def __init__(self, digest_size: int = 16):
+        """
+        Initializes a content_id_generator instance.
+
+        Args:
+            digest_size (int): The number of bytes of each ID (default is 16).
+
+        Returns: None
+
+        Example: None
+        """
+        self.__digest_size = digest_size
+        self.__memo = {}
+
+    def next_id(self, table_name: str, parent_id: str, position, value) -> str:
+        return hashlib.blake2b(b''.join((_encode(table_name), _encode(parent_id), _encode(position), self.digest(value))),
+                               digest_size=self.__digest_size).hexdigest()
+
+    def clear(self):
+        """
+        Method to forget the memoized digests, and the values which they keep alive.
+
+        Args: None
+
+        Returns: None
+
+        Example: None
+        """
+        self.__memo = {}
+
+    def digest(self, value) -> bytes:
+        """
+        Method to compute the Merkle digest of a value.
+
+        Args:
+            value: The JSON value.
+
+        Returns:
+            bytes: The digest of the value.
+
+        Example: None
+        """
+        if type(value) is not dict and type(value) is not list:
+            return hashlib.blake2b(_encode(value), digest_size=self.__digest_size).digest()
+
+        memo = self.__memo.get(id(value))
+        if memo is not None and memo[0] is value:
+            return memo[1]
+
+        # Most objects and arrays only hold scalars or hashed values, so they are hashed directly, and
+        # the traversal is only needed for the nested values which are not hashed yet.
+        digest = self.__hash_node(value)
+        if digest is None:
+            json_traverser.traverse(self.__digest_node(value))
+            digest = self.__memo[id(value)][1]
+        return digest
+
+    def __digest_node(self, value):
+        memo = self.__memo
+        for child in (value.values() if type(value) is dict else value):
+            if type(child) is dict or type(child) is list:
+                child_memo = memo.get(id(child))
+                if child_memo is None or child_memo[0] is not child:
+                    yield self.__digest_node(child)
+        self.__hash_node(value)
+
+    def __hash_node(self, value):
+        memo = self.__memo
+        is_dict = type(value) is dict
+        parts = [b'd' if is_dict else b'l']
+        for key, child in (value.items() if is_dict else enumerate(value)):
+            if is_dict:
+                parts.append(_encode(key))
+            if type(child) is dict or type(child) is list:
+                child_memo = memo.get(id(child))
+                if child_memo is None or child_memo[0] is not child:
+                    return None
+                parts.append(b'h')
+                parts.append(child_memo[1])
+            else:
+                parts.append(_encode(child))
+        digest = hashlib.blake2b(b''.join(parts), digest_size=self.__digest_size).digest()
+        # The value is kept with its digest, so that its id() cannot be reused by another object.
+        memo[id(value)] = (value, digest)
+        return digest
+
+def _encode(value) -> bytes:
+    # A self-delimiting encoding of a scalar value, which tells the JSON types apart.
+    value_type = type(value)
+    if value_type is str:
+        encoded = value.encode('utf-8', 'surrogatepass')
+        return b's' + str(len(encoded)).encode() + b':' + encoded
+    if value_type is bool:
+        return b't' if value else b'f'
+    if value is None:
+        return b'n'
+    if value_type is int:
+        return b'i' + str(value).encode() + b';'
+    if value_type is float:
+        return b'r' + repr(value).encode() + b';'
+    return b'o' + json.dumps(value).encode('utf-8') + b';'
+
+class snowflake_id_generator(id_generator):
+    """
+    A class for generating time-ordered 64-bit snowflake IDs in batches.
+
+    An ID is made of the milliseconds since the epoch (41 bits), the worker ID (10 bits) and a
+    sequence number (12 bits), and formatted as a decimal string. A batch of IDs takes the
+    sequence numbers of one millisecond, and the next batch starts at a later millisecond, so the
+    IDs of a worker never repeat even when more than 4096 IDs are generated in a millisecond.
+    Different processes must use different worker IDs. The default worker ID is taken from the
+    process ID, which only tells apart the processes of one host whose IDs differ modulo 1024, so
+    the processes of several hosts must be given explicit worker IDs. The multi-process mode of
+    `table_writer` gives the generator of each chunk the index of the chunk as its worker ID.
+
+    Attributes
+    ------------------
+        - __worker_id (int): The worker ID of the process, from 0 to 1023.
+        - __epoch (int): The epoch of the timestamps in milliseconds since 1970.
+        - __batch_size (int): The number of IDs generated at a time, at most 4096.
+        - __last_timestamp (int): The timestamp of the last batch.
+        - __batch (iterator): The remaining IDs of the current batch.
+
+    Example:
+    >>> generator = snowflake_id_generator(worker_id=3)
+    >>> int(generator.next_id('lion', '', 0, None)) >> 12 & 0x3FF
+    3
+    """
+    max_workers = 0x400
+
+    def __init__(self, worker_id: int = None, epoch: int = 1288834974657, batch_size: int = 4096):
+        """
+        Initializes a snowflake_id_generator instance.
+
+        Args:
+            worker_id (int): The worker ID of the process, from 0 to 1023, or None to take it from the
+                process ID modulo 1024 (default is None).
+            epoch (int): The epoch of the timestamps in milliseconds since 1970 (default is the epoch of
+                the Twitter snowflake IDs).
+            batch_size (int): The number of IDs generated at a time, at most 4096 (default is 4096).
+
+        Returns: None
+
+        Example: None
+        """
+        if worker_id is None:
+            worker_id = os.getpid() & 0x3FF
+        if not 0 <= worker_id <= 0x3FF:
+            raise ValueError("The worker ID must be from 0 to 1023.")
+        if not 1 <= batch_size <= 0x1000:
+            raise ValueError("The batch size must be from 1 to 4096.")
+
+        self.__worker_id = worker_id
+        self.__epoch = epoch
+        self.__batch_size = batch_size
+        self.__last_timestamp = -1
+        self.__batch = iter(())
+
+    def next_id(self, table_name: str, parent_id: str, position, value) -> str:
+        new_id = next(self.__batch, None)
+        if new_id is None:
+            timestamp = max(time.time_ns() // 1000000 - self.__epoch, self.__last_timestamp + 1)
+            self.__last_timestamp = timestamp
+            base = (timestamp << 22) | (self.__worker_id << 12)
+            self.__batch = iter([str(base | sequence) for sequence in range(self.__batch_size)])
+            new_id = next(self.__batch)
+        return new_id
+
+    def for_worker(self, worker_id: int) -> id_generator:
+        return snowflake_id_generator(worker_id, self.__epoch, self.__batch_size)
+
+ID_STRATEGIES = {
+    'uuid': uuid_id_generator,
+    'random': random_id_generator,
+    'content': content_id_generator,
+    'snowflake': snowflake_id_generator,
+}
+
+def get_id_generator(id_strategy):
+    """
+    Returns the ID generator of an ID strategy.
+
+    Args:
+        id_strategy (str or id_generator): The name of the ID strategy, 'sequence', 'uuid', 'random',
+            'content' or 'snowflake', or an instance of an `id_generator` subclass, which is returned as
+            it is.
+
+    Returns:
+        id_generator: The ID generator, or None for the sequential IDs.
+
+    Example:
+    >>> generator = get_id_generator('snowflake')
+    """
+    if isinstance(id_strategy, id_generator):
+        return id_strategy
+    if id_strategy == 'sequence':
+        return None
+    if id_strategy not in ID_STRATEGIES:
+        raise ValueError("The ID strategy must be one of sequence, " + ", ".join(ID_STRATEGIES) + " or an id_generator instance.")
+    return ID_STRATEGIES[id_strategy]()
@@ -0,0 +1,166 @@
+"""
+Module: json_array
+Package Path: json_to_csv\lib\json_array.py
+
+This module provides the multi-process conversion of a source file which holds one large
+top-level array. The raw bytes of the file are scanned for the boundaries of the items of the
+array, without parsing the items, and the chunks of items between the boundaries are converted
+by a process pool with `json_lines.write_chunks`.
+
+Function
+------------------
+    1. `is_json_array`: This function checks whether a source file holds a top-level array.
+    2. `split_json_array`: This function splits the top-level array of a file into chunks of whole items.
+    3. `write_json_array`: This function converts the chunks of the top-level array of a file over a process pool.
+
+"""
+from . import json_lines, json_streamer
+import json
+import mmap
+import os
+import re
+
+_WHITESPACE = b' \t\r\n'
+
+# A token is either a whole string or a bracket or a comma. The strings are consumed whole, so the
+# brackets and the commas in them are never taken for structure, and the scan is linear.
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{},]', re.S)
+
+def _first_byte(mapped_file, start: int = 0) -> int:
+    position = start
+    size = len(mapped_file)
+    while position < size and mapped_file[position] in _WHITESPACE:
+        position += 1
+    return position
+
+def is_json_array(path: str) -> bool:
+    """
+    Checks whether a source file holds a top-level array, from its first byte which is not whitespace.
+
+    Args:
+        path (str): The path of the source file.
+
+    Returns:
+        bool: True if the file starts with an array.
+
+    Example:
+    >>> is_json_array('./test/src/orders.json')
+    True
+    """
+    with open(path, 'rb') as source_file:
+        head = source_file.read(4096).lstrip(_WHITESPACE)
+    return head[:1] == b'['
+
+def split_json_array(path: str, count: int) -> tuple:
+    """
+    Splits the top-level array of a file into chunks of whole items of about the same size.
+
+    The bytes are scanned in one pass by a tokenizer which consumes the strings whole, so the
+    depth of the brackets is tracked without parsing the items. A chunk ends at a comma of the
+    top-level array after an object or an array which ends at or after its share of the file, so
+    the arrays of scalars are not split. The commas of the top-level array are counted on the way,
+    which gives the number of items of every chunk. The scan stops at the last boundary.
+
+    Args:
+        path (str): The path of the source file, which must be UTF-8 without a byte order mark.
+        count (int): The number of chunks.
+
+    Returns:
+        tuple: The `(start, end)` byte offsets of the chunks, without the brackets of the array and the
+            commas between the chunks, and the number of items of each chunk but the last.
+
+    Example:
+    >>> chunks, item_counts = split_json_array('./test/src/orders.json', 4)
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        raise ValueError("The source file must hold a top-level array.")
+    with open(path, 'rb') as source_file, mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+        start = _first_byte(mapped_file)
+        end = size - 1
+        while end > start and mapped_file[end] in _WHITESPACE:
+            end -= 1
+        if start >= end or mapped_file[start] != ord('[') or mapped_file[end] != ord(']'):
+            raise ValueError("The source file must hold a top-level array.")
+
+        boundaries = [start + 1]
+        item_counts = []
+        comma_count = 0
+        target = size // count
+        depth = 1
+        for match in _TOKEN.finditer(mapped_file, start + 1, end):
+            token = mapped_file[match.start()]
+            if token == ord('"'):
+                continue
+            if token == ord(','):
+                if depth == 1:
+                    comma_count += 1
+                continue
+            if token == ord('[') or token == ord('{'):
+                depth += 1
+                continue
+            depth -= 1
+            if depth != 1 or match.end() < target:
+                continue
+
+            comma = _first_byte(mapped_file, match.end())
+            if comma < end and mapped_file[comma] == ord(','):
+                # The commas before the boundary separate the items of the chunk.
+                item_counts.append(comma_count + 1)
+                comma_count = -1
+                boundaries.append(comma + 1)
+                if len(boundaries) == count:
+                    break
+                target = size * len(boundaries) // count
+    boundaries.append(end + 1)
+    return [(chunk_start, chunk_end - 1) for chunk_start, chunk_end in zip(boundaries, boundaries[1:])], item_counts
+
+def _iter_array_items(path, start, end):
+    with open(path, 'rb') as source_file:
+        source_file.seek(start)
+        text = '[' + source_file.read(end - start).decode('utf-8') + ']'
+    try:
+        items = json.loads(text)
+    except RecursionError:
+        items = json_streamer.json_event_parser(text).load()
+    del text
+    # The items are released as they are transformed.
+    items.reverse()
+    while items:
+        yield items.pop()
+
+def write_json_array(path: str, output_path: str, max_processes: int, has_random_id: bool = False, id_prefix: str = '',
+                     id_generator = None, chunk_size: int = 1 << 26, batch_size: int = 1024, max_open_files: int = 64) -> dict:
+    """
+    Converts the top-level array of a file to table CSV files over a process pool.
+
+    The array is split into chunks of whole items by `split_json_array`, and the chunks are
+    converted by `json_lines.write_chunks`, so the CSV files are the same as the files of the array
+    converted in one process. Each worker process parses a whole chunk, so the chunks are at most
+    about `chunk_size` bytes, and there are at least as many chunks as processes. The number of
+    chunks is limited to the worker IDs of the ID generator by `json_lines.limit_chunk_count`, so the
+    chunks of a very large file with snowflake IDs are larger.
+
+    Args:
+        path (str): The path of the source file.
+        output_path (str): The output path for the CSV files.
+        max_processes (int): The maximum number of worker processes.
+        has_random_id (bool): Flag to indicate whether to use random IDs for records (default is False).
+        id_prefix (str): A prefix added to the generated sequential IDs (default is '').
+        id_generator (id_generator.id_generator): The ID strategy of the random IDs, which is copied to
+            every worker process (default is None).
+        chunk_size (int): The approximate maximum number of bytes of a chunk (default is 64 MiB).
+        batch_size (int): The number of items which are transformed between two drains (default is 1024).
+        max_open_files (int): The maximum number of part files which are open at the same time in each
+            worker process (default is 64).
+
+    Returns:
+        dict: The row counts, the fields and the headers of the tables, mapped by the table names.
+
+    Example:
+    >>> table_states = write_json_array('./test/src/orders.json', './test/result', 4)
+    """
+    count = json_lines.limit_chunk_count(max(max_processes, -(-os.path.getsize(path) // chunk_size)), id_generator)
+    chunks, item_counts = split_json_array(path, count)
+    return json_lines.write_chunks(_iter_array_items, path, chunks, item_counts, output_path, max_processes,
+                                   has_random_id, id_prefix, id_generator, batch_size, max_open_files)
@@ -9,6 +9,9 @@ Class
     1. `json_deconstructor`: This class deconstructs nested JSON data into tables and fields.
 
 """
+from . import json_traverser
+import types
+
 class json_deconstructor:
     """
     A class for deconstructing nested JSON data into tables and fields.
@@ -20,7 +23,11 @@ class json_deconstructor:
     ------------------
         - nested_json (dict): The nested JSON data to be deconstructed.
         - __tables (dict): A dictionary to store tables extracted from the JSON data.
-        - __fields (dict): A dictionary to store fields extracted from the JSON data.
+        - __fields (dict): A dictionary to store fields extracted from the JSON data. The fields of each
+          table are kept as an insertion-ordered dict of the field name to its column position, so a
+          membership check costs O(1).
+        - __field_keys (dict): The live keys views of the fields of each table, which back the read-only
+          `fields` property.
 
     Methods
     ------------------
@@ -30,6 +37,21 @@ class json_deconstructor:
         - `nested_json` (dict): The nested JSON data to be processed.
     - Returns: None
 
+    2. `register_fields(self, name: str, keys)`: 
+    - Method to register a table and the keys of one of its records.
+    - Arguments:
+        - `name` (str): The name of the table.
+        - `keys`: The keys of a record of the table.
+    - Returns: None
+
+    3. `has_field(self, name: str, key: str) -> bool`: 
+    - Method to check whether a field is registered for a table.
+    - Arguments:
+        - `name` (str): The name of the table.
+        - `key` (str): The name of the field.
+    - Returns:
+        - bool: True if the field is registered for the table, otherwise False.
+
     Properties
     ------------------
         - tables (dict): Property to access the extracted tables.
@@ -57,12 +79,13 @@ class json_deconstructor:
     >>> tables = deconstructor.tables
     >>> fields = deconstructor.fields
     """
-    def __init__(self, nested_json: dict):
+    def __init__(self, nested_json: dict = None):
         """
         Initializes a json_deconstructor instance with the nested JSON data.
 
         Args:
-            nested_json (dict): The nested JSON data to be deconstructed.
+            nested_json (dict): The nested JSON data to be deconstructed. If it is None, the tables
+                and fields are left empty so that they can be registered while the data is traversed.
 
         Returns: None
 
@@ -71,14 +94,21 @@ class json_deconstructor:
         self.nested_json = nested_json
         self.__tables = {}
         self.__fields = {}
+        self.__field_keys = {}
         
         #self.check_pattern(self.nested_json)
-        self.pre_load(nested_json)
+        if nested_json is not None:
+            self.pre_load(nested_json)
 
     def pre_load(self, nested_json: dict):
         """
         Method to preprocess and load tables and fields from the nested JSON data.
 
+        The tables and fields are collected in a single walk over the data, using the same table
+        names as `json_formatter.json_to_object_list`. The walk recurses up to
+        `json_traverser.RECURSION_DEPTH` and walks the deeper subtrees with `json_traverser.traverse`,
+        so the depth of the data is not limited by the recursion limit.
+
         Args:
             nested_json (dict): The nested JSON data to be processed.
 
@@ -103,111 +133,145 @@ class json_deconstructor:
         >>> extracted_fields = deconstructor.fields
         >>> # Verify the extracted tables and fields.
         >>> print(extracted_tables)
-        {'table1': [], 'table2': []}
-        >>> print(extracted_fields)
-        {'table1': ['field1', 'field2'], 'table2': ['field3', 'field4']}
+        {'root': [], 'table1': [], 'table2': []}
+        >>> print({name: list(fields) for name, fields in extracted_fields.items()})
+        {'root': ['parent_id', 'root_id', 'table1', 'table2'], 'table1': ['parent_id', 'table1_id', 'field1', 'field2'], 'table2': ['parent_id', 'table2_id', 'field3', 'field4']}
         """
-        def load_table(nested_json, name='root', is_nested_list = False):
-            if type(nested_json) is dict:
-                self.__tables[name] = []
-
-                for key, value in nested_json.items():
-                    if isinstance(value, dict):
-                        load_table(value, key)
-                    elif isinstance(value, list):
-                        list_count = 0
-                        for item in value:
-                            if isinstance(item, dict):
-                                load_table(item, key)
-                            elif isinstance(item, list):
-                                load_table(item, key+"_"+str(list_count))
-                            list_count += 1
-            elif type(nested_json) is list:
-                list_count = 0
-                if is_nested_list == False:
-                    for item in nested_json:
-                        if isinstance(item, dict):
-                            load_table(item, name)
-                        elif isinstance(item, list):
-                            load_table(item, name+"_"+str(list_count))
-                        list_count += 1
-                else:
-                    self.__tables[name] = []
-                    for item in nested_json:
-                        if isinstance(item, dict):
-                            load_table(item, name)
-                        elif isinstance(item, list):
-                            load_table(item, name+"_"+str(list_count))
-                        list_count += 1
-
-        def load_fields(nested_json, name='root'):
-            #if name not in self.__tables.keys():
-            #    return
-            if type(nested_json) is dict:
-                if name not in self.__tables:
-                    find_next_fields_from_object(nested_json,name)
-                    return
-                
-                if name not in self.__fields:
-                    self.__fields[name] = []
-                    self.__fields[name].append("parent_id")
-                    self.__fields[name].append(name+"_id")
-
-                
-                for key, value in nested_json.items():
-                    if key not in self.__fields[name]:
-                        self.fields[name].append(key)
-                
-                find_next_fields_from_object(nested_json,name)
-            elif type(nested_json) is list:
-                if is_pure_data_type(nested_json):
-                    return
-                
-                if name not in self.__tables:
-                    find_next_fields_from_list(nested_json,name)
-                    return
-                
-                if name not in self.__fields.keys():
-                    self.__fields[name] = []
-                    self.__fields[name].append("parent_id")
-                    self.__fields[name].append(name+"_id")
-
-                for item in extract_keys(nested_json):
-                    if item not in self.__fields[name]:
-                        self.__fields[name].append(item)   
-
-                find_next_fields_from_list(nested_json,name)
-
-        def find_next_fields(nested_json, name):
-            if isinstance(nested_json, list) or isinstance(nested_json, dict):
-                load_fields(nested_json,  name)
-
-        def find_next_fields_from_object(nested_json,name):
+        recursion_depth = json_traverser.RECURSION_DEPTH
+
+        def load_object(nested_json, name, depth):
+            self.register_fields(name, nested_json.keys())
+
             for key, value in nested_json.items():
-                load_fields(value, key)
+                if type(value) is dict:
+                    if depth < recursion_depth:
+                        load_object(value, key, depth + 1)
+                    else:
+                        json_traverser.traverse(iter_object(value, key))
+                elif type(value) is list and value:
+                    if depth < recursion_depth:
+                        load_list(value, key, depth + 1)
+                    else:
+                        json_traverser.traverse(iter_list(value, key))
 
-        def find_next_fields_from_list(nested_json,name):
+        def load_list(nested_json, name, depth):
             list_count = 0
             for item in nested_json:
-                find_next_fields(item,  name+"_"+str(list_count))
+                if type(item) is dict:
+                    if depth < recursion_depth:
+                        load_object(item, name, depth + 1)
+                    else:
+                        json_traverser.traverse(iter_object(item, name))
+                elif type(item) is list:
+                    if depth < recursion_depth:
+                        load_list(item, name+"_"+str(list_count), depth + 1)
+                    else:
+                        json_traverser.traverse(iter_list(item, name+"_"+str(list_count)))
                 list_count += 1
 
-        def is_pure_data_type(json_list):
-            list_and_dict_count = [type(next_value) for next_value in json_list].count(list) + [type(next_value) for next_value in json_list].count(dict)
-            return list_and_dict_count == 0
-        
-        def extract_keys(json_list):
-            keys = set()
+        # The same walk on the explicit stack, for the subtrees below the recursion depth.
+        def iter_object(nested_json, name):
+            self.register_fields(name, nested_json.keys())
 
-            for item in json_list:
-                if isinstance(item, dict):
-                    keys.update(item.keys())
+            for key, value in nested_json.items():
+                if type(value) is dict:
+                    yield iter_object(value, key)
+                elif type(value) is list and value:
+                    yield iter_list(value, key)
+
+        def iter_list(nested_json, name):
+            list_count = 0
+            for item in nested_json:
+                if type(item) is dict:
+                    yield iter_object(item, name)
+                elif type(item) is list:
+                    yield iter_list(item, name+"_"+str(list_count))
+                list_count += 1
+
+        if type(nested_json) is dict:
+            load_object(nested_json, 'root', 0)
+        elif type(nested_json) is list:
+            load_list(nested_json, 'root', 0)
 
-            return list(keys)
-        load_table(nested_json)
-        load_fields(nested_json)
+    def register_fields(self, name: str, keys) -> dict:
+        """
+        Method to register a table and the keys of one of its records.
+
+        The `parent_id` and `<name>_id` fields are added when the table is registered for the first
+        time, and the keys which are not registered yet are appended in their order.
+
+        Args:
+            name (str): The name of the table.
+            keys: The keys of a record of the table.
+
+        Returns:
+            dict: The fields of the table mapped to their column positions. The same mapping is
+                updated by the later registrations of the table.
+
+        Example:
+        >>> deconstructor = json_deconstructor()
+        >>> deconstructor.register_fields('lion', ['years old', 'name'])
+        {'parent_id': 0, 'lion_id': 1, 'years old': 2, 'name': 3}
+        >>> deconstructor.register_fields('lion', ['meal', 'name'])
+        {'parent_id': 0, 'lion_id': 1, 'years old': 2, 'name': 3, 'meal': 4}
+        >>> print(list(deconstructor.fields['lion']))
+        ['parent_id', 'lion_id', 'years old', 'name', 'meal']
+        """
+        if name not in self.__tables:
+            self.__tables[name] = []
+
+        fields = self.__fields.get(name)
+        if fields is None:
+            fields = self.__fields[name] = {"parent_id": 0}
+            self.__field_keys[name] = fields.keys()
+            fields.setdefault(name+"_id", 1)
+
+        for key in keys:
+            if key not in fields:
+                fields[key] = len(fields)
+        return fields
+
+    def has_field(self, name: str, key: str) -> bool:
+        """
+        Method to check whether a field is registered for a table.
+
+        Args:
+            name (str): The name of the table.
+            key (str): The name of the field.
+
+        Returns:
+            bool: True if the field is registered for the table, otherwise False.
+
+        Example:
+        >>> deconstructor = json_deconstructor({"lion": {"name": "leo"}})
+        >>> deconstructor.has_field('lion', 'name')
+        True
+        """
+        return key in self.__fields.get(name, ())
     
     def check_pattern(self, nested_json):
+        self.__check_node(nested_json, 0)
+
+    def __check_node(self, nested_json, depth):
+        # The recursive form of `__check_pattern`, which hands the subtrees below the recursion depth to it.
+        if type(nested_json) is dict:
+            children = nested_json.values()
+        elif type(nested_json) is list:
+            children = nested_json
+        else:
+            return
+        for value in children:
+            if isinstance(value, list):
+                if self.is_same_pattern(value) == False:
+                    raise Exception("The nested JSON data is not in the same pattern.")
+            elif not isinstance(value, dict):
+                continue
+            if depth < json_traverser.RECURSION_DEPTH:
+                self.__check_node(value, depth + 1)
+            else:
+                json_traverser.traverse(self.__check_pattern(value))
+
+    def __check_pattern(self, nested_json):
         if type(nested_json) is dict:
             for key, value in nested_json.items():
                 if isinstance(value, list):
@@ -215,19 +279,19 @@ class json_deconstructor:
                     if self.is_same_pattern(value) == False:
                         raise Exception("The nested JSON data is not in the same pattern.")
                     else:
-                        self.check_pattern(value)
+                        yield self.__check_pattern(value)
                 elif isinstance(value, dict):
-                    self.check_pattern(value)
+                    yield self.__check_pattern(value)
         elif type(nested_json) is list:
             for item in nested_json:
                 if isinstance(item, dict):
-                    self.check_pattern(item)
+                    yield self.__check_pattern(item)
                 elif isinstance(item, list):
                     #print ("list in",item)
                     if self.is_same_pattern(item) == False:
                         raise Exception("The nested JSON data is not in the same pattern.")
                     else:
-                        self.check_pattern(item)
+                        yield self.__check_pattern(item)
         
 
     def is_same_pattern(self, json_list):
@@ -276,8 +340,7 @@ class json_deconstructor:
         >>> extracted_tables = deconstructor.tables
         >>> # Access the extracted tables as a dictionary.
         >>> print(extracted_tables)
-        {'table1': [], 'table2': []}
-        ```
+        {'root': [], 'table1': [], 'table2': []}
         """
         return self.__tables
 
@@ -286,8 +349,12 @@ class json_deconstructor:
         """
         Property to access the extracted fields.
 
+        The fields are returned as a read-only mapping of the table names to the live keys views of
+        their fields in column order, so an access costs O(1) and sees the later registrations. The
+        callers which keep or change the fields copy them with `list`.
+
         Returns:
-            dict: A dictionary of extracted fields.
+            types.MappingProxyType: A read-only mapping of extracted fields.
 
         Example: 
             >>> nested_data = {
@@ -303,7 +370,7 @@ class json_deconstructor:
             >>> deconstructor = json_deconstructor(nested_data)
             >>> extracted_fields = deconstructor.fields
             >>> # Access the extracted fields as a dictionary.
-            >>> print(extracted_fields)
-            {'table1': ['field1', 'field2'], 'table2': ['field3', 'field4']}
+            >>> print(list(extracted_fields['table1']))
+            ['parent_id', 'table1_id', 'field1', 'field2']
         """
-        return self.__fields
+        return types.MappingProxyType(self.__field_keys)
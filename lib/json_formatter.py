@@ -9,8 +9,9 @@ Class
     1. `json_formatter`: This class handles the transformation and formatting of nested JSON data.
 
 """
-from . import json_deconstructor
-import uuid
+from . import json_deconstructor, json_table, json_traverser, id_generator as id_generators
+import collections
+import itertools
 
 class json_formatter:
     """
@@ -22,8 +23,22 @@ class json_formatter:
     Attributes
     ------------------
         - json_handler (json_deconstructor.json_deconstructor): An instance of the json_deconstructor class.
-        - __store (dict): A dictionary to store the formatted data.
+        - __tables (dict): A dictionary of the formatted tables as `json_table.json_table` instances.
+        - __store (dict): A dictionary to store the flattened data, or the records built from the tables.
+        - __record_index (set): A set of `(table_name, parent_id, id)` of the stored records, built on the
+          first `is_exist_same_record` call, or None.
+        - __indexed_rows (dict): The number of records of each table which are in the record index.
         - random_id (bool): Flag to indicate whether to use random IDs for records.
+        - id_generator (id_generator.id_generator): The ID strategy of the random IDs.
+        - id_prefix (str): A prefix added to the generated sequential IDs.
+        - __key_cache (dict): The flattened column names of each path prefix, mapped by the key or index
+          under the prefix, which are reused by the later calls of `flatten_json` with `reuse_keys`.
+        - __prefix_cache (dict): The path prefixes of the nested values, mapped by their column names.
+        - __dedup_index (collections.OrderedDict): The IDs of the stored sub-records, mapped by their table
+          names and content digests in least recently used order, or None if the records are not deduplicated.
+        - __dedup_size (int): The maximum number of sub-records in the dedup index.
+        - __content_hasher (id_generator.content_id_generator): The hasher of the content digests.
+        - __duplicate_count (int): The number of sub-records which reused the ID of an identical sub-record.
 
     Methods
     ------------------
@@ -36,22 +51,60 @@ class json_formatter:
         - `id` (str): The record ID.
     - Returns: None
 
-    3. `flatten_json(self, nested_json, name: str = '')`: 
+    2. `is_exist_same_record(self, table_name: str, parent_id: str, id: str) -> bool`: 
+    - Method to check whether a record with the parent ID and the record ID exists in a table.
+    - Arguments:
+        - `table_name` (str): The name of the table.
+        - `parent_id` (str): The parent ID of the record.
+        - `id` (str): The record ID.
+    - Returns:
+        - bool: True if the record exists, otherwise False.
+
+    3. `flatten_json(self, nested_json, name: str = '', reuse_keys: bool = False)`: 
     - Method to flatten nested JSON data into a structured format.
     - Arguments:
         - `nested_json`: The nested JSON data to flatten.
         - `name` (str): The name of the current field or table.
+        - `reuse_keys` (bool): Flag to indicate whether the column names are cached for the later calls.
+    - Returns: None
+
+    4. `restore_tables(self, table_states: dict)`: 
+    - Method to restore the tables written by an earlier run, so that the new records continue them.
+    - Arguments:
+        - `table_states` (dict): The states of the tables, as returned by the `table_states` property.
+    - Returns: None
+
+    5. `json_item_to_object_list(self, x, index: int)`: 
+    - Method to transform one item of a top-level array, such as one line of a JSON Lines source.
+    - Arguments:
+        - `x`: The item to transform.
+        - `index` (int): The index of the item in the top-level array.
+    - Returns: None
+
+    6. `drain_tables(self) -> dict`: 
+    - Method to take the stored records out of the tables.
+    - Returns:
+        - dict: The records of each table which has records, as tuples in column order.
+
+    7. `count_item_records(self, x, index: int)`: 
+    - Method to count the records of one item of a top-level array by table, without building them.
+    - Arguments:
+        - `x`: The item to count.
+        - `index` (int): The index of the item in the top-level array.
     - Returns: None
 
     Properties
     ------------------
+        - tables (dict): Property to access the formatted tables.
         - store (dict): Property to access the formatted data.
+        - duplicate_count (int): Property to access the number of deduplicated sub-records.
+        - table_states (dict): Property to access the row counts, the fields and the headers of the tables.
 
     Typical Usage
     ------------------
-    1. Create an instance of `json_formatter` with nested JSON data.
+    1. Create an instance of `json_formatter`.
     2. Use the `json_to_object_list` method to transform the data into a structured format.
-    3. Access the formatted data using the `store` property.
+    3. Access the formatted tables using the `tables` property, or the records as dictionaries using the `store` property.
 
     Example:
     >>> nested_data = {
@@ -64,97 +117,349 @@ class json_formatter:
     ...         "field4": [10, 11, 12]
     ...     }
     ... }
-    >>> formatter = json_formatter(nested_data, random_id=True)
+    >>> formatter = json_formatter(random_id=True)
     >>> formatter.json_to_object_list(nested_data)
     >>> formatted_data = formatter.store
     """
-    def __init__(self, nested_json: dict, random_id: bool = False):
+    def __init__(self, nested_json: dict = None, random_id: bool = False, id_prefix: str = '', id_generator = None, dedup: bool = False, dedup_size: int = 65536):
         """
-        Initializes a json_formatter instance with nested JSON data.
+        Initializes a json_formatter instance with empty tables.
 
         Args:
-            nested_json (dict): The nested JSON data to be formatted.
+            nested_json (dict): Ignored, and kept for the callers which pass the data to be formatted. The
+                data is passed to `json_to_object_list` or `flatten_json` (default is None).
             random_id (bool): Flag to indicate whether to use random IDs for records.
+            id_prefix (str): A prefix added to the generated sequential IDs, which keeps the IDs of
+                several documents apart (default is '').
+            id_generator (id_generator.id_generator): The ID strategy of the random IDs. If it is given,
+                the random IDs are used (default is None, which uses UUID4 strings if `random_id` is True).
+            dedup (bool): Flag to indicate whether an object or an array with the same content as a stored
+                sub-record of the same table reuses its ID instead of being stored again (default is False).
+            dedup_size (int): The maximum number of sub-records in the dedup index. The least recently used
+                sub-records are evicted first, and an evicted sub-record is stored again when it repeats
+                (default is 65536).
 
         Returns: None
 
         Example: None
         """
-        self.json_handler = json_deconstructor.json_deconstructor(nested_json)
-        self.__store = self.json_handler.tables
-        self.random_id = random_id
+        self.json_handler = json_deconstructor.json_deconstructor()
+        self.__tables = {}
+        self.__store = {}
+        self.__record_index = None
+        self.__indexed_rows = {}
+        self.random_id = random_id or id_generator is not None
+        self.id_generator = id_generator if id_generator is not None else id_generators.uuid_id_generator()
+        self.id_prefix = id_prefix
+        self.__key_cache = {}
+        self.__prefix_cache = {}
+        if dedup and dedup_size < 1:
+            raise ValueError("The dedup size must be at least 1.")
+        self.__dedup_index = collections.OrderedDict() if dedup else None
+        self.__dedup_size = dedup_size
+        self.__content_hasher = None
+        if dedup:
+            # The content IDs already hash every value, so their digests are shared.
+            is_content_id = isinstance(self.id_generator, id_generators.content_id_generator)
+            self.__content_hasher = self.id_generator if is_content_id else id_generators.content_id_generator()
+        self.__duplicate_count = 0
 
     def json_to_object_list(self, x, table_name: str = 'root', parent_id: str = '', id: str = None):
+        """
+        Method to transform nested JSON data into a structured format.
+
+        The tables and fields are registered in the same traversal that builds the records. Each record
+        is stored as a tuple in the column order of its table, with `json_table.MISSING` for the fields
+        which it does not have.
+
+        In the dedup mode, an object or an array which is referenced by a field is hashed with its
+        nested values, and if a sub-record of the same table has the same content, the field takes
+        the ID of that sub-record and the value is not stored again. The stored sub-record keeps the
+        parent ID of its first parent. The digests of the nested values are memoized for one item of
+        a top-level array at a time.
 
-        key_count = 0
+        Args:
+            x: The JSON data to transform.
+            table_name (str): The name of the table being processed.
+            parent_id (str): The parent ID of the current record.
+            id (str): The record ID.
+
+        Returns: None
+
+        Example:
+        >>> source_data = {"lion": [{"years old": 12, "name": "leo"}, {"meal": 6, "name": "noah"}]}
+        >>> formatter = json_formatter()
+        >>> formatter.json_to_object_list(source_data)
+        >>> print(formatter.tables['lion'].header)
+        ['parent_id', 'lion_id', 'years old', 'name', 'meal']
+        >>> print(formatter.store['lion'])
+        [{'parent_id': 'lion_0', 'lion_id': 'lion_0', 'years old': 12, 'name': 'leo', 'meal': ''}, {'parent_id': 'lion_0', 'lion_id': 'lion_1', 'years old': '', 'name': 'noah', 'meal': 6}]
+        """
+        self.__store = None
+        json_traverser.traverse(self.__to_object_list(x, table_name, parent_id, id))
+
+    def json_item_to_object_list(self, x, index: int):
+        """
+        Method to transform one item of a top-level array, such as one line of a JSON Lines source.
+
+        The records are the same as the records of the item when the whole array is transformed by
+        `json_to_object_list`, so the items can be transformed one by one, and taken out with
+        `drain_tables` in between, without keeping the array in memory.
+
+        Args:
+            x: The item to transform.
+            index (int): The index of the item in the top-level array.
+
+        Returns: None
+
+        Example:
+        >>> formatter = json_formatter()
+        >>> formatter.json_item_to_object_list({"name": "leo"}, 0)
+        >>> formatter.json_item_to_object_list({"name": "noah"}, 1)
+        >>> print(formatter.store['root'])
+        [{'parent_id': '', 'root_id': 'root_0', 'name': 'leo'}, {'parent_id': '', 'root_id': 'root_1', 'name': 'noah'}]
+        """
+        self.__store = None
+        json_traverser.traverse(self.__to_object_list([x], 'root', '', None, index))
+
+    def count_item_records(self, x, index: int):
+        """
+        Method to count the records of one item of a top-level array by table, without building them.
+
+        The fields, the row counts and the headers of the tables are the same as after
+        `json_item_to_object_list`, but no record or ID is built, so the `table_states` of the items
+        are known at a fraction of the cost of their transformation.
+
+        Args:
+            x: The item to count.
+            index (int): The index of the item in the top-level array.
+
+        Returns: None
+
+        Example:
+        >>> formatter = json_formatter()
+        >>> formatter.count_item_records({"name": "leo", "meal": [{"food": "meat"}]}, 0)
+        >>> print(formatter.table_states['meal'])
+        {'row_count': 1, 'fields': ['parent_id', 'meal_id', 'food'], 'header': ['parent_id', 'meal_id', 'food']}
+        """
+        self.__store = None
+        # The item is counted as the item of a top-level array, without wrapping it in a list.
+        if type(x) is dict:
+            json_traverser.traverse(self.__count_records(x, 'root'))
+        elif type(x) is list:
+            json_traverser.traverse(self.__count_records(x, 'root_'+str(index)))
+
+    def drain_tables(self) -> dict:
+        """
+        Method to take the stored records out of the tables.
+
+        The tables keep their fields, their headers and the counts of their records, so the later
+        records continue the sequential IDs. The records which are taken out are no longer found by
+        `is_exist_same_record`.
+
+        Returns:
+            dict: The records of each table which has records, as tuples in column order, mapped by
+                the table names. `json_table.json_table.iter_rows` orders them by the header.
+
+        Example: None
+        """
+        self.__store = None
+        self.__record_index = None
+        self.__indexed_rows = {}
+        if self.__content_hasher is not None:
+            self.__content_hasher.clear()
+        if isinstance(self.id_generator, id_generators.content_id_generator):
+            self.id_generator.clear()
+        return {table_name: table.drain() for table_name, table in self.__tables.items() if len(table) > 0}
+
+    def __to_object_list(self, x, table_name: str = 'root', parent_id: str = '', id: str = None, first_index: int = 0):
+        tables = self.__tables
+        random_id = self.random_id
+        next_id = self.id_generator.next_id
+        id_prefix = self.id_prefix
+        dedup_index = self.__dedup_index
+        key_count = first_index
         new_parent_id = parent_id if table_name != 'root' else ''
         if type(x) is dict:
-            
-            json_object = {"parent_id":new_parent_id}
-            json_object[table_name+'_id'] = table_name +"_"+str(len(self.__store[table_name])) if self.random_id == False else str(uuid.uuid4()) if id == None else id
+            columns = self.json_handler.register_fields(table_name, x.keys())
+            table = tables.get(table_name)
+            if table is None:
+                table = tables[table_name] = json_table.json_table(table_name, columns)
+
+            id_column = columns[table_name+'_id']
+            row = [json_table.MISSING] * len(columns)
+            row[0] = new_parent_id
+            row[id_column] = id_prefix+table_name +"_"+str(table.row_count) if random_id == False else next_id(table_name, new_parent_id, '', x) if id == None else id
             
             for key,value in x.items():
+                if dedup_index is not None and (type(value) is dict or type(value) is list):
+                    content_key = (key, self.__content_hasher.digest(value))
+                    duplicate_id = dedup_index.get(content_key)
+                    if duplicate_id is not None:
+                        dedup_index.move_to_end(content_key)
+                        row[columns[key]] = duplicate_id
+                        self.__duplicate_count += 1
+                        continue
+
                 if type(value) is dict:
-                    if self.is_exist_same_record(table_name, key, value) == True:
-                        json_object[key] =  key+"_"+str(len(self.__store[key]))  if self.random_id == False else str(uuid.uuid4())
-                    else:
-                        json_object[key] =  key+"_"+str(len(self.__store[key]))  if self.random_id == False else str(uuid.uuid4())
-                    self.json_to_object_list(value, key, json_object[table_name+'_id'], json_object[key])
+                    child_table = tables.get(key)
+                    row[columns[key]] = child_id = id_prefix+key+"_"+str(child_table.row_count if child_table is not None else 0)  if random_id == False else next_id(key, row[id_column], key, value)
+                    if dedup_index is not None:
+                        self.__remember(content_key, child_id)
+                    yield self.__to_object_list(value, key, row[id_column], child_id)
 
                 elif type(value) is list:
-                    pure_value = self.get_pure_value_from_object(key, value, table_name)
+                    for item in value:
+                        if type(item) is dict or type(item) is list:
+                            pure_value = None
+                            break
+                    else:
+                        pure_value = ", ".join([str(new_val) for new_val in value])
+
                     if pure_value:
-                        json_object[key] = pure_value
+                        row[columns[key]] = pure_value
                     else:
-                        json_object[key] = key+"_"+str(len(self.__store[key]))   if self.random_id == False else str(uuid.uuid4())
+                        child_table = tables.get(key)
+                        row[columns[key]] = id_prefix+key+"_"+str(child_table.row_count if child_table is not None else 0)   if random_id == False else next_id(key, row[id_column], key, value)
 
-                    self.json_to_object_list(value, key, json_object[key], None)
+                    if pure_value is None:
+                        if dedup_index is not None:
+                            self.__remember(content_key, row[columns[key]])
+                        yield self.__to_object_list(value, key, row[columns[key]], None)
                 else:
-                    json_object[key] = value
+                    row[columns[key]] = value
 
-            for key in self.json_handler.fields[table_name]:
-                if key not in json_object.keys():
-                    json_object[key] = ''
+            table.append(row, x.keys())
+        elif type(x) is list:
+            # In the dedup mode, the digests of a top-level item are only reused inside the item, so
+            # they are forgotten between the items, and the memo of the hasher stays as small as one item.
+            clears_digests = dedup_index is not None and table_name == 'root' and parent_id == ''
+            for a in x:
+                if clears_digests:
+                    self.__content_hasher.clear()
+                if type(a) is dict:
+                    yield self.__to_object_list(a, table_name, parent_id, None if random_id == False else next_id(table_name, parent_id, key_count, a))
+                elif type(a) is list:
+                    owner_table = tables.get(table_name)
+                    next_key = id_prefix+table_name+"_"+str(key_count)+"_"+str(owner_table.row_count if owner_table is not None else 0)  if random_id == False else next_id(table_name+"_"+str(key_count), parent_id, key_count, a)
+                    yield self.__to_object_list(a, table_name+"_"+str(key_count), next_key, None)
+                key_count += 1
+            if clears_digests:
+                self.__content_hasher.clear()
+
+    def __count_records(self, x, table_name: str, first_index: int = 0):
+        # It follows the tables of __to_object_list: the fields are registered before the values, and
+        # a record is counted after its values, in the order the records are appended there.
+        tables = self.__tables
+        if type(x) is dict:
+            columns = self.json_handler.register_fields(table_name, x.keys())
+            table = tables.get(table_name)
+            if table is None:
+                table = tables[table_name] = json_table.json_table(table_name, columns)
 
-            self.__store[table_name].append(json_object)
+            for key,value in x.items():
+                if type(value) is dict:
+                    yield self.__count_records(value, key)
+                elif type(value) is list:
+                    for item in value:
+                        if type(item) is dict or type(item) is list:
+                            yield self.__count_records(value, key)
+                            break
+
+            table.count(x.keys())
         elif type(x) is list:
-            list_and_dict_count = [type(next_value) for next_value in x].count(list) + [type(next_value) for next_value in x].count(dict)
-            if list_and_dict_count == 0:
-                return
-            
+            key_count = first_index
             for a in x:
                 if type(a) is dict:
-                    self.json_to_object_list(a, table_name, parent_id, None)
+                    yield self.__count_records(a, table_name)
                 elif type(a) is list:
-                    next_key = table_name+"_"+str(key_count)+"_"+str(len(self.__store[table_name]))  if self.random_id == False else str(uuid.uuid4())
-                    self.json_to_object_list(a, table_name+"_"+str(key_count), next_key, None)
+                    yield self.__count_records(a, table_name+"_"+str(key_count))
                 key_count += 1
-    def get_pure_value(self, value):
-        return [type(next_value) for next_value in value].count(list) + [type(next_value) for next_value in value].count(dict)
-   
-    def get_pure_value_from_object(self,key, value, table_name ):
-        list_and_dict_count = self.get_pure_value(value)
-        if key not in self.__store[table_name] and list_and_dict_count == 0:
-            return ", ".join([str(new_val) for new_val in value]) 
-
-        return None
-    
-    def is_exist_same_record(self, table_name, parent_id, current_key):
-        
-            for store in self.__store.keys():
-                if store == table_name:
-                    for value in self.__store[store]:
-                        if parent_id in value.values() and current_key in value.values():
-                            return True
-            return False
-
-    def flatten_json(self, nested_json, name: str = ''):
+
+    def __remember(self, content_key, id):
+        dedup_index = self.__dedup_index
+        dedup_index[content_key] = id
+        if len(dedup_index) > self.__dedup_size:
+            dedup_index.popitem(last=False)
+
+    def restore_tables(self, table_states: dict):
+        """
+        Method to restore the tables written by an earlier run, so that the new records continue them.
+
+        Each table is registered with its fields in their column order and its header, without
+        records, and the sequential IDs of the new records start after the row count of the table.
+        The fields which are new to a table are added at the end of its header.
+
+        Args:
+            table_states (dict): The states of the tables, as returned by the `table_states` property.
+                Each state is a dictionary of the `row_count`, the `fields` in column order and the
+                `header` of a table.
+
+        Returns: None
+
+        Example:
+        >>> formatter = json_formatter()
+        >>> formatter.restore_tables({'lion': {'row_count': 2, 'fields': ['parent_id', 'lion_id', 'name'], 'header': ['parent_id', 'lion_id', 'name']}})
+        >>> formatter.json_to_object_list({"name": "leo", "age": 6}, 'lion', 'root_1')
+        >>> print(formatter.store['lion'])
+        [{'parent_id': 'root_1', 'lion_id': 'lion_2', 'name': 'leo', 'age': 6}]
+        """
+        for table_name, state in table_states.items():
+            columns = self.json_handler.register_fields(table_name, state['fields'])
+            table = self.__tables[table_name] = json_table.json_table(table_name, columns)
+            table.order = tuple(columns[key] for key in state['header'])
+            table.offset = state['row_count']
+        self.__record_index = None
+
+    def is_exist_same_record(self, table_name: str, parent_id: str, id: str) -> bool:
+        """
+        Method to check whether a record with the parent ID and the record ID exists in a table.
+
+        The records are indexed by `(table_name, parent_id, id)` on the first call, and the records
+        stored after it are added on the next calls, so the check costs O(1) instead of a scan over
+        the stored records, and the conversion does not keep the index when nothing checks it.
+
+        Args:
+            table_name (str): The name of the table.
+            parent_id (str): The parent ID of the record.
+            id (str): The record ID.
+
+        Returns:
+            bool: True if the record exists, otherwise False.
+
+        Example:
+        >>> source_data = {"lion": {"name": "leo"}}
+        >>> formatter = json_formatter()
+        >>> formatter.json_to_object_list(source_data)
+        >>> formatter.is_exist_same_record('lion', 'root_0', 'lion_0')
+        True
+        """
+        if self.__record_index is None:
+            self.__record_index = set()
+            self.__indexed_rows = {}
+        for name, table in self.__tables.items():
+            indexed_rows = self.__indexed_rows.get(name, 0)
+            if indexed_rows < len(table.rows):
+                id_column = table.columns[name+'_id']
+                self.__record_index.update((name, row[0], row[id_column]) for row in itertools.islice(table.rows, indexed_rows, None))
+                self.__indexed_rows[name] = len(table.rows)
+        return (table_name, parent_id, id) in self.__record_index
+
+    def flatten_json(self, nested_json, name: str = '', reuse_keys: bool = False):
         """
         Method to flatten nested JSON data into a structured format.
 
+        If `reuse_keys` is True, the column name of each path is built once from the prefix of its
+        parent and cached, so the values of the same path shape, such as the items of an array which
+        are flattened one by one, reuse the same column name objects instead of concatenating the
+        prefixes again. The paths of a single document are all different, so the cache only pays off
+        when the formatter flattens many values of the same shape.
+
         Args:
             nested_json: The nested JSON data to flatten.
             name (str): The name of the current field or table.
+            reuse_keys (bool): Flag to indicate whether the column names are cached and reused by the
+                later calls (default is False).
 
         Returns: None
 
@@ -165,7 +470,7 @@ class json_formatter:
         ...         "field2": [4, 5, 6]
         ...     }
         ... }
-        >>> formatter = json_formatter(source_data)
+        >>> formatter = json_formatter()
         >>> # Call the flatten_json method to flatten the data.
         >>> formatter.flatten_json(source_data)
         >>> # Access the flattened data using the store property.
@@ -174,28 +479,110 @@ class json_formatter:
         >>> print(flattened_data)
         {'table1_field1_0': 1, 'table1_field1_1': 2, 'table1_field1_2': 3, 'table1_field2_0': 4, 'table1_field2_1': 5, 'table1_field2_2': 6}
         """
-        if name == '':
+        if name == '' or self.__store is None:
             self.__store = {}
-        
+
+        if reuse_keys:
+            json_traverser.traverse(self.__flatten_reusing_keys(nested_json, name))
+        else:
+            json_traverser.traverse(self.__flatten(nested_json, name))
+
+    def __flatten(self, nested_json, name):
+        store = self.__store
+        if type(nested_json) is dict:
+            items = nested_json.items()
+        elif type(nested_json) is list:
+            items = enumerate(nested_json)
+        else:
+            store[name[:-1]] = nested_json
+            return
+
+        for a, value in items:
+            if type(value) is dict or type(value) is list:
+                yield self.__flatten(value, name + str(a) + '_')
+            else:
+                store[name + str(a)] = value
+
+    def __flatten_reusing_keys(self, nested_json, name):
+        store = self.__store
         if type(nested_json) is dict:
-            for a in nested_json:
-                self.flatten_json(nested_json[a], name + a + '_')
+            items = nested_json.items()
         elif type(nested_json) is list:
-            i = 0
-            for a in nested_json:
-                self.flatten_json(a, name + str(i) + '_')
-                i += 1
+            items = enumerate(nested_json)
         else:
-            self.__store[name[:-1]] = nested_json
+            store[name[:-1]] = nested_json
+            return
+
+        names = self.__key_cache.get(name)
+        if names is None:
+            names = self.__key_cache[name] = {}
+
+        for a, value in items:
+            key = names.get(a)
+            if key is None:
+                key = names[a] = name + str(a)
+
+            if type(value) is dict or type(value) is list:
+                prefix = self.__prefix_cache.get(key)
+                if prefix is None:
+                    prefix = self.__prefix_cache[key] = key + '_'
+                yield self.__flatten_reusing_keys(value, prefix)
+            else:
+                store[key] = value
+
+    @property
+    def tables(self) -> dict:
+        """
+        Property to access the formatted tables.
+
+        Returns:
+            dict: The formatted tables as `json_table.json_table` instances.
+
+        Example: None
+        """
+        return self.__tables
 
     @property
     def store(self) -> dict:
         """
         Property to access the formatted data.
 
+        After `json_to_object_list`, the records are built from the formatted tables as dictionaries
+        in header order, with '' for the missing fields, the first time the property is accessed.
+
         Returns:
             dict: The formatted data.
 
         Example: None
         """
+        if self.__store is None:
+            self.__store = {table_name: table.records() for table_name, table in self.__tables.items()}
         return self.__store
+
+    @property
+    def duplicate_count(self) -> int:
+        """
+        Property to access the number of sub-records which reused the ID of an identical sub-record
+        in the dedup mode.
+
+        Returns:
+            int: The number of deduplicated sub-records.
+
+        Example: None
+        """
+        return self.__duplicate_count
+
+    @property
+    def table_states(self) -> dict:
+        """
+        Property to access the row counts, the fields and the headers of the tables, which are
+        persisted by the incremental mode and restored with `restore_tables`.
+
+        Returns:
+            dict: The states of the tables, mapped by the table names. Each state is a dictionary of
+                the `row_count`, the `fields` in column order and the `header` of a table.
+
+        Example: None
+        """
+        return {table_name: {'row_count': table.row_count, 'fields': list(table.columns), 'header': table.header}
+                for table_name, table in self.__tables.items()}
@@ -0,0 +1,371 @@
+"""
+Module: json_lines
+Package Path: json_to_csv\lib\json_lines.py
+
+This module provides the JSON Lines input of table_writer. Every line of a JSON Lines source is
+transformed as one item of a top-level array, so the tables are the same as the tables of the
+array of the lines, while only a batch of lines is kept in memory at a time.
+
+Class
+------------------
+    1. `row_spool`: This class keeps the records taken out of the tables in a temporary file.
+
+Function
+------------------
+    1. `iter_json_lines`: This function parses the lines of a JSON Lines source one by one.
+    2. `convert_json_lines`: This function transforms parsed lines with a formatter in batches.
+    3. `split_json_lines`: This function splits a JSON Lines file into chunks of whole lines.
+    4. `write_chunks`: This function converts the chunks of a source file over a process pool.
+    5. `write_json_lines`: This function converts the chunks of a JSON Lines file over a process pool.
+    6. `limit_chunk_count`: This function limits the number of chunks to the worker IDs of an ID generator.
+
+"""
+from . import json_formatter, json_streamer, csv_file_manager
+from concurrent.futures import ProcessPoolExecutor
+import io
+import json
+import os
+import pickle
+import shutil
+import tempfile
+
+_BLANK = ' \t\r\n'
+
+def _parse_line(line):
+    try:
+        return json.loads(line)
+    except RecursionError:
+        return json_streamer.json_event_parser(line).load()
+
+def iter_json_lines(source):
+    """
+    Parses the lines of a JSON Lines source one by one, skipping the blank lines.
+
+    Args:
+        source: A file-like object opened in text mode or a JSON Lines string.
+
+    Returns:
+        generator: The JSON value of each line.
+
+    Example:
+    >>> list(iter_json_lines('{"name": "leo"}\\n\\n{"name": "noah"}\\n'))
+    [{'name': 'leo'}, {'name': 'noah'}]
+    """
+    lines = io.StringIO(source) if isinstance(source, str) else source
+    for line in lines:
+        if line.strip(_BLANK):
+            yield _parse_line(line)
+
+def _iter_raw_lines(path, start, end):
+    with open(path, 'rb') as source_file:
+        source_file.seek(start)
+        position = start
+        while position < end:
+            line = source_file.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line
+
+def _iter_file_lines(path, start, end):
+    for line in _iter_raw_lines(path, start, end):
+        if line.strip(_BLANK.encode()):
+            yield _parse_line(line.decode('utf-8'))
+
+def _count_file_lines(path, start, end):
+    return sum(1 for line in _iter_raw_lines(path, start, end) if line.strip(_BLANK.encode()))
+
+def convert_json_lines(values, formatter, on_rows, first_index: int = 0, batch_size: int = 1024) -> int:
+    """
+    Transforms parsed lines with a formatter, and takes the records out of the tables after every
+    batch of lines.
+
+    Args:
+        values: The JSON values of the lines, such as the values of `iter_json_lines`.
+        formatter (json_formatter.json_formatter): The formatter which transforms the lines.
+        on_rows: A callable receiving the records taken out of the tables, as returned by
+            `json_formatter.drain_tables`.
+        first_index (int): The index of the first line among the lines of the source (default is 0).
+        batch_size (int): The number of lines which are transformed between two drains (default is 1024).
+
+    Returns:
+        int: The number of lines which are transformed.
+
+    Example:
+    >>> formatter = json_formatter.json_formatter()
+    >>> convert_json_lines(iter_json_lines('{"name": "leo"}\\n'), formatter, print)
+    {'root': [('', 'root_0', 'leo')]}
+    1
+    """
+    index = first_index
+    for value in values:
+        formatter.json_item_to_object_list(value, index)
+        index += 1
+        if (index - first_index) % batch_size == 0:
+            on_rows(formatter.drain_tables())
+
+    rows = formatter.drain_tables()
+    if rows:
+        on_rows(rows)
+    return index - first_index
+
+class row_spool:
+    """
+    A class for keeping the records taken out of the tables in a temporary file.
+
+    The records of each drain are pickled in one block for each table, and the offsets of the
+    blocks are kept by table, so the records of a table are read back in their order without
+    reading the records of the other tables.
+
+    Attributes
+    ------------------
+        - __file: The temporary file of the records.
+        - __offsets (dict): The offsets of the blocks of each table in the file, mapped by the table names.
+
+    Methods
+    ------------------
+    1. `write(self, rows: dict)`:
+    - Method to append the records of the tables to the file.
+    - Arguments:
+        - `rows` (dict): The records of each table, mapped by the table names.
+    - Returns: None
+
+    2. `read(self, table_name: str)`:
+    - Method to read the records of a table back in their order.
+    - Arguments:
+        - `table_name` (str): The name of the table.
+    - Returns:
+        - generator: The records of the table.
+
+    3. `close(self)`:
+    - Method to close and delete the temporary file.
+    - Returns: None
+
+    Example:
+    >>> spool = row_spool()
+    >>> spool.write({'lion': [('', 'lion_0', 'leo')]})
+    >>> list(spool.read('lion'))
+    [('', 'lion_0', 'leo')]
+    >>> spool.close()
+    """
+    def __init__(self):
+        """
+        Initializes a row_spool instance with an empty temporary file.
+
+        Args: None
+
+        Returns: None
+
+        Example: None
+        """
+        self.__file = tempfile.TemporaryFile()
+        self.__offsets = {}
+
+    def write(self, rows: dict):
+        spool_file = self.__file
+        spool_file.seek(0, io.SEEK_END)
+        for table_name, table_rows in rows.items():
+            self.__offsets.setdefault(table_name, []).append(spool_file.tell())
+            pickle.dump(table_rows, spool_file, pickle.HIGHEST_PROTOCOL)
+
+    def read(self, table_name: str):
+        for offset in self.__offsets.get(table_name, ()):
+            self.__file.seek(offset)
+            yield from pickle.load(self.__file)
+
+    def close(self):
+        self.__file.close()
+
+def split_json_lines(path: str, count: int) -> list:
+    """
+    Splits a JSON Lines file into chunks of whole lines of about the same size.
+
+    Args:
+        path (str): The path of the JSON Lines file.
+        count (int): The number of chunks.
+
+    Returns:
+        list: The `(start, end)` byte offsets of the chunks which are not empty.
+
+    Example:
+    >>> chunks = split_json_lines('./test/src/events.jsonl', 4)
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, 'rb') as source_file:
+        for index in range(1, count):
+            # The chunk starts at the first line which starts at or after its share of the file.
+            source_file.seek(max(size * index // count - 1, 0))
+            source_file.readline()
+            boundaries.append(max(source_file.tell(), boundaries[-1]))
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+def limit_chunk_count(count: int, id_generator = None) -> int:
+    """
+    Limits the number of chunks to the number of worker IDs of an ID generator, because the
+    generator of each chunk is taken with the index of the chunk as its worker ID.
+
+    Args:
+        count (int): The number of chunks.
+        id_generator (id_generator.id_generator): The ID strategy of the random IDs, or None.
+
+    Returns:
+        int: The number of chunks, at most `id_generator.max_workers`.
+
+    Example:
+    >>> limit_chunk_count(4096, snowflake_id_generator())
+    1024
+    """
+    if id_generator is not None and id_generator.max_workers is not None:
+        return min(count, id_generator.max_workers)
+    return count
+
+def _count_chunk(task):
+    read_chunk, path, start, end, first_index = task
+    formatter = json_formatter.json_formatter()
+    # The index of the first item is needed, because the arrays of the items are named by their index.
+    for index, value in enumerate(read_chunk(path, start, end), first_index):
+        formatter.count_item_records(value, index)
+    return formatter.table_states
+
+def _convert_chunk(task):
+    (read_chunk, path, start, end, first_index, batch_size, table_states, has_random_id, id_prefix, id_generator,
+     chunk_index, part_path, max_open_files) = task
+    os.makedirs(part_path, exist_ok=True)
+    if id_generator is not None:
+        # The chunks may be converted at the same time, so each one generates the IDs of its own worker.
+        id_generator = id_generator.for_worker(chunk_index)
+    formatter = json_formatter.json_formatter(None, has_random_id, id_prefix, id_generator)
+    formatter.restore_tables(table_states)
+    tables = formatter.tables
+    with csv_file_manager.csv_batch_sink(max_open_files) as sink:
+        def write_rows(rows):
+            for table_name, table_rows in rows.items():
+                sink.writerows(os.path.join(part_path, table_name + '.csv'), tables[table_name].iter_rows('', table_rows))
+
+        convert_json_lines(read_chunk(path, start, end), formatter, write_rows, first_index, batch_size)
+
+def _merge_table_states(chunk_states):
+    # The fields of a table are registered in the order they are first seen, so the fields of the
+    # chunks in their order are the fields of the whole file, and the header of the first chunk
+    # which has the table starts with the keys of the first record of the table.
+    merged = {}
+    for table_states in chunk_states:
+        for table_name, state in table_states.items():
+            if table_name not in merged:
+                merged[table_name] = {'row_count': 0, 'fields': dict.fromkeys(state['fields']), 'header': list(state['header'])}
+            else:
+                merged[table_name]['fields'].update(dict.fromkeys(state['fields']))
+
+    for state in merged.values():
+        state['fields'] = list(state['fields'])
+        state['header'] += [key for key in state['fields'] if key not in set(state['header'])]
+    return merged
+
+def write_chunks(read_chunk, path: str, chunks: list, item_counts, output_path: str, max_processes: int, has_random_id: bool = False,
+                 id_prefix: str = '', id_generator = None, batch_size: int = 1024, max_open_files: int = 64) -> dict:
+    """
+    Converts the chunks of a source file to table CSV files over a process pool.
+
+    The items of all chunks are transformed as the items of one top-level array, in two phases:
+    the records of each chunk are counted by table with `json_formatter.count_item_records`, which
+    does not build them, and gives the offsets of the sequential IDs of every chunk, and the fields
+    and headers of the whole file; then each chunk is converted with its offsets to part files,
+    which are appended to the CSV files in the order of the chunks. The CSV files are the same as
+    the files of the items converted in one process.
+
+    Args:
+        read_chunk: A module-level function `read_chunk(path, start, end)` which yields the items of a
+            chunk, so that it can be sent to the worker processes.
+        path (str): The path of the source file.
+        chunks (list): The `(start, end)` byte offsets of the chunks, in the order of the file.
+        item_counts: The number of items of each chunk but the last, or a module-level function
+            `item_counts(path, start, end)` which counts the items of a chunk in the worker processes.
+        output_path (str): The output path for the CSV files.
+        max_processes (int): The maximum number of worker processes.
+        has_random_id (bool): Flag to indicate whether to use random IDs for records (default is False).
+        id_prefix (str): A prefix added to the generated sequential IDs (default is '').
+        id_generator (id_generator.id_generator): The ID strategy of the random IDs. Each chunk uses the
+            generator of `id_generator.for_worker` with the index of the chunk, so there must not be more
+            chunks than its worker IDs, see `limit_chunk_count` (default is None).
+        batch_size (int): The number of items which are transformed between two drains (default is 1024).
+        max_open_files (int): The maximum number of part files which are open at the same time in each
+            worker process (default is 64).
+
+    Returns:
+        dict: The row counts, the fields and the headers of the tables, mapped by the table names.
+
+    Example:
+    >>> chunks = split_json_lines('./test/src/events.jsonl', 4)
+    >>> table_states = write_chunks(_iter_file_lines, './test/src/events.jsonl', chunks, _count_file_lines, './test/result', 4)
+    """
+    if limit_chunk_count(len(chunks), id_generator) < len(chunks):
+        raise ValueError("The number of chunks must not exceed the " + str(id_generator.max_workers) + " worker IDs of the ID generator.")
+
+    with ProcessPoolExecutor(max_workers=max_processes) as executor:
+        if callable(item_counts):
+            item_counts = list(executor.map(item_counts, [path] * len(chunks), *zip(*chunks))) if chunks else []
+        first_indexes = [0]
+        for item_count in item_counts[:len(chunks) - 1]:
+            first_indexes.append(first_indexes[-1] + item_count)
+
+        chunk_states = list(executor.map(_count_chunk, [(read_chunk, path, start, end, first_indexes[index])
+                                                        for index, (start, end) in enumerate(chunks)]))
+        table_states = _merge_table_states(chunk_states)
+
+        part_root = tempfile.mkdtemp(prefix='.parts', dir=output_path)
+        tasks = []
+        for index, (start, end) in enumerate(chunks):
+            # The tables of the chunk start after the records of the previous chunks.
+            offsets = {table_name: dict(state) for table_name, state in table_states.items()}
+            tasks.append((read_chunk, path, start, end, first_indexes[index], batch_size, offsets, has_random_id, id_prefix,
+                          id_generator, index, os.path.join(part_root, str(index)), max_open_files))
+            for table_name, state in chunk_states[index].items():
+                table_states[table_name]['row_count'] += state['row_count']
+        try:
+            list(executor.map(_convert_chunk, tasks))
+            for table_name, state in table_states.items():
+                file_name = os.path.join(output_path, table_name + '.csv')
+                with csv_file_manager.csv_file_manager(file_name, 'w') as csv_editor:
+                    csv_editor.writerow(state['header'])
+                with open(file_name, 'ab') as table_file:
+                    for index in range(len(chunks)):
+                        part_name = os.path.join(part_root, str(index), table_name + '.csv')
+                        if os.path.exists(part_name):
+                            with open(part_name, 'rb') as part_file:
+                                shutil.copyfileobj(part_file, table_file)
+        finally:
+            shutil.rmtree(part_root)
+    return table_states
+
+def write_json_lines(path: str, output_path: str, max_processes: int, has_random_id: bool = False, id_prefix: str = '',
+                     id_generator = None, batch_size: int = 1024, max_open_files: int = 64) -> dict:
+    """
+    Converts a JSON Lines file to table CSV files over a process pool.
+
+    The file is split into one chunk of whole lines for each process, or for each worker ID of the
+    ID generator if it has fewer, the lines of the chunks are counted by the processes, and the chunks are converted by `write_chunks`, so the CSV files are
+    the same as the files of the lines converted in one process.
+
+    Args:
+        path (str): The path of the JSON Lines file.
+        output_path (str): The output path for the CSV files.
+        max_processes (int): The maximum number of worker processes, and the number of chunks.
+        has_random_id (bool): Flag to indicate whether to use random IDs for records (default is False).
+        id_prefix (str): A prefix added to the generated sequential IDs (default is '').
+        id_generator (id_generator.id_generator): The ID strategy of the random IDs, which is copied to
+            every worker process (default is None).
+        batch_size (int): The number of lines which are transformed between two drains (default is 1024).
+        max_open_files (int): The maximum number of part files which are open at the same time in each
+            worker process (default is 64).
+
+    Returns:
+        dict: The row counts, the fields and the headers of the tables, mapped by the table names.
+
+    Example:
+    >>> table_states = write_json_lines('./test/src/events.jsonl', './test/result', 4)
+    """
+    chunks = split_json_lines(path, limit_chunk_count(max_processes, id_generator))
+    return write_chunks(_iter_file_lines, path, chunks, _count_file_lines, output_path, max_processes,
+                        has_random_id, id_prefix, id_generator, batch_size, max_open_files)
@@ -0,0 +1,513 @@
+"""
+Module: json_streamer
+Package Path: json_to_csv\lib\json_streamer.py
+
+This module provides an incremental JSON parser and a streaming formatter which turn a JSON
+document into table records without materializing the whole document in memory.
+
+Classes
+------------------
+    1. `json_event_parser`: This class reads JSON text chunk by chunk and yields parsing events.
+    2. `json_stream_formatter`: This class builds table records from parsing events as they are completed.
+
+"""
+from . import id_generator as id_generators
+import json
+import re
+from json.decoder import scanstring
+from json.scanner import NUMBER_RE
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_LITERALS = (('true', True), ('false', False), ('null', None),
+             ('NaN', float('nan')), ('Infinity', float('inf')), ('-Infinity', float('-inf')))
+_LITERAL_EVENTS = {True: 'boolean', False: 'boolean', None: 'null'}
+_LONGEST_LITERAL = 9
+_NUMBER_LOOKAHEAD = 3
+
+_VALUE, _ARRAY_START, _OBJECT_START, _KEY, _COLON, _NEXT, _END = range(7)
+
+class json_event_parser:
+    """
+    An incremental JSON parser which yields parsing events instead of building the document.
+
+    The parser reads the source in chunks, so the memory usage is bounded by the chunk size and
+    the longest single token rather than by the size of the document.
+
+    Attributes
+    ------------------
+        - __source: The file-like object or the JSON string to be parsed.
+        - __chunk_size (int): The number of characters read from the source at a time.
+
+    Methods
+    ------------------
+    1. `__iter__(self)`:
+    - Method to iterate over the parsing events of the source.
+    - Returns:
+        - iterator: An iterator of `(event, value)` tuples. The events are 'start_map', 'map_key',
+          'end_map', 'start_array', 'end_array', 'string', 'number', 'boolean' and 'null'.
+
+    2. `load(self, object_pairs_hook = None)`:
+    - Method to build the whole document from the parsing events without Python recursion.
+    - Arguments:
+        - `object_pairs_hook`: An optional callable which builds each object from its list of key and value pairs.
+    - Returns:
+        - The parsed JSON document.
+
+    Typical Usage
+    ------------------
+    1. Create an instance of `json_event_parser` with a file-like object or a JSON string.
+    2. Iterate over the instance to receive the parsing events.
+
+    Example:
+    >>> parser = json_event_parser('{"lion": [12, "leo"]}')
+    >>> list(parser)
+    [('start_map', None), ('map_key', 'lion'), ('start_array', None), ('number', 12), ('string', 'leo'), ('end_array', None), ('end_map', None)]
+    """
+    def __init__(self, source, chunk_size: int = 65536):
+        """
+        Initializes a json_event_parser instance with the JSON source.
+
+        Args:
+            source: A file-like object opened in text mode or a JSON string.
+            chunk_size (int): The number of characters read from the source at a time (default is 65536).
+
+        Returns: None
+
+        Example: None
+        """
+        self.__source = source
+        self.__chunk_size = chunk_size
+
+    def __iter__(self):
+        if isinstance(self.__source, str):
+            buffer, read = self.__source, None
+        else:
+            buffer, read = '', self.__source.read
+
+        position = 0
+        is_eof = read is None
+        stack = []
+        state = _VALUE
+        match_whitespace = _WHITESPACE.match
+        match_number = NUMBER_RE.match
+
+        while True:
+            position = match_whitespace(buffer, position).end()
+            if position == len(buffer):
+                if is_eof:
+                    break
+                buffer, position = read(self.__chunk_size), 0
+                is_eof = not buffer
+                continue
+
+            char = buffer[position]
+
+            if state == _NEXT:
+                if char == ',':
+                    state = _KEY if stack[-1] else _VALUE
+                    position += 1
+                    continue
+                if char == ('}' if stack[-1] else ']'):
+                    yield ('end_map', None) if stack.pop() else ('end_array', None)
+                    state = _NEXT if stack else _END
+                    position += 1
+                    continue
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+
+            if state == _OBJECT_START or state == _KEY:
+                if char == '}' and state == _OBJECT_START:
+                    stack.pop()
+                    yield ('end_map', None)
+                    state = _NEXT if stack else _END
+                    position += 1
+                    continue
+                if char != '"':
+                    raise json.JSONDecodeError("Expecting property name enclosed in double quotes", buffer, position)
+            elif state == _COLON:
+                if char != ':':
+                    raise json.JSONDecodeError("Expecting ':' delimiter", buffer, position)
+                state = _VALUE
+                position += 1
+                continue
+            elif state == _END:
+                raise json.JSONDecodeError("Extra data", buffer, position)
+            elif char == ']' and state == _ARRAY_START:
+                stack.pop()
+                yield ('end_array', None)
+                state = _NEXT if stack else _END
+                position += 1
+                continue
+
+            if char == '{':
+                stack.append(True)
+                yield ('start_map', None)
+                state = _OBJECT_START
+                position += 1
+                continue
+            if char == '[':
+                stack.append(False)
+                yield ('start_array', None)
+                state = _ARRAY_START
+                position += 1
+                continue
+
+            if char == '"':
+                try:
+                    value, end = scanstring(buffer, position + 1)
+                except json.JSONDecodeError:
+                    if is_eof:
+                        raise
+                    chunk = read(max(self.__chunk_size, len(buffer)))
+                    is_eof = not chunk
+                    buffer, position = buffer[position:] + chunk, 0
+                    continue
+                position = end
+                if state == _VALUE or state == _ARRAY_START:
+                    yield ('string', value)
+                    state = _NEXT if stack else _END
+                else:
+                    yield ('map_key', value)
+                    state = _COLON
+                continue
+
+            if state != _VALUE and state != _ARRAY_START:
+                raise json.JSONDecodeError("Expecting value", buffer, position)
+
+            number = match_number(buffer, position)
+            if number is not None:
+                if is_eof or len(buffer) - number.end() >= _NUMBER_LOOKAHEAD:
+                    integer, fraction, exponent = number.groups()
+                    if fraction or exponent:
+                        value = float(integer + (fraction or '') + (exponent or ''))
+                    else:
+                        value = int(integer)
+                    position = number.end()
+                    yield ('number', value)
+                    state = _NEXT if stack else _END
+                    continue
+            else:
+                literal = next((item for item in _LITERALS if buffer.startswith(item[0], position)), None)
+                if literal is not None:
+                    position += len(literal[0])
+                    yield (_LITERAL_EVENTS.get(literal[1], 'number'), literal[1])
+                    state = _NEXT if stack else _END
+                    continue
+                if is_eof or len(buffer) - position >= _LONGEST_LITERAL:
+                    raise json.JSONDecodeError("Expecting value", buffer, position)
+
+            chunk = read(self.__chunk_size)
+            is_eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+
+        if state != _END:
+            raise json.JSONDecodeError("Expecting value", buffer, position)
+
+    def load(self, object_pairs_hook = None):
+        """
+        Method to build the whole document from the parsing events without Python recursion.
+
+        Unlike `json.load`, the nesting depth of the document is not limited by the recursion limit.
+
+        Args:
+            object_pairs_hook: An optional callable which builds each object from its list of key and
+                value pairs, like the `object_pairs_hook` of `json.load`.
+
+        Returns:
+            The parsed JSON document.
+
+        Example:
+        >>> document = json_event_parser('[' * 5000 + ']' * 5000).load()
+        """
+        document = None
+        stack = []
+
+        for event, value in self:
+            if event == 'map_key':
+                stack[-1][1] = value
+                continue
+            if event == 'start_map':
+                stack.append([[] if object_pairs_hook is not None else {}, None, True])
+                continue
+            if event == 'start_array':
+                stack.append([[], None, False])
+                continue
+            if event == 'end_map' or event == 'end_array':
+                value, _, is_map = stack.pop()
+                if is_map and object_pairs_hook is not None:
+                    value = object_pairs_hook(value)
+
+            if not stack:
+                document = value
+                continue
+
+            container, key, is_map = stack[-1]
+            if not is_map:
+                container.append(value)
+            elif object_pairs_hook is not None:
+                container.append((key, value))
+            else:
+                container[key] = value
+
+        return document
+
+class _dict_frame:
+    __slots__ = ('table', 'record', 'key', 'order', 'key_count')
+
+    def __init__(self, table, record, order):
+        self.table = table
+        self.record = record
+        self.key = None
+        self.order = order
+        self.key_count = 0
+
+class _list_frame:
+    __slots__ = ('table', 'parent_id', 'owner', 'key', 'first_count', 'pure_values', 'item_count')
+
+    def __init__(self, table, parent_id, owner = None, key = None, first_count = 0):
+        self.table = table
+        self.parent_id = parent_id
+        self.owner = owner
+        self.key = key
+        self.first_count = first_count
+        self.pure_values = [] if owner is not None else None
+        self.item_count = 0
+
+class json_stream_formatter:
+    """
+    A class for building table records from JSON parsing events while the source is being parsed.
+
+    The records are the same as the records produced by `json_formatter.json_to_object_list`, but
+    each record is handed over as soon as it is completed, so only the records on the current
+    nesting path are kept in memory.
+
+    Attributes
+    ------------------
+        - random_id (bool): Flag to indicate whether to use random IDs for records.
+        - id_generator (id_generator.id_generator): The ID strategy of the random IDs.
+        - id_prefix (str): A prefix added to the generated sequential IDs.
+        - __headers (dict): A dictionary of the ordered CSV header of each table.
+
+    Methods
+    ------------------
+    1. `discover(self, events)`:
+    - Method to collect the tables and the ordered header of each table from the parsing events.
+    - Arguments:
+        - `events`: An iterable of parsing events, such as a `json_event_parser`.
+    - Returns: None
+
+    2. `stream_to_object_list(self, events, on_record, collect_headers: bool = False)`:
+    - Method to build the table records from the parsing events.
+    - Arguments:
+        - `events`: An iterable of parsing events, such as a `json_event_parser`.
+        - `on_record`: A callable receiving the table name and the record when a record is completed.
+        - `collect_headers` (bool): Flag to indicate whether the headers are collected in the same pass.
+    - Returns: None
+
+    Properties
+    ------------------
+        - headers (dict): Property to get or set the ordered header of each table.
+
+    Typical Usage
+    ------------------
+    1. Create an instance of `json_stream_formatter`.
+    2. Call the `discover` method to collect the headers from a first pass over the source.
+    3. Call the `stream_to_object_list` method to receive the records from a second pass over the source.
+
+    Example:
+    >>> source = '{"lion": [{"years old": 12, "name": "leo"}, {"years old": 6, "name": "noah"}]}'
+    >>> formatter = json_stream_formatter()
+    >>> formatter.discover(json_event_parser(source))
+    >>> formatter.headers
+    {'lion': ['parent_id', 'lion_id', 'years old', 'name'], 'root': ['parent_id', 'root_id', 'lion']}
+    >>> formatter.stream_to_object_list(json_event_parser(source), lambda table, record: print(table, record))
+    lion {'parent_id': 'lion_0', 'lion_id': 'lion_0', 'years old': 12, 'name': 'leo'}
+    lion {'parent_id': 'lion_0', 'lion_id': 'lion_1', 'years old': 6, 'name': 'noah'}
+    root {'parent_id': '', 'root_id': 'root_0', 'lion': 'lion_0'}
+    """
+    def __init__(self, random_id: bool = False, id_prefix: str = '', id_generator = None):
+        """
+        Initializes a json_stream_formatter instance.
+
+        Args:
+            random_id (bool): Flag to indicate whether to use random IDs for records.
+            id_prefix (str): A prefix added to the generated sequential IDs (default is '').
+            id_generator (id_generator.id_generator): The ID strategy of the random IDs. If it is given,
+                the random IDs are used (default is None, which uses UUID4 strings if `random_id` is True).
+                The content-based strategies are not available, because the IDs of the references are
+                needed before their values are parsed.
+
+        Returns: None
+
+        Example: None
+        """
+        if id_generator is not None and id_generator.is_content_based:
+            raise ValueError("The content-based ID strategies are not available in the streaming mode.")
+
+        self.random_id = random_id or id_generator is not None
+        self.id_generator = id_generator if id_generator is not None else id_generators.uuid_id_generator()
+        self.id_prefix = id_prefix
+        self.__headers = {}
+
+    def discover(self, events):
+        """
+        Method to collect the tables and the ordered header of each table from the parsing events.
+
+        The header of a table starts with the keys of its first completed record and continues with
+        the other fields in the order they are first seen in the source.
+
+        Args:
+            events: An iterable of parsing events, such as a `json_event_parser`.
+
+        Returns: None
+
+        Example: None
+        """
+        self.__discover(events, None)
+
+    def __discover(self, events, on_record):
+        first_keys = {}
+        field_orders = {}
+
+        def on_first_record(table, record):
+            if table not in first_keys:
+                first_keys[table] = list(record.keys())
+            if on_record is not None:
+                on_record(table, record)
+
+        def on_key(table, key, order):
+            table_orders = field_orders.setdefault(table, {})
+            if key not in table_orders or order < table_orders[key]:
+                table_orders[key] = order
+
+        self.__traverse(events, on_first_record, on_key)
+
+        self.__headers = {}
+        for table, keys in first_keys.items():
+            # A table whose objects are all empty has no field orders.
+            table_orders = field_orders.get(table, {})
+            header = keys + sorted((key for key in table_orders if key not in keys), key=table_orders.__getitem__)
+            self.__headers[table] = list(dict.fromkeys(header))
+
+    def stream_to_object_list(self, events, on_record, collect_headers: bool = False):
+        """
+        Method to build the table records from the parsing events.
+
+        Args:
+            events: An iterable of parsing events, such as a `json_event_parser`.
+            on_record: A callable receiving the table name and the record when a record is completed.
+            collect_headers (bool): Flag to indicate whether the headers are collected in the same pass,
+                as `discover` collects them, so that headers which were set from a cache can be checked
+                (default is False).
+
+        Returns: None
+
+        Example: None
+        """
+        if collect_headers:
+            self.__discover(events, on_record)
+        else:
+            self.__traverse(events, on_record)
+
+    def __new_id(self, table_name, parent_id, counts):
+        if self.random_id:
+            return self.id_generator.next_id(table_name, parent_id, table_name, None)
+        return self.id_prefix + table_name + "_" + str(counts.get(table_name, 0))
+
+    def __new_record(self, table_name, parent_id, id, counts, order):
+        record = {"parent_id": parent_id if table_name != 'root' else ''}
+        record[table_name + '_id'] = self.id_prefix + table_name + "_" + str(counts.get(table_name, 0)) if self.random_id == False else self.id_generator.next_id(table_name, parent_id, '', None) if id == None else id
+        return _dict_frame(table_name, record, order)
+
+    def __list_parent_id(self, frame):
+        if frame.parent_id is None:
+            frame.parent_id = self.id_generator.next_id(frame.key, '', frame.key, None) if self.random_id else self.id_prefix + frame.key + "_" + str(frame.first_count)
+        return frame.parent_id
+
+    def __traverse(self, events, on_record, on_key = None):
+        counts = {}
+        stack = []
+        frame = None
+        order = 0
+
+        for event, value in events:
+            if event == 'map_key':
+                frame.key = value
+                if on_key is not None:
+                    on_key(frame.table, value, (frame.order, frame.key_count))
+                    frame.key_count += 1
+                continue
+
+            if event == 'end_map':
+                counts[frame.table] = counts.get(frame.table, 0) + 1
+                on_record(frame.table, frame.record)
+                frame = stack.pop()
+                continue
+
+            if event == 'end_array':
+                if frame.owner is not None:
+                    pure_value = None
+                    if frame.pure_values is not None:
+                        pure_value = ", ".join([str(item) for item in frame.pure_values])
+                    frame.owner.record[frame.key] = pure_value if pure_value else self.__list_parent_id(frame)
+                frame = stack.pop()
+                continue
+
+            is_container = event == 'start_map' or event == 'start_array'
+
+            if frame is None:
+                if not is_container:
+                    continue
+                stack.append(None)
+                if event == 'start_map':
+                    frame = self.__new_record('root', '', None, counts, order)
+                    order += 1
+                else:
+                    frame = _list_frame('root', '')
+            elif type(frame) is _dict_frame:
+                key = frame.key
+                if event == 'start_map':
+                    record = frame.record
+                    record[key] = self.__new_id(key, record[frame.table + '_id'], counts)
+                    stack.append(frame)
+                    frame = self.__new_record(key, record[frame.table + '_id'], record[key], counts, order)
+                    order += 1
+                elif event == 'start_array':
+                    frame.record[key] = None
+                    stack.append(frame)
+                    frame = _list_frame(key, None, frame, key, counts.get(key, 0))
+                else:
+                    frame.record[key] = value
+            else:
+                item_count = frame.item_count
+                frame.item_count += 1
+                if not is_container:
+                    if frame.pure_values is not None:
+                        frame.pure_values.append(value)
+                    continue
+
+                frame.pure_values = None
+                parent_id = self.__list_parent_id(frame)
+                stack.append(frame)
+                if event == 'start_map':
+                    frame = self.__new_record(frame.table, parent_id, None, counts, order)
+                    order += 1
+                else:
+                    table_name = frame.table
+                    next_key = self.id_prefix + table_name + "_" + str(item_count) + "_" + str(counts.get(table_name, 0)) if self.random_id == False else self.id_generator.next_id(table_name + "_" + str(item_count), parent_id, item_count, None)
+                    frame = _list_frame(table_name + "_" + str(item_count), next_key)
+
+    @property
+    def headers(self) -> dict:
+        """
+        Property to get or set the ordered header of each table.
+
+        Returns:
+            dict: A dictionary of the ordered CSV header of each table.
+
+        Example: None
+        """
+        return self.__headers
+
+    @headers.setter
+    def headers(self, value: dict):
+        self.__headers = value
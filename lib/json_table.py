@@ -0,0 +1,259 @@
+"""
+Module: json_table
+Package Path: json_to_csv\lib\json_table.py
+
+This module provides a compact row storage for the tables built from nested JSON data.
+
+Class
+------------------
+    1. `json_table`: This class stores the records of one table as tuples with a shared header.
+
+Constant
+------------------
+    1. `MISSING`: The sentinel stored for a field which is missing in a record.
+
+"""
+import operator
+
+class _missing:
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+    def __reduce__(self):
+        return 'MISSING'
+
+MISSING = _missing()
+
+class json_table:
+    """
+    A class for storing the records of one table as tuples with a shared header.
+
+    The fields of the table are kept once in a mapping of the field name to its column position,
+    and every record is stored as a tuple of its values in the column positions. A field which is
+    missing in a record is stored as `MISSING`, and the fields which are registered after a record
+    is stored are not stored in the record at all, so the records are never padded.
+
+    Attributes
+    ------------------
+        - name (str): The name of the table.
+        - columns (dict): A mapping of the field names to their column positions, in column order.
+        - rows (list): The records of the table as tuples of the values in column order.
+        - order (tuple): The column positions of the fields of the first record in the order of its keys.
+        - offset (int): The number of records of the table which are not stored in it, because they were
+          written by an earlier run of the incremental mode, taken out with `drain` or only counted.
+
+    Methods
+    ------------------
+    1. `append(self, row, keys)`:
+    - Method to store a record.
+    - Arguments:
+        - `row`: The values of the record in column order.
+        - `keys`: The keys of the record in their order.
+    - Returns: None
+
+    2. `count(self, keys)`:
+    - Method to count a record without storing it.
+    - Arguments:
+        - `keys`: The keys of the record in their order.
+    - Returns: None
+
+    3. `iter_rows(self, missing='', rows=None)`:
+    - Method to iterate over the records as tuples in header order.
+    - Arguments:
+        - `missing`: The value of the missing fields.
+        - `rows`: The records to iterate over, or None for the stored records.
+    - Returns:
+        - generator: The records as tuples in header order.
+
+    4. `records(self) -> list`:
+    - Method to build the records as dictionaries in header order.
+    - Returns:
+        - list: The records as dictionaries, with '' for the missing fields.
+
+    5. `drain(self) -> list`:
+    - Method to take the stored records out of the table.
+    - Returns:
+        - list: The records as tuples in column order.
+
+    Properties
+    ------------------
+        - header (list): Property to access the field names in CSV column order.
+        - row_count (int): Property to access the number of records including the records written before.
+
+    Typical Usage
+    ------------------
+    1. Create an instance of `json_table` with the name and the column mapping of a table.
+    2. Call the `append` method to store the records.
+    3. Use the `header` property and the `iter_rows` method to write the table.
+
+    Example:
+    >>> table = json_table('lion', {'parent_id': 0, 'lion_id': 1, 'name': 2})
+    >>> table.append(('', 'lion_0', 'leo'), ['name'])
+    >>> table.columns['meal'] = 3
+    >>> table.append(('', 'lion_1', MISSING, 6), ['meal'])
+    >>> print(table.header)
+    ['parent_id', 'lion_id', 'name', 'meal']
+    >>> print(list(table.iter_rows()))
+    [('', 'lion_0', 'leo', ''), ('', 'lion_1', '', 6)]
+    """
+    __slots__ = ('name', 'columns', 'rows', 'order', 'offset')
+
+    def __init__(self, name: str, columns: dict):
+        """
+        Initializes a json_table instance with the name and the column mapping of a table.
+
+        Args:
+            name (str): The name of the table.
+            columns (dict): A mapping of the field names to their column positions. The mapping is
+                shared with the field registry, so the fields registered later are added to the table.
+
+        Returns: None
+
+        Example: None
+        """
+        self.name = name
+        self.columns = columns
+        self.rows = []
+        self.order = None
+        self.offset = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def append(self, row, keys):
+        """
+        Method to store a record.
+
+        The keys of the first record decide the order of the first columns of the header, as the
+        keys of the first record of a table did for the CSV header before.
+
+        Args:
+            row: The values of the record in column order.
+            keys: The keys of the record in their order, not including `parent_id` and the ID field.
+
+        Returns: None
+
+        Example: None
+        """
+        if self.order is None:
+            columns = self.columns
+            self.order = tuple(columns[key] for key in dict.fromkeys(("parent_id", self.name+"_id", *keys)))
+        self.rows.append(tuple(row))
+
+    def count(self, keys):
+        """
+        Method to count a record without storing it.
+
+        The record numbers the sequential IDs and decides the header like a record stored with
+        `append`, so the row count and the header are the same as if the record was stored.
+
+        Args:
+            keys: The keys of the record in their order, not including `parent_id` and the ID field.
+
+        Returns: None
+
+        Example: None
+        """
+        if self.order is None:
+            columns = self.columns
+            self.order = tuple(columns[key] for key in dict.fromkeys(("parent_id", self.name+"_id", *keys)))
+        self.offset += 1
+
+    @property
+    def header(self) -> list:
+        """
+        Property to access the field names in CSV column order.
+
+        The fields of the first record come first in the order of its keys, and the other fields
+        follow in the order they are registered.
+
+        Returns:
+            list: The field names in CSV column order.
+
+        Example: None
+        """
+        names = list(self.columns)
+        return [names[index] for index in self.__header_positions()]
+
+    @property
+    def row_count(self) -> int:
+        """
+        Property to access the number of records of the table, including the records which were
+        written before by an earlier run, which numbers the sequential IDs.
+
+        Returns:
+            int: The number of records.
+
+        Example: None
+        """
+        return self.offset + len(self.rows)
+
+    def __header_positions(self):
+        order = self.order if self.order is not None else ()
+        positions = set(order)
+        return list(order) + [index for index in range(len(self.columns)) if index not in positions]
+
+    def iter_rows(self, missing='', rows=None):
+        """
+        Method to iterate over the records as tuples in header order.
+
+        Args:
+            missing: The value of the missing fields (default is '').
+            rows: The records to iterate over, such as the records taken out with `drain`, or None for
+                the stored records (default is None).
+
+        Returns:
+            generator: The records as tuples in header order.
+
+        Example: None
+        """
+        positions = self.__header_positions()
+        width = len(positions)
+        getter = operator.itemgetter(*positions)
+
+        for row in (self.rows if rows is None else rows):
+            if len(row) < width:
+                row = row + (MISSING,) * (width - len(row))
+            if MISSING in row:
+                row = tuple(missing if value is MISSING else value for value in row)
+            yield getter(row)
+
+    def drain(self) -> list:
+        """
+        Method to take the stored records out of the table.
+
+        The table keeps its fields and its header, and the records which are taken out are counted
+        in `offset`, so the sequential IDs of the later records continue after them.
+
+        Returns:
+            list: The records as tuples in column order, which `iter_rows` can order by the header.
+
+        Example:
+        >>> table = json_table('lion', {'parent_id': 0, 'lion_id': 1, 'name': 2})
+        >>> table.append(('', 'lion_0', 'leo'), ['name'])
+        >>> rows = table.drain()
+        >>> print(len(table), table.row_count, list(table.iter_rows(rows=rows)))
+        0 1 [('', 'lion_0', 'leo')]
+        """
+        rows = self.rows
+        self.offset += len(rows)
+        self.rows = []
+        return rows
+
+    def records(self) -> list:
+        """
+        Method to build the records as dictionaries in header order.
+
+        Returns:
+            list: The records as dictionaries, with '' for the missing fields.
+
+        Example:
+        >>> table = json_table('lion', {'parent_id': 0, 'lion_id': 1, 'name': 2})
+        >>> table.append(('', 'lion_0', 'leo'), ['name'])
+        >>> print(table.records())
+        [{'parent_id': '', 'lion_id': 'lion_0', 'name': 'leo'}]
+        """
+        header = self.header
+        return [dict(zip(header, row)) for row in self.iter_rows()]
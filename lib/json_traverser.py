@@ -0,0 +1,58 @@
+"""
+Module: json_traverser
+Package Path: json_to_csv\lib\json_traverser.py
+
+This module provides an explicit-stack traversal engine for nested JSON data.
+
+Function
+------------------
+    1. `traverse`: This function runs a depth-first traversal written as nested generators.
+
+"""
+
+# The depth up to which a pass may call itself recursively. A recursive call costs less per node
+# than a generator on the explicit stack, so the passes recurse up to this depth and hand the deeper
+# subtrees to `traverse`, which keeps the depth of the Python stack bounded.
+RECURSION_DEPTH = 200
+
+def traverse(visitor) -> None:
+    """
+    Runs a depth-first traversal with an explicit stack instead of Python recursion.
+
+    A traversal is written as a generator which handles one node. Where a recursive function would
+    call itself for a child node, the generator yields the generator of the child node instead. The
+    child is fully traversed before the parent generator is resumed, so the code after a `yield`
+    and the code after the loop run in the same order as the code after a recursive call would.
+    The depth of the traversal is only limited by the available memory.
+
+    Args:
+        visitor: The generator which handles the root node.
+
+    Returns: None
+
+    Example:
+    >>> def count_leaves(value, counter):
+    ...     for item in (value.values() if type(value) is dict else value):
+    ...         if type(item) is dict or type(item) is list:
+    ...             yield count_leaves(item, counter)
+    ...         else:
+    ...             counter[0] += 1
+    >>> counter = [0]
+    >>> traverse(count_leaves({"a": [1, 2, {"b": 3}], "c": 4}, counter))
+    >>> print(counter[0])
+    4
+    """
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    current = visitor
+
+    while True:
+        for child in current:
+            push(current)
+            current = child
+            break
+        else:
+            if not stack:
+                return
+            current = pop()
@@ -0,0 +1,270 @@
+"""
+Module: metrics
+Package Path: json_to_csv\lib\metrics.py
+
+This module provides the instrumentation of the writers: the seconds and the peak memory of the
+stages of a conversion, and the rows and the bytes written for each table.
+
+Class
+------------------
+    1. `pipeline_metrics`: This class collects the timings, the memory and the table counters of the writers.
+
+Function
+------------------
+    1. `measure`: This function returns the context manager which measures a stage, or does nothing without metrics.
+
+"""
+import contextlib
+import os
+import time
+import tracemalloc
+
+_NO_STAGE = contextlib.nullcontext()
+
+def measure(metrics, stage_name: str):
+    """
+    Returns the context manager which measures a stage, so the writers measure their stages with
+    one `with` statement, which does nothing when the metrics are disabled.
+
+    Args:
+        metrics (pipeline_metrics): The metrics of the writer, or None if they are disabled.
+        stage_name (str): The name of the stage.
+
+    Returns:
+        context manager: `metrics.stage(stage_name)`, or a shared `contextlib.nullcontext` without metrics.
+
+    Example:
+    >>> with measure(None, 'transform'):
+    ...     pass
+    """
+    if metrics is None:
+        return _NO_STAGE
+    return metrics.stage(stage_name)
+
+class pipeline_metrics:
+    """
+    A class for collecting the timings, the memory and the table counters of the writers.
+
+    A writer which is given an instance measures its stages with it: 'parse' (loading the source
+    data in the constructor), 'validate' (checking the formatted data of the manual mode), 'discover'
+    (the discovery pass of the streaming mode and of the record path of flat_writer), 'transform'
+    and 'write'. The seconds of a stage are added up when it runs more than once. After writing a
+    table, the writer records its rows and the bytes of its file. Without an instance, the writers
+    only check that there is none, so the disabled metrics cost nothing.
+
+    Attributes
+    ------------------
+        - __track_memory (bool): Flag to indicate whether the peak memory of each stage is traced.
+        - __callback: A callable which receives the name, the seconds and the peak memory of every
+          stage when it ends, or None.
+        - __stage_timings (dict): The seconds spent in each stage, mapped by the stage names.
+        - __peak_memory (dict): The peak bytes allocated in each stage, mapped by the stage names.
+        - __table_rows (dict): The rows written for each table, mapped by the table names.
+        - __table_bytes (dict): The bytes of the file of each table, mapped by the table names.
+
+    Methods
+    ------------------
+    1. `stage(self, stage_name: str)`:
+    - Method to measure a stage in a `with` statement.
+    - Arguments:
+        - `stage_name` (str): The name of the stage.
+    - Returns:
+        - context manager: The measurement of the stage.
+
+    2. `record_table(self, table_name: str, rows: int, file_name: str = None)`:
+    - Method to record the rows written for a table and the bytes of its file.
+    - Arguments:
+        - `table_name` (str): The name of the table.
+        - `rows` (int): The number of rows written for the table.
+        - `file_name` (str): The path of the file of the table, or None if there is no file.
+    - Returns: None
+
+    3. `report(self) -> dict`:
+    - Method to collect all measurements in one dictionary.
+    - Returns:
+        - dict: The stage timings, the peak memory and the table counters.
+
+    4. `reset(self)`:
+    - Method to forget all measurements.
+    - Returns: None
+
+    Properties
+    ------------------
+        - stage_timings (dict): Property to access the seconds spent in each stage.
+        - peak_memory (dict): Property to access the peak bytes allocated in each stage.
+        - table_rows (dict): Property to access the rows written for each table.
+        - table_bytes (dict): Property to access the bytes of the file of each table.
+
+    Typical Usage
+    ------------------
+    1. Create an instance of `pipeline_metrics`, optionally with memory tracing and a callback.
+    2. Pass it as the `metrics` of a `table_writer` or a `flat_writer`.
+    3. Read the properties or the `report` after the conversion.
+
+    Example:
+    >>> metrics = pipeline_metrics(track_memory=True)
+    >>> writer = table_writer(source_data, output_path, metrics=metrics)
+    >>> writer.transform()
+    >>> writer.write_to_file()
+    >>> print(metrics.stage_timings['transform'], metrics.table_rows['root'])
+    """
+    def __init__(self, track_memory: bool = False, callback = None):
+        """
+        Initializes a pipeline_metrics instance without measurements.
+
+        Args:
+            track_memory (bool): Flag to indicate whether the peak memory of each stage is traced with
+                tracemalloc (default is False). The tracing makes the conversion several times slower, so
+                it is only turned on during the stages and only when it is asked for.
+            callback: A callable `callback(stage_name, seconds, peak_memory)` which is called when a stage
+                ends, with None as the peak memory if it is not traced (default is None).
+
+        Returns: None
+
+        Example: None
+        """
+        self.__track_memory = track_memory
+        self.__callback = callback
+        self.reset()
+
+    @contextlib.contextmanager
+    def stage(self, stage_name: str):
+        """
+        Method to measure a stage in a `with` statement.
+
+        The peak memory of a stage is the highest number of bytes allocated by Python since the stage
+        started, which tracemalloc traces during the stage if it is not tracing already.
+
+        Args:
+            stage_name (str): The name of the stage.
+
+        Returns:
+            context manager: The measurement of the stage.
+
+        Example:
+        >>> metrics = pipeline_metrics()
+        >>> with metrics.stage('transform'):
+        ...     pass
+        >>> 'transform' in metrics.stage_timings
+        True
+        """
+        is_tracing = False
+        if self.__track_memory:
+            is_tracing = not tracemalloc.is_tracing()
+            if is_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            base_memory = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            seconds = time.perf_counter() - start
+            peak_memory = None
+            if self.__track_memory:
+                peak_memory = max(tracemalloc.get_traced_memory()[1] - base_memory, 0)
+                if is_tracing:
+                    tracemalloc.stop()
+                self.__peak_memory[stage_name] = max(self.__peak_memory.get(stage_name, 0), peak_memory)
+            self.__stage_timings[stage_name] = self.__stage_timings.get(stage_name, 0.0) + seconds
+            if self.__callback is not None:
+                self.__callback(stage_name, seconds, peak_memory)
+
+    def record_table(self, table_name: str, rows: int, file_name: str = None):
+        """
+        Method to record the rows written for a table and the bytes of its file.
+
+        Args:
+            table_name (str): The name of the table.
+            rows (int): The number of rows written for the table, without the header.
+            file_name (str): The path of the file of the table, or None if there is no file (default is None).
+
+        Returns: None
+
+        Example: None
+        """
+        self.__table_rows[table_name] = rows
+        if file_name is not None and os.path.exists(file_name):
+            self.__table_bytes[table_name] = os.path.getsize(file_name)
+
+    def report(self) -> dict:
+        """
+        Method to collect all measurements in one dictionary.
+
+        Returns:
+            dict: The seconds and the peak memory of the stages under 'stages' and 'peak_memory', and the
+                rows and the bytes of the tables under 'tables'.
+
+        Example:
+        >>> pipeline_metrics().report()
+        {'stages': {}, 'peak_memory': {}, 'tables': {}}
+        """
+        return {
+            'stages': dict(self.__stage_timings),
+            'peak_memory': dict(self.__peak_memory),
+            'tables': {table_name: {'rows': rows, 'bytes': self.__table_bytes.get(table_name)}
+                       for table_name, rows in self.__table_rows.items()},
+        }
+
+    def reset(self):
+        """
+        Method to forget all measurements.
+
+        Args: None
+
+        Returns: None
+
+        Example: None
+        """
+        self.__stage_timings = {}
+        self.__peak_memory = {}
+        self.__table_rows = {}
+        self.__table_bytes = {}
+
+    @property
+    def stage_timings(self) -> dict:
+        """
+        Property to access the seconds spent in each stage.
+
+        Returns:
+            dict: The seconds of each stage, mapped by the stage names.
+
+        Example: None
+        """
+        return self.__stage_timings
+
+    @property
+    def peak_memory(self) -> dict:
+        """
+        Property to access the peak bytes allocated in each stage, if the memory is traced.
+
+        Returns:
+            dict: The peak bytes of each stage, mapped by the stage names.
+
+        Example: None
+        """
+        return self.__peak_memory
+
+    @property
+    def table_rows(self) -> dict:
+        """
+        Property to access the rows written for each table.
+
+        Returns:
+            dict: The number of rows of each table, mapped by the table names.
+
+        Example: None
+        """
+        return self.__table_rows
+
+    @property
+    def table_bytes(self) -> dict:
+        """
+        Property to access the bytes of the file of each table.
+
+        Returns:
+            dict: The size of the file of each table, mapped by the table names.
+
+        Example: None
+        """
+        return self.__table_bytes
@@ -0,0 +1,248 @@
+"""
+Module: schema_cache
+Package Path: json_to_csv\lib\schema_cache.py
+
+This module provides a cache of the table headers of the documents, keyed by a structural
+fingerprint, which lets the streaming mode of table_writer skip its discovery pass for the
+documents whose shape it has seen before.
+
+Class
+------------------
+    1. `schema_cache`: This class keeps the table headers in a bounded in-memory LRU and an optional directory.
+
+Function
+------------------
+    1. `structural_fingerprint`: This function computes a fingerprint of the structure at the start of a document.
+
+"""
+import collections
+import hashlib
+import json
+import os
+
+def structural_fingerprint(events, max_events: int = 4096) -> str:
+    """
+    Computes a fingerprint of the structure at the start of a document.
+
+    The fingerprint hashes the kinds of the first `max_events` parsing events and the keys of the
+    objects, but not the values, so the documents which only differ in their values have the same
+    fingerprint. Only the start of the document is read, so the fingerprint is cheap and only
+    predicts the shape of the rest of the document, which has to be checked when it is used.
+
+    Args:
+        events: An iterable of parsing events, such as a `json_streamer.json_event_parser`.
+        max_events (int): The number of parsing events which are hashed (default is 4096).
+
+    Returns:
+        str: The fingerprint as a hexadecimal string.
+
+    Example:
+    >>> from json_to_csv.lib.json_streamer import json_event_parser
+    >>> structural_fingerprint(json_event_parser('{"lion": 12}')) == structural_fingerprint(json_event_parser('{"lion": 6}'))
+    True
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for count, (event, value) in enumerate(events):
+        if count == max_events:
+            break
+        digest.update(event.encode())
+        if event == 'map_key':
+            encoded = value.encode('utf-8', 'surrogatepass')
+            digest.update(str(len(encoded)).encode() + b':' + encoded)
+        digest.update(b';')
+    return digest.hexdigest()
+
+class schema_cache:
+    """
+    A class for keeping the table headers of the documents by their structural fingerprints.
+
+    The headers are kept in an in-memory LRU of at most `max_size` entries, which evicts the least
+    recently used entry first. If a directory is given, every entry is also stored there as a JSON
+    file, so the headers are reused by later processes, and the entries which are not in memory are
+    loaded from it.
+
+    Attributes
+    ------------------
+        - __entries (collections.OrderedDict): The headers of the tables, mapped by the fingerprints in
+          least recently used order.
+        - __max_size (int): The maximum number of entries kept in memory.
+        - __path (str): The directory of the stored entries, or None to keep them in memory only.
+        - __hits (int): The number of lookups which found an entry.
+        - __misses (int): The number of lookups which did not find an entry.
+        - __invalidations (int): The number of entries which were removed because they did not match a document.
+
+    Methods
+    ------------------
+    1. `get(self, fingerprint: str) -> dict`:
+    - Method to look up the headers of a fingerprint.
+    - Arguments:
+        - `fingerprint` (str): The structural fingerprint of a document.
+    - Returns:
+        - dict: The headers of the tables, mapped by the table names, or None if there is no entry.
+
+    2. `put(self, fingerprint: str, headers: dict)`:
+    - Method to store the headers of a fingerprint.
+    - Arguments:
+        - `fingerprint` (str): The structural fingerprint of a document.
+        - `headers` (dict): The headers of the tables, mapped by the table names.
+    - Returns: None
+
+    3. `invalidate(self, fingerprint: str)`:
+    - Method to remove the entry of a fingerprint which did not match a document.
+    - Arguments:
+        - `fingerprint` (str): The structural fingerprint of a document.
+    - Returns: None
+
+    Properties
+    ------------------
+        - hits (int): Property to access the number of lookups which found an entry.
+        - misses (int): Property to access the number of lookups which did not find an entry.
+        - invalidations (int): Property to access the number of entries which did not match a document.
+
+    Typical Usage
+    ------------------
+    1. Create an instance of `schema_cache`, optionally with a directory.
+    2. Pass it as the `schema_cache` of every streaming `table_writer` of the documents.
+    3. Check the `hits` and `misses` properties.
+
+    Example:
+    >>> cache = schema_cache(max_size=256, path='./test/result/schemas')
+    >>> for file_name in ['./test/src/day1.json', './test/src/day2.json']:
+    ...     with open(file_name) as source_file:
+    ...         writer = table_writer(source_file, output_path, is_streaming=True, schema_cache=cache)
+    ...         writer.transform()
+    ...         writer.write_to_file()
+    >>> print(cache.hits, cache.misses)
+    """
+    def __init__(self, max_size: int = 128, path: str = None):
+        """
+        Initializes a schema_cache instance.
+
+        Args:
+            max_size (int): The maximum number of entries kept in memory (default is 128).
+            path (str): The directory of the stored entries, which is created if it does not exist, or
+                None to keep the entries in memory only (default is None).
+
+        Returns: None
+
+        Example: None
+        """
+        if max_size < 1:
+            raise ValueError("The maximum size of the schema cache must be at least 1.")
+
+        self.__entries = collections.OrderedDict()
+        self.__max_size = max_size
+        self.__path = path
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+        self.__hits = 0
+        self.__misses = 0
+        self.__invalidations = 0
+
+    def get(self, fingerprint: str) -> dict:
+        """
+        Method to look up the headers of a fingerprint, in memory first and then in the directory.
+
+        Args:
+            fingerprint (str): The structural fingerprint of a document.
+
+        Returns:
+            dict: The headers of the tables, mapped by the table names, or None if there is no entry.
+
+        Example: None
+        """
+        headers = self.__entries.get(fingerprint)
+        if headers is not None:
+            self.__entries.move_to_end(fingerprint)
+        elif self.__path is not None and os.path.exists(self.__file_name(fingerprint)):
+            with open(self.__file_name(fingerprint), 'r', encoding='utf-8') as schema_file:
+                headers = json.load(schema_file)['headers']
+            self.__remember(fingerprint, headers)
+
+        if headers is None:
+            self.__misses += 1
+        else:
+            self.__hits += 1
+        return headers
+
+    def put(self, fingerprint: str, headers: dict):
+        """
+        Method to store the headers of a fingerprint, in memory and in the directory.
+
+        Args:
+            fingerprint (str): The structural fingerprint of a document.
+            headers (dict): The headers of the tables, mapped by the table names.
+
+        Returns: None
+
+        Example: None
+        """
+        self.__remember(fingerprint, headers)
+        if self.__path is not None:
+            # The entry is written to a temporary file first, so another process never reads half of it.
+            file_name = self.__file_name(fingerprint)
+            temp_name = file_name + '.' + str(os.getpid()) + '.tmp'
+            with open(temp_name, 'w', encoding='utf-8') as schema_file:
+                json.dump({'headers': headers}, schema_file, ensure_ascii=False)
+            os.replace(temp_name, file_name)
+
+    def invalidate(self, fingerprint: str):
+        """
+        Method to remove the entry of a fingerprint which did not match a document.
+
+        Args:
+            fingerprint (str): The structural fingerprint of a document.
+
+        Returns: None
+
+        Example: None
+        """
+        self.__entries.pop(fingerprint, None)
+        if self.__path is not None and os.path.exists(self.__file_name(fingerprint)):
+            os.remove(self.__file_name(fingerprint))
+        self.__invalidations += 1
+
+    def __remember(self, fingerprint, headers):
+        self.__entries[fingerprint] = headers
+        self.__entries.move_to_end(fingerprint)
+        if len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def __file_name(self, fingerprint):
+        return os.path.join(self.__path, fingerprint + '.json')
+
+    @property
+    def hits(self) -> int:
+        """
+        Property to access the number of lookups which found an entry.
+
+        Returns:
+            int: The number of hits.
+
+        Example: None
+        """
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Property to access the number of lookups which did not find an entry.
+
+        Returns:
+            int: The number of misses.
+
+        Example: None
+        """
+        return self.__misses
+
+    @property
+    def invalidations(self) -> int:
+        """
+        Property to access the number of entries which were removed because they did not match a document.
+
+        Returns:
+            int: The number of invalidations.
+
+        Example: None
+        """
+        return self.__invalidations
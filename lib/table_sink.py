@@ -0,0 +1,274 @@
+"""
+Module: table_sink
+Package Path: json_to_csv\lib\table_sink.py
+
+This module provides the output sinks which write the formatted tables of table_writer to files.
+
+Classes
+------------------
+    1. `table_sink`: This class is the base class of the output sinks.
+    2. `csv_sink`: This class writes a table to a CSV file.
+    3. `parquet_sink`: This class writes a table to a Parquet file.
+    4. `arrow_sink`: This class writes a table to an Arrow IPC file.
+    5. `row_source`: This class gives the rows of a table to a sink, which can iterate them more than once.
+
+Function
+------------------
+    1. `get_sink`: This function returns the output sink of an output format.
+
+"""
+from abc import ABC, abstractmethod
+from . import csv_file_manager
+import itertools
+
+class table_sink(ABC):
+    """
+    The base class of the output sinks which write the formatted tables to files.
+
+    A sink writes one table to one file, and an empty table to a file without columns. The rows
+    are given as tuples in header order, with the value of `missing` for the fields which a record
+    does not have. The rows can be iterated more than once, and each iteration reads them again
+    from the table, so a sink can make a first pass over them without keeping them in memory.
+
+    Attributes
+    ------------------
+        - extension (str): The file extension of the output files.
+        - missing: The value of the missing fields in the rows given to the sink.
+
+    Methods
+    ------------------
+    1. `write(self, file_name: str, header: list, rows)`:
+    - Method to write a table to a file.
+    - Arguments:
+        - `file_name` (str): The name of the output file without the extension.
+        - `header` (list): The fields of the table in column order, or None if the table is empty.
+        - `rows`: An iterable of the rows of the table as tuples in header order.
+    - Returns: None
+
+    Typical Usage
+    ------------------
+    1. Create a subclass of `table_sink` which sets `extension` and `missing` and implements `write`.
+    2. Pass an instance of the subclass as the `output_format` of `table_writer`.
+
+    Example:
+    >>> class tsv_sink(table_sink):
+    ...     extension = '.tsv'
+    ...     missing = ''
+    ...     def write(self, file_name, header, rows):
+    ...         with open(file_name + self.extension, 'w') as tsv_file:
+    ...             if header is not None:
+    ...                 tsv_file.write('\\t'.join(header) + '\\n')
+    ...                 for row in rows:
+    ...                     tsv_file.write('\\t'.join(str(value) for value in row) + '\\n')
+    >>> writer = table_writer(source_data, output_path, output_format=tsv_sink())
+    """
+    extension = ''
+    missing = None
+
+    @abstractmethod
+    def write(self, file_name: str, header: list, rows):
+        pass
+
+class csv_sink(table_sink):
+    """
+    A class for writing a table to a CSV file with csv_file_manager.
+
+    An empty table is written as an empty file.
+
+    Example:
+    >>> sink = csv_sink()
+    >>> sink.write('./test/result/lion', ['name', 'meal'], [('leo', 6)])
+    """
+    extension = '.csv'
+    missing = ''
+
+    def write(self, file_name: str, header: list, rows):
+        with csv_file_manager.csv_file_manager(file_name + self.extension, 'w') as csv_editor:
+            if header is not None:
+                csv_editor.writerow(header)
+                csv_editor.writerows(rows)
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise ImportError("The Parquet and Arrow output formats require pyarrow. Install it with 'pip install pyarrow'.") from error
+    return pyarrow
+
+class row_source:
+    """
+    A class for giving the rows of a table to a sink, which can iterate them more than once.
+
+    Each iteration calls the function again, so the rows are read again from the table instead of
+    being kept in memory.
+
+    Attributes
+    ------------------
+        - __function: The function which returns an iterator of the rows.
+        - __args (tuple): The arguments of the function.
+
+    Example:
+    >>> rows = row_source(table.iter_rows, None)
+    >>> list(rows) == list(rows)
+    True
+    """
+    __slots__ = ('__function', '__args')
+
+    def __init__(self, function, *args):
+        self.__function = function
+        self.__args = args
+
+    def __iter__(self):
+        return iter(self.__function(*self.__args))
+
+def _batches(rows, batch_size: int):
+    # The rows are taken in batches of `batch_size` rows, which are transposed to columns.
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield list(zip(*batch))
+
+def _column_type(pyarrow, column):
+    # The type of a column in one batch, and whether it can be stored as doubles if another batch
+    # of the column has doubles.
+    try:
+        array = pyarrow.array(column)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, OverflowError):
+        return pyarrow.string(), True
+    if array.type == pyarrow.int64():
+        try:
+            array.cast(pyarrow.float64())
+        except pyarrow.ArrowInvalid:
+            return array.type, False
+    return array.type, True
+
+def _arrow_schema(pyarrow, header: list, rows, batch_size: int):
+    # The first pass over the rows infers the type of each column batch by batch, and the types of
+    # the batches are unified to the type of the column.
+    column_types = [set() for _ in header]
+    exact = [True] * len(header)
+    for columns in _batches(rows, batch_size):
+        for index, column in enumerate(columns):
+            column_type, is_exact = _column_type(pyarrow, column)
+            if column_type != pyarrow.null():
+                column_types[index].add(column_type)
+            exact[index] = exact[index] and is_exact
+
+    fields = []
+    for name, types, is_exact in zip(header, column_types, exact):
+        if len(types) == 0:
+            column_type = pyarrow.null()
+        elif len(types) == 1:
+            column_type = types.pop()
+        elif types == {pyarrow.int64(), pyarrow.float64()} and is_exact:
+            column_type = pyarrow.float64()
+        else:
+            # A column which mixes types, such as numbers and strings, or which has integers beyond
+            # 64 bits, is stored as strings.
+            column_type = pyarrow.string()
+        fields.append(pyarrow.field(name, column_type))
+    return pyarrow.schema(fields)
+
+def _record_batches(pyarrow, schema, rows, batch_size: int):
+    # The second pass over the rows builds a record batch of the schema for each batch of rows.
+    for columns in _batches(rows, batch_size):
+        arrays = []
+        for field, column in zip(schema, columns):
+            if field.type == pyarrow.string():
+                column = [value if value is None else str(value) for value in column]
+            arrays.append(pyarrow.array(column, field.type))
+        yield pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+class parquet_sink(table_sink):
+    """
+    A class for writing a table to a Parquet file with pyarrow.
+
+    The rows are read twice: the first pass infers the type of each column from its values, and
+    the second pass writes the rows in row groups of at most `row_group_size` rows, so only one
+    row group is kept in memory. A column with mixed types is stored as strings, and the missing
+    fields are stored as nulls. pyarrow is imported when the first table is written.
+
+    Attributes
+    ------------------
+        - row_group_size (int): The maximum number of rows in a row group of the Parquet file.
+
+    Example:
+    >>> sink = parquet_sink(row_group_size=65536)
+    >>> sink.write('./test/result/lion', ['name', 'meal'], [('leo', 6), ('noah', None)])
+    """
+    extension = '.parquet'
+    missing = None
+
+    def __init__(self, row_group_size: int = 65536):
+        self.row_group_size = row_group_size
+
+    def write(self, file_name: str, header: list, rows):
+        pyarrow = _import_pyarrow()
+        import pyarrow.parquet
+        if header is None:
+            header, rows = [], ()
+        schema = _arrow_schema(pyarrow, header, rows, self.row_group_size)
+        with pyarrow.parquet.ParquetWriter(file_name + self.extension, schema) as parquet_writer:
+            for record_batch in _record_batches(pyarrow, schema, rows, self.row_group_size):
+                parquet_writer.write_batch(record_batch, row_group_size=self.row_group_size)
+
+class arrow_sink(table_sink):
+    """
+    A class for writing a table to an Arrow IPC file with pyarrow.
+
+    The types are inferred as in `parquet_sink`, and the table is written in record batches of at
+    most `batch_size` rows, so only one record batch is kept in memory. pyarrow is imported when
+    the first table is written.
+
+    Attributes
+    ------------------
+        - batch_size (int): The maximum number of rows in a record batch of the Arrow IPC file.
+
+    Example:
+    >>> sink = arrow_sink(batch_size=65536)
+    >>> sink.write('./test/result/lion', ['name', 'meal'], [('leo', 6), ('noah', None)])
+    """
+    extension = '.arrow'
+    missing = None
+
+    def __init__(self, batch_size: int = 65536):
+        self.batch_size = batch_size
+
+    def write(self, file_name: str, header: list, rows):
+        pyarrow = _import_pyarrow()
+        import pyarrow.ipc
+        if header is None:
+            header, rows = [], ()
+        schema = _arrow_schema(pyarrow, header, rows, self.batch_size)
+        with pyarrow.OSFile(file_name + self.extension, 'wb') as arrow_file:
+            with pyarrow.ipc.new_file(arrow_file, schema) as arrow_writer:
+                for record_batch in _record_batches(pyarrow, schema, rows, self.batch_size):
+                    arrow_writer.write_batch(record_batch)
+
+SINKS = {
+    'csv': csv_sink,
+    'parquet': parquet_sink,
+    'arrow': arrow_sink,
+}
+
+def get_sink(output_format) -> table_sink:
+    """
+    Returns the output sink of an output format.
+
+    Args:
+        output_format (str or table_sink): The name of the output format, 'csv', 'parquet' or 'arrow',
+            or an instance of a `table_sink` subclass, which is returned as it is.
+
+    Returns:
+        table_sink: The output sink.
+
+    Example:
+    >>> sink = get_sink('parquet')
+    """
+    if isinstance(output_format, table_sink):
+        return output_format
+    if output_format not in SINKS:
+        raise ValueError("The output format must be one of " + ", ".join(SINKS) + " or a table_sink instance.")
+    return SINKS[output_format]()
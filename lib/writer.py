@@ -10,7 +10,51 @@ Classes
     2. `flat_writer`: This class writes transformed data to a single CSV file.
 
 """
-from . import json_formatter, csv_file_manager, csv_transformer
+from . import json_formatter, json_streamer, json_table, csv_file_manager, csv_transformer, dataframe_backend, table_sink
+from . import id_generator, json_lines, json_array, metrics as pipeline_metrics, schema_cache as schema_caches
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import itertools
+import json
+import operator
+import os
+import tempfile
+import time
+
+# The names of the modes of table_writer in the error messages.
+_MODE_NAMES = {
+    'manual': "the manual mode",
+    'streaming': "the streaming mode",
+    'pandas': "the pandas backend",
+    'output_format': "an output format other than 'csv'",
+    'content_ids': "a content-based ID strategy",
+    'dedup': "the dedup mode",
+    'incremental': "the incremental mode",
+    'schema_cache': "the schema cache",
+    'json_lines': "the JSON Lines mode",
+    'processes': "several processes",
+}
+
+# The modes which cannot be combined with each mode.
+_MODE_CONFLICTS = {
+    'streaming': ('pandas', 'output_format', 'content_ids', 'dedup'),
+    'pandas': ('output_format',),
+    'incremental': ('manual', 'streaming', 'pandas', 'output_format'),
+    'json_lines': ('manual', 'streaming', 'pandas', 'incremental'),
+    'processes': ('manual', 'streaming', 'pandas', 'output_format', 'dedup', 'incremental'),
+}
+
+def _check_modes(modes: dict):
+    # The modes are checked pair by pair against _MODE_CONFLICTS, and the schema cache, which is filled
+    # by the discovery pass, also needs the streaming mode.
+    for mode, conflicts in _MODE_CONFLICTS.items():
+        if modes[mode]:
+            for conflict in conflicts:
+                if modes[conflict]:
+                    message = _MODE_NAMES[mode] + " cannot be combined with " + _MODE_NAMES[conflict] + "."
+                    raise ValueError(message[0].upper() + message[1:])
+    if modes['schema_cache'] and not modes['streaming']:
+        raise ValueError("The schema cache is only available in the streaming mode.")
 
 class table_writer(csv_transformer.csv_transformer):
     """
@@ -22,7 +66,39 @@ class table_writer(csv_transformer.csv_transformer):
     Attributes
     ------------------
         - __has_random_id (bool): Flag to indicate whether to use random IDs for records.
-        - __formatted_data (dict): A dictionary to store the formatted data.
+        - __id_generator (id_generator.id_generator): The ID strategy of the random IDs.
+        - __id_prefix (str): A prefix added to the generated sequential IDs.
+        - __dedup (bool): Flag to indicate whether the sub-records with the same content are stored once.
+        - __dedup_size (int): The maximum number of sub-records in the dedup index.
+        - __formatted_data (dict): A dictionary to store the formatted data, as `json_table.json_table` instances
+          after `transform` or as lists of records in the manual mode.
+        - __is_streaming (bool): Flag to indicate whether to parse and write the source incrementally.
+        - __stream_source: The file-like object or JSON string read by the streaming mode.
+        - __stream_formatter (json_streamer.json_stream_formatter): The formatter used by the streaming mode.
+        - __backend (str): The backend which writes the CSV files, 'csv' or 'pandas'.
+        - __sink (table_sink.table_sink): The output sink which writes each table to a file.
+        - __max_open_files (int): The maximum number of CSV files which are open at the same time in the streaming mode.
+        - __max_workers (int): The maximum number of threads which write the tables at the same time.
+        - __table_timings (dict): The seconds spent writing each table in the last `write_to_file` call.
+        - __state_file (str): The state file of the incremental mode, or None to rewrite the tables.
+        - __table_states (dict): The states of the tables written before, loaded from the state file.
+        - __item_count (int): The number of the items of the top-level arrays written before, which
+          continues the indexes of the tables of the nested arrays in the incremental mode.
+        - __pending_states (dict): The states of the tables after the transformation, which are saved
+          to the state file when the tables are written.
+        - __schema_cache (schema_cache.schema_cache): The cache of the headers of the streaming mode, or None.
+        - __schema_fingerprint (str): The structural fingerprint of the streamed source.
+        - __is_schema_cached (bool): Flag to indicate whether the headers were taken from the schema cache
+          and have to be checked in the writing pass.
+        - __validate (bool): Flag to indicate whether the formatted data of the manual mode is validated.
+        - __is_json_lines (bool): Flag to indicate whether the source is read as JSON Lines, one root record per line.
+        - __max_processes (int): The maximum number of worker processes which convert the chunks of a JSON Lines file
+          or of a top-level array.
+        - __row_spool (json_lines.row_spool): The records of the JSON Lines mode, kept in a temporary file until they are written.
+        - __stream_start (int): The position where the stream source of the streaming or the JSON Lines mode was first read,
+          or None if it is a string or has not been read.
+        - __is_stream_read (bool): Flag to indicate whether the stream source has been read by a transformation.
+        - __metrics (metrics.pipeline_metrics): The metrics of the stages and the tables, or None to disable them.
 
     Methods
     ------------------
@@ -34,6 +110,18 @@ class table_writer(csv_transformer.csv_transformer):
     - Method to write the transformed data to separate CSV files for each table.
     - Returns: None
 
+    3. `to_dataframes(self, missing=None, dtype=None) -> dict`: 
+    - Method to build the transformed tables as pandas DataFrames.
+    - Arguments:
+        - `missing`: The value of the missing fields.
+        - `dtype`: The data type of the columns, or None to let pandas infer it.
+    - Returns:
+        - dict: The DataFrames of the tables, mapped by the table names.
+
+    Properties
+    ------------------
+        - table_timings (dict): Property to access the seconds spent writing each table in the last `write_to_file` call.
+
     Typical Usage
     ------------------
     1. Create an instance of `table_writer` with source JSON data and csv data path.
@@ -55,8 +143,22 @@ class table_writer(csv_transformer.csv_transformer):
     >>> writer = table_writer(source_data, output_path, has_random_id=True)
     >>> writer.transform()
     >>> writer.write_to_file()
+
+    For a large JSON file, the streaming mode parses the file incrementally and writes each record
+    as soon as it is completed, so the whole document is never loaded into memory.
+
+    >>> with open('./test/src/data.json') as source_file:
+    ...     writer = table_writer(source_file, output_path, is_streaming=True)
+    ...     writer.transform()
+    ...     writer.write_to_file()
+
+    With pandas installed, the tables can be built as DataFrames without writing CSV files.
+
+    >>> writer = table_writer(source_data, output_path)
+    >>> writer.transform()
+    >>> frames = writer.to_dataframes()
     """
-    def __init__(self, source_data: dict, output_path:str, is_manual: bool = False, has_random_id: bool = False):
+    def __init__(self, source_data: dict, output_path:str, is_manual: bool = False, has_random_id: bool = False, is_streaming: bool = False, copy: bool = True, id_prefix: str = '', backend: str = 'csv', output_format = 'csv', max_open_files: int = 64, max_workers: int = 1, id_strategy = None, dedup: bool = False, dedup_size: int = 65536, state_file: str = None, schema_cache = None, validate: bool = True, is_json_lines: bool = False, max_processes: int = 1, metrics = None):
         """
         Initializes a table_writer instance with source JSON data and configuration options.
 
@@ -64,19 +166,154 @@ class table_writer(csv_transformer.csv_transformer):
             source_data (dict): The source JSON data to transform and write.
             output_path (str): The output path for the CSV files.
             has_random_id (bool): Flag to indicate whether to use random IDs for records.
+            is_streaming (bool): Flag to indicate whether to parse and write the source incrementally.
+                The source data must be a file-like object or a JSON string in the streaming mode.
+            copy (bool): Flag to indicate whether a dict, list or tuple source is deep-copied before the
+                transformation. If it is False, the source is validated and used without a copy.
+            id_prefix (str): A prefix added to the generated sequential IDs, which keeps the IDs of several
+                source files apart when their tables are merged (default is '').
+            backend (str): The backend which writes the CSV files (default is 'csv'). The 'pandas' backend
+                builds each table as a DataFrame of Python objects and writes it with pandas, which gives
+                the same files as the 'csv' backend but more slowly, see `dataframe_backend`. It requires
+                pandas and is not available in the streaming mode.
+            output_format (str or table_sink.table_sink): The format of the output files, 'csv' (default),
+                'parquet' or 'arrow', or an instance of a `table_sink.table_sink` subclass. The Parquet and
+                Arrow formats infer the column types, require pyarrow and are not available in the
+                streaming mode.
+            max_open_files (int): The maximum number of CSV files which are open at the same time in the
+                streaming mode, which writes the rows of all tables in batches (default is 64).
+            max_workers (int): The maximum number of threads which write the tables at the same time
+                (default is 1, which writes the tables one after another). It is not used in the
+                streaming mode, which writes all tables in one pass.
+            id_strategy (str or id_generator.id_generator): The ID strategy of the records (default is None,
+                which uses the sequential IDs, or UUID4 strings if `has_random_id` is True). It can be
+                'sequence', 'uuid', 'random' (seeded 128-bit IDs, see `id_generator.random_id_generator`),
+                'content' (IDs hashed from the content and the position of the values), 'snowflake'
+                (time-ordered 64-bit IDs), or an instance of an `id_generator.id_generator` subclass. The
+                'content' strategy is not available in the streaming mode.
+            dedup (bool): Flag to indicate whether an object or an array with the same content as a stored
+                sub-record of the same table reuses its ID instead of being written again (default is False).
+                It is not available in the streaming mode.
+            dedup_size (int): The maximum number of sub-records in the dedup index, which evicts the least
+                recently used sub-records first (default is 65536).
+            state_file (str): The state file of the incremental mode (default is None). If it is given, the
+                row counts, the fields and the headers of the tables are loaded from it before the
+                transformation, the new records are appended to the existing CSV files with the IDs
+                continuing after the rows written before, and the state is saved after the writing.
+                The items of a top-level array continue the indexes of the items written before, so
+                the tables of the nested arrays are the same as the tables of one array.
+                When a table gets new fields, they are added at the end of its header, and the rows
+                written before are copied with empty values for them. It requires the 'csv' backend and
+                output format, and is not available in the manual or the streaming mode.
+            schema_cache (schema_cache.schema_cache): The cache of the headers of the streaming mode (default
+                is None). The headers of a source are looked up by the structural fingerprint of its start,
+                and on a hit the discovery pass is skipped. The writing pass collects the headers again,
+                and if they differ from the cached headers, the entry is invalidated and the tables are
+                discovered and written again, so the files are always the same as without the cache. It is
+                only available in the streaming mode, because the other modes register the fields in the
+                transformation itself.
+            validate (bool): Flag to indicate whether the formatted data of the manual mode is validated when
+                it is set (default is True). The data of a trusted producer can skip the validation.
+            is_json_lines (bool): Flag to indicate whether the source is JSON Lines, a file-like object or a
+                string with one JSON value on each line (default is False). Every line is transformed as
+                one root record, like an item of a top-level array, so the tables, the fields and the IDs
+                are shared by all lines, and the files are the same as the files of the array of the
+                lines. The lines are transformed in batches, and the records of each batch are moved to a
+                temporary file, so the memory only holds one batch and the table schemas. A later
+                transformation reads the source again from where the first one started, so a source file
+                which is not seekable can only be transformed once. It is not available with the manual
+                mode, the streaming mode, the pandas backend or the state file.
+            max_processes (int): The maximum number of worker processes which convert the source (default is
+                1, which converts it in this process). With more processes, a JSON Lines file is split into
+                chunks of lines, and any other file must hold a top-level array, which is split into chunks
+                of items by scanning its bytes, see `json_array.split_json_array`. The chunks are converted
+                in parallel with the ID offsets of the previous chunks, and joined in their order, so the
+                files are the same as with one process. The random IDs of each chunk are generated by the
+                generator of `id_generator.id_generator.for_worker` with the index of the chunk, so the
+                number of chunks is limited to the worker IDs of the generator, 1024 for snowflake IDs. It
+                requires a source file opened from a path and the 'csv' backend and output format, and is
+                not available in the manual or the streaming mode, or with the dedup or the incremental mode.
+            metrics (metrics.pipeline_metrics): The metrics which measure the stages of the conversion, and
+                the rows and the bytes written for each table (default is None, which disables them).
 
         Returns: None
 
         Example: None
         """
+        if backend not in ('csv', 'pandas'):
+            raise ValueError("The backend must be 'csv' or 'pandas'.")
+        if max_processes < 1:
+            raise ValueError("The maximum number of processes must be at least 1.")
+        if max_workers < 1:
+            raise ValueError("The maximum number of workers must be at least 1.")
+        self.__sink = table_sink.get_sink(output_format)
+        self.__id_generator = id_generator.get_id_generator(id_strategy) if id_strategy is not None else None
+        if id_strategy is not None:
+            has_random_id = self.__id_generator is not None
+        _check_modes({
+            'manual': is_manual,
+            'streaming': is_streaming and not is_manual,
+            'pandas': backend == 'pandas',
+            'output_format': type(self.__sink) is not table_sink.csv_sink,
+            'content_ids': self.__id_generator is not None and self.__id_generator.is_content_based,
+            'dedup': dedup,
+            'incremental': state_file is not None,
+            'schema_cache': schema_cache is not None,
+            'json_lines': is_json_lines,
+            'processes': max_processes > 1,
+        })
+
+        self.__dedup = dedup
+        self.__dedup_size = dedup_size
+        self.__state_file = state_file
+        self.__schema_cache = schema_cache
+        self.__is_json_lines = is_json_lines
+        self.__max_processes = max_processes
+        self.__row_spool = None
+        self.__stream_start = None
+        self.__is_stream_read = False
+        self.__schema_fingerprint = None
+        self.__is_schema_cached = False
+        self.__table_states = {}
+        self.__item_count = 0
+        self.__pending_states = None
+
+        self.__backend = backend
+        self.__max_open_files = max_open_files
+        self.__max_workers = max_workers
+        self.__table_timings = {}
+        self.__metrics = metrics
+        self.__validate = validate
         self.__is_manual = is_manual
+        self.__is_streaming = is_streaming and not is_manual
+        self.__stream_formatter = None
         if self.__is_manual:
             super().__init__(None, output_path)
             self.manual_data = source_data
+        elif self.__is_streaming:
+            if not isinstance(source_data, str) and not hasattr(source_data, 'read'):
+                raise TypeError("The source data must be a file-like object or a JSON string in the streaming mode.")
+            super().__init__(None, output_path)
+            self.source_data = None
+            self.__stream_source = source_data
+            self.__formatted_data = {}
+        elif self.__is_json_lines or max_processes > 1:
+            if not isinstance(source_data, str) and not hasattr(source_data, 'read'):
+                raise TypeError("The source data must be a file-like object or a string in the JSON Lines mode.")
+            if max_processes > 1 and not isinstance(getattr(source_data, 'name', None), str):
+                raise TypeError("The source data must be a file opened from a path to use several processes.")
+            if max_processes > 1 and not is_json_lines and not json_array.is_json_array(source_data.name):
+                raise ValueError("Several processes require a JSON Lines source or a top-level array.")
+            super().__init__(None, output_path)
+            self.source_data = None
+            self.__stream_source = source_data
+            self.__formatted_data = {}
         else:
-            super().__init__(source_data, output_path)
+            with pipeline_metrics.measure(metrics, 'parse'):
+                super().__init__(source_data, output_path, copy)
             self.__formatted_data = {}
         self.__has_random_id = has_random_id
+        self.__id_prefix = id_prefix
 
     def transform(self):
         """
@@ -107,9 +344,34 @@ class table_writer(csv_transformer.csv_transformer):
         if self.__is_manual == True:
             return
 
-        formatter = json_formatter.json_formatter(self.source_data,self.__has_random_id)
-        formatter.json_to_object_list(self.source_data)
-        self.__formatted_data = formatter.store
+        if self.__is_streaming == True:
+            with pipeline_metrics.measure(self.__metrics, 'discover'):
+                self.__discover_stream()
+            return
+        if self.__max_processes > 1:
+            # The chunks are converted straight to the files, so there is nothing to keep in memory.
+            return
+        with pipeline_metrics.measure(self.__metrics, 'transform'):
+            if self.__is_json_lines == True:
+                self.__transform_lines()
+            else:
+                self.__transform_source()
+
+    def __transform_source(self):
+        formatter = json_formatter.json_formatter(None,self.__has_random_id,self.__id_prefix,self.__id_generator,self.__dedup,self.__dedup_size)
+        if self.__state_file is not None:
+            self.__table_states, self.__item_count = self.__load_state()
+            formatter.restore_tables(self.__table_states)
+        if self.__state_file is not None and type(self.source_data) is list:
+            # The items continue the indexes of the items written before, like the items of one array.
+            for index, item in enumerate(self.source_data, self.__item_count):
+                formatter.json_item_to_object_list(item, index)
+            self.__item_count += len(self.source_data)
+        else:
+            formatter.json_to_object_list(self.source_data)
+        self.__formatted_data = formatter.tables
+        if self.__state_file is not None:
+            self.__pending_states = formatter.table_states
 
     def write_to_file(self):
         """
@@ -130,22 +392,347 @@ class table_writer(csv_transformer.csv_transformer):
         >>> # The data is transformed and prepared for writing.
         >>> writer.write_to_file()
         >>> # The data is written to a single CSV file.
+        >>> # Write the tables from 8 threads and check the time spent on each table.
+        >>> writer = table_writer(source_data, output_path, max_workers=8)
+        >>> writer.transform()
+        >>> writer.write_to_file()
+        >>> print(writer.table_timings)
         """
-        for key,value in self.__formatted_data.items():
-            with csv_file_manager.csv_file_manager(self.output_path + "/" +key + '.csv', 'w') as csv_editor:
-                if len(value)>0:
-                    keys = value[0].keys()
-                    csv_editor.writerow(keys)
-                    for item in value:
-                        reproduce_obj = {}
-                        if item is not None and type(item) is dict:
-                            for key_item in keys:
-                                for record_key,record_value in item.items():
-                                    if record_key == key_item:
-                                        reproduce_obj[record_key] = record_value
-                                        break
-                            csv_editor.writerow(reproduce_obj.values())
+        with pipeline_metrics.measure(self.__metrics, 'write'):
+            if self.__is_streaming == True:
+                self.__write_stream()
+            elif self.__max_processes > 1:
+                self.__write_chunks()
+            elif self.__is_json_lines == True:
+                self.__write_lines()
+            else:
+                self.__write_tables()
+
+    def __write_tables(self):
+        if self.__state_file is not None and self.__pending_states is None:
+            # The new records are appended once, so a second call does not write them again.
+            return
+
+        tables = list(self.__formatted_data.items())
+        if self.__max_workers > 1 and len(tables) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.__max_workers, len(tables))) as executor:
+                timings = list(executor.map(lambda table: self.__write_table(*table), tables))
+        else:
+            timings = [self.__write_table(key, value) for key,value in tables]
+        self.__table_timings = {key: timing for (key, _), timing in zip(tables, timings)}
+        if self.__metrics is not None:
+            extension = self.__sink.extension if self.__backend == 'csv' and self.__state_file is None else '.csv'
+            for key,value in tables:
+                self.__metrics.record_table(key, len(value), self.output_path + "/" + key + extension)
+        if self.__state_file is not None:
+            self.__save_state(self.__pending_states, self.__item_count)
+            self.__table_states = self.__pending_states
+            self.__pending_states = None
+
+    def __write_table(self, key, value):
+        start = time.perf_counter()
+        file_name = self.output_path + "/" +key
+        if self.__backend == 'pandas':
+            frame = self.__to_dataframe(value, '', object)
+            if len(frame)>0:
+                dataframe_backend.write_csv(frame, file_name + '.csv')
+            else:
+                open(file_name + '.csv', 'w').close()
+            return time.perf_counter() - start
+        if self.__state_file is not None:
+            self.__append_table(file_name + '.csv', value)
+            return time.perf_counter() - start
+
+        sink = self.__sink
+        if type(value) is json_table.json_table:
+            if len(value)>0:
+                sink.write(file_name, value.header, table_sink.row_source(value.iter_rows, sink.missing))
+            else:
+                sink.write(file_name, None, ())
+        elif len(value)>0:
+            keys = list(value[0].keys())
+            sink.write(file_name, keys, table_sink.row_source(self.__table_rows, value, keys))
+        else:
+            sink.write(file_name, None, ())
+        return time.perf_counter() - start
+
+    def __append_table(self, file_name, table):
+        if len(table) == 0:
+            # A table without new records keeps its file as it is.
+            return
+
+        header = table.header
+        state = self.__table_states.get(table.name)
+        if state is None or not os.path.exists(file_name):
+            with csv_file_manager.csv_file_manager(file_name, 'w') as csv_editor:
+                csv_editor.writerow(header)
+                csv_editor.writerows(table.iter_rows())
+            return
+
+        if header != state['header']:
+            self.__extend_header(file_name, header, len(header) - len(state['header']))
+        with csv_file_manager.csv_file_manager(file_name, 'a') as csv_editor:
+            csv_editor.writerows(table.iter_rows())
+
+    def __extend_header(self, file_name, header, new_field_count):
+        # The new fields follow the fields written before, so the rows written before are copied to
+        # a temporary file with empty values at the end, and the temporary file replaces the CSV file.
+        descriptor, temp_name = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(file_name)))
+        os.close(descriptor)
+        padding = [''] * new_field_count
+        try:
+            with open(file_name, 'r', encoding='utf-8', newline='') as csv_file:
+                rows = csv.reader(csv_file)
+                next(rows, None)
+                with csv_file_manager.csv_file_manager(temp_name, 'w') as csv_editor:
+                    csv_editor.writerow(header)
+                    csv_editor.writerows(row + padding for row in rows)
+            os.replace(temp_name, file_name)
+        except BaseException:
+            os.remove(temp_name)
+            raise
+
+    def __load_state(self):
+        if not os.path.exists(self.__state_file):
+            return {}, 0
+        with open(self.__state_file, 'r', encoding='utf-8') as state_file:
+            state = json.load(state_file)
+        return state['tables'], state.get('items', 0)
+
+    def __save_state(self, table_states, item_count):
+        # The state is written to a temporary file first, so an interrupted run keeps the last state.
+        temp_name = self.__state_file + '.tmp'
+        with open(temp_name, 'w', encoding='utf-8') as state_file:
+            json.dump({'version': 1, 'tables': table_states, 'items': item_count}, state_file, ensure_ascii=False)
+        os.replace(temp_name, self.__state_file)
+
+    @property
+    def table_timings(self) -> dict:
+        """
+        Property to access the seconds spent writing each table in the last `write_to_file` call.
+
+        Returns:
+            dict: The seconds spent writing each table, mapped by the table names. It is empty in the
+                streaming mode, which writes all tables in one pass.
+
+        Example: None
+        """
+        return self.__table_timings
+
+    @property
+    def metrics(self):
+        """
+        Property to access the metrics of the stages and the tables.
+
+        Returns:
+            metrics.pipeline_metrics: The metrics given to the writer, or None if they are disabled.
+
+        Example:
+        >>> writer = table_writer(source_data, output_path, metrics=pipeline_metrics())
+        >>> writer.transform()
+        >>> writer.write_to_file()
+        >>> print(writer.metrics.report())
+        """
+        return self.__metrics
+
+    def to_dataframes(self, missing=None, dtype=None) -> dict:
+        """
+        Method to build the transformed tables as pandas DataFrames, one column array for each field.
+
+        pandas is imported when the method is called. The DataFrames are built from the formatted
+        tables directly, without a CSV round trip.
+
+        Args:
+            missing: The value of the missing fields (default is None).
+            dtype: The data type of the columns, or None to let pandas infer it (default is None).
+
+        Returns:
+            dict: The DataFrames of the tables, mapped by the table names.
+
+        Example:
+        >>> source_data = {"lion": [{"years old": 12, "name": "leo"}, {"meal": 6, "name": "noah"}]}
+        >>> writer = table_writer(source_data, './test/result/table_data')
+        >>> writer.transform()
+        >>> frames = writer.to_dataframes()
+        >>> print(frames['lion'].columns.tolist())
+        ['parent_id', 'lion_id', 'years old', 'name', 'meal']
+        """
+        if self.__is_streaming == True or self.__is_json_lines == True or self.__max_processes > 1:
+            raise TypeError("The tables are not kept in memory in the streaming, the JSON Lines or the multi-process mode.")
+
+        return {key: self.__to_dataframe(value, missing, dtype) for key,value in self.__formatted_data.items()}
+
+    def __to_dataframe(self, value, missing, dtype):
+        if type(value) is json_table.json_table:
+            return dataframe_backend.table_to_dataframe(value, missing, dtype)
+        return dataframe_backend.records_to_dataframe(value, list(value[0].keys()) if len(value)>0 else [], dtype)
+
+    def __table_rows(self, records, keys):
+        # The column order is compiled once per table. A record which misses some of the columns
+        # keeps the values it has in the column order, like the previous per-key search did.
+        if len(keys) == 0:
+            getter = lambda item: ()
+        elif len(keys) == 1:
+            single_getter = operator.itemgetter(keys[0])
+            getter = lambda item: (single_getter(item),)
+        else:
+            getter = operator.itemgetter(*keys)
+
+        for item in records:
+            if type(item) is dict:
+                try:
+                    yield getter(item)
+                except KeyError:
+                    yield [item[key_item] for key_item in keys if key_item in item]
         
+    def __discover_stream(self):
+        source = self.__stream_source
+        if self.__stream_start is not None:
+            # A later transformation reads the source again from its start.
+            self.__rewind_stream()
+        elif not isinstance(source, str):
+            if hasattr(source, 'seekable') and source.seekable():
+                self.__stream_start = source.tell()
+            else:
+                source = self.__spool_stream(source)
+                self.__stream_source = source
+                self.__stream_start = 0
+
+        self.__stream_formatter = json_streamer.json_stream_formatter(self.__has_random_id, self.__id_prefix, self.__id_generator)
+        self.__is_schema_cached = False
+        if self.__schema_cache is not None:
+            self.__schema_fingerprint = schema_caches.structural_fingerprint(json_streamer.json_event_parser(source))
+            self.__rewind_stream()
+            headers = self.__schema_cache.get(self.__schema_fingerprint)
+            if headers is not None:
+                self.__stream_formatter.headers = headers
+                self.__is_schema_cached = True
+                return
+
+        self.__stream_formatter.discover(json_streamer.json_event_parser(source))
+        if self.__schema_cache is not None:
+            self.__schema_cache.put(self.__schema_fingerprint, self.__stream_formatter.headers)
+
+    def __transform_lines(self):
+        source = self.__stream_source
+        if self.__stream_start is not None:
+            # A later transformation reads the source again from its start.
+            self.__rewind_stream()
+        elif not isinstance(source, str):
+            if hasattr(source, 'seekable') and source.seekable():
+                self.__stream_start = source.tell()
+            elif self.__is_stream_read:
+                raise ValueError("The JSON Lines source was read by the previous transformation and cannot be read again, because it is not seekable.")
+        self.__is_stream_read = True
+
+        self.__close_row_spool()
+        formatter = json_formatter.json_formatter(None,self.__has_random_id,self.__id_prefix,self.__id_generator,self.__dedup,self.__dedup_size)
+        self.__row_spool = json_lines.row_spool()
+        json_lines.convert_json_lines(json_lines.iter_json_lines(self.__stream_source), formatter, self.__row_spool.write)
+        self.__formatted_data = formatter.tables
+
+    def __write_chunks(self):
+        if self.__is_json_lines == True:
+            table_states = json_lines.write_json_lines(self.__stream_source.name, self.output_path, self.__max_processes, self.__has_random_id,
+                                                       self.__id_prefix, self.__id_generator, max_open_files=self.__max_open_files)
+        else:
+            table_states = json_array.write_json_array(self.__stream_source.name, self.output_path, self.__max_processes, self.__has_random_id,
+                                                       self.__id_prefix, self.__id_generator, max_open_files=self.__max_open_files)
+        if self.__metrics is not None:
+            for key,state in table_states.items():
+                self.__metrics.record_table(key, state['row_count'], self.output_path + "/" + key + '.csv')
+
+    def __write_lines(self):
+        if self.__row_spool is None:
+            self.__transform_lines()
+
+        sink = self.__sink
+        timings = {}
+        try:
+            for key,value in self.__formatted_data.items():
+                start = time.perf_counter()
+                rows = table_sink.row_source(value.iter_rows, sink.missing, table_sink.row_source(self.__row_spool.read, key))
+                sink.write(self.output_path + "/" + key, value.header, rows)
+                timings[key] = time.perf_counter() - start
+                if self.__metrics is not None:
+                    self.__metrics.record_table(key, value.row_count, self.output_path + "/" + key + sink.extension)
+        finally:
+            # The records are written once, so a later call transforms the source again.
+            self.__close_row_spool()
+        self.__table_timings = timings
+
+    def __close_row_spool(self):
+        if self.__row_spool is not None:
+            self.__row_spool.close()
+            self.__row_spool = None
+
+    def __rewind_stream(self):
+        if not isinstance(self.__stream_source, str):
+            self.__stream_source.seek(self.__stream_start)
+
+    def __spool_stream(self, source):
+        spool = tempfile.TemporaryFile('w+', encoding='utf-8', newline='')
+        while True:
+            chunk = source.read(65536)
+            if not chunk:
+                break
+            spool.write(chunk)
+        spool.seek(0)
+        return spool
+
+    def __write_stream(self):
+        if self.__stream_formatter is None:
+            self.__discover_stream()
+
+        if self.__is_schema_cached:
+            cached_headers = self.__stream_formatter.headers
+            self.__write_stream_pass(True)
+            if self.__stream_formatter.headers == cached_headers:
+                return
+
+            # The source does not have the shape of the cached headers, so it is discovered and written again.
+            self.__schema_cache.invalidate(self.__schema_fingerprint)
+            self.__rewind_stream()
+            self.__stream_formatter.discover(json_streamer.json_event_parser(self.__stream_source))
+            self.__schema_cache.put(self.__schema_fingerprint, self.__stream_formatter.headers)
+            self.__is_schema_cached = False
+            for key in cached_headers:
+                if key not in self.__stream_formatter.headers:
+                    os.remove(self.output_path + "/" + key + '.csv')
+
+        self.__write_stream_pass(False)
+
+    def __write_stream_pass(self, collect_headers):
+        self.__rewind_stream()
+        with csv_file_manager.csv_batch_sink(self.__max_open_files) as sink:
+            files = {}
+            for key,header in self.__stream_formatter.headers.items():
+                file_name = self.output_path + "/" + key + '.csv'
+                sink.writerow(file_name, header)
+                files[key] = (file_name, header)
+
+            def write_record(table_name, record):
+                table_file = files.get(table_name)
+                if table_file is None:
+                    # A table which is not in the cached headers, found by the header check of the pass.
+                    return
+                file_name, header = table_file
+                sink.writerow(file_name, [record.get(key, '') for key in header])
+
+            on_record = write_record
+            if self.__metrics is not None:
+                # The records are only counted when the metrics are enabled.
+                row_counts = dict.fromkeys(files, 0)
+                def on_record(table_name, record):
+                    if table_name in row_counts:
+                        row_counts[table_name] += 1
+                    write_record(table_name, record)
+
+            self.__stream_formatter.stream_to_object_list(json_streamer.json_event_parser(self.__stream_source), on_record, collect_headers)
+        if self.__metrics is not None:
+            for key,file_name_and_header in files.items():
+                self.__metrics.record_table(key, row_counts[key], file_name_and_header[0])
+
     @property
     def manual_data(self):
         if self.__is_manual == True:
@@ -156,7 +743,11 @@ class table_writer(csv_transformer.csv_transformer):
 
         if self.__is_manual == True:
             self.source_data = value
-            self.__formatted_data = self.__check_formatted_data(self.source_data)
+            if self.__validate:
+                with pipeline_metrics.measure(self.__metrics, 'validate'):
+                    self.__formatted_data = self.__check_formatted_data(self.source_data)
+            else:
+                self.__formatted_data = self.source_data
 
     @property
     def is_manual(self):
@@ -167,6 +758,8 @@ class table_writer(csv_transformer.csv_transformer):
         self.__is_manual = value
 
     def __check_formatted_data(self, formatted_data:dict):
+        # The keys of every record are compared with the keys of the first record of its table, so the
+        # check is linear in the size of the data and stops at the first invalid record.
         if type(formatted_data) is not dict:
             raise TypeError("The formatted data must be a dictionary.")
         
@@ -174,48 +767,52 @@ class table_writer(csv_transformer.csv_transformer):
             if type(value) is not list:
                 raise TypeError("The value of the formatted data must be a list.")
             
-            key_list = []
-            for item in value:
+            key_signature = None
+            for index,item in enumerate(value):
                 if type(item) is not dict:
-                    raise TypeError("The item of the formatted data must be a dictionary.")
+                    raise TypeError("The item of the formatted data must be a dictionary. The row " + str(index) + " of the table '" + str(key) + "' is not.")
 
-                key_list.append(list(item.keys()))
+                if key_signature is None:
+                    key_signature = frozenset(item)
+                elif item.keys() != key_signature:
+                    raise TypeError("The key of the formatted data must be the same. The row " + str(index) + " of the table '" + str(key) + "' has different keys.")
 
                 for key_item,value_item in item.items():
                     if type(value_item) is dict:
-                        raise TypeError("The value of the formatted data must be the specified primitive type.")
+                        raise TypeError("The value of the formatted data must be the specified primitive type. The field '" + str(key_item) + "' of the row " + str(index) + " of the table '" + str(key) + "' is not.")
                     elif type(value_item) is list:
                         if self.__check_formatted_value_list(value_item) == False:
-                            raise TypeError("The value of the formatted data must be the specified primitive type.")
-            for item in key_list:
-                for second_item in key_list:
-                    item.sort()
-                    second_item.sort()
-                    if item != second_item:
-                        raise TypeError("The key of the formatted data must be the same.")
+                            raise TypeError("The value of the formatted data must be the specified primitive type. The field '" + str(key_item) + "' of the row " + str(index) + " of the table '" + str(key) + "' is not.")
         return formatted_data
 
     def __check_formatted_value_list(self, formatted_value_list:list):
-        primitive_type_judger = True
         for item in formatted_value_list:
             if type(item) is dict:
                 return False
             elif type(item) is list:
-                primitive_type_judger = self.__check_formatted_value_list(item)
+                if self.__check_formatted_value_list(item) == False:
+                    return False
 
-        return primitive_type_judger
+        return True
     
 class flat_writer(csv_transformer.csv_transformer):
     """
     A class for writing transformed data to a single CSV file.
 
     This class extends the functionality of csv_transformer to transform JSON data and write it to
-    a single CSV file.
+    a single CSV file. By default the whole data is flattened into one row. If a record path is given,
+    each item of the chosen top-level array is flattened into its own row instead.
 
     Attributes
     ------------------
         - __formatted_data (dict): A dictionary to store the formatted data.
         - __file_name (str): The name of the CSV file to write the data to.
+        - __record_path (str or list): The key of the top-level array whose items are written as rows, the
+          list of keys of a nested array, '' for a top-level array itself, or None to write the whole data
+          as one row.
+        - __columns (list): The unified columns of the rows in the record-oriented mode.
+        - __backend (str): The backend which writes the CSV file, 'csv' or 'pandas'.
+        - __metrics (metrics.pipeline_metrics): The metrics of the stages and the file, or None to disable them.
 
     Methods
     ------------------
@@ -227,6 +824,14 @@ class flat_writer(csv_transformer.csv_transformer):
     - Method to write the transformed data to a single CSV file.
     - Returns: None
 
+    3. `to_dataframe(self, missing=None, dtype=None)`: 
+    - Method to build the transformed data as a pandas DataFrame.
+    - Arguments:
+        - `missing`: The value of the missing fields in the record-oriented mode.
+        - `dtype`: The data type of the columns, or None to let pandas infer it.
+    - Returns:
+        - pandas.DataFrame: The flattened data.
+
     Typical Usage
     ------------------
     1. Create an instance of `flat_writer` with source JSON data, csv data path and an optional file name.
@@ -242,8 +847,16 @@ class flat_writer(csv_transformer.csv_transformer):
     >>> writer = flat_writer(source_data, output_path, file_name='output_data')
     >>> writer.transform()
     >>> writer.write_to_file()
+    >>> # Write one row for each item of a top-level array.
+    >>> source_data = {"lion": [{"name": "leo", "meal": [6, 12]}, {"name": "noah", "age": 6}]}
+    >>> writer = flat_writer(source_data, output_path, file_name='lion', record_path='lion')
+    >>> writer.transform()
+    >>> writer.write_to_file()
+    >>> # name,meal_0,meal_1,age
+    >>> # leo,6,12,
+    >>> # noah,,,6
     """
-    def __init__(self, source_data, output_path, file_name = 'default'):
+    def __init__(self, source_data, output_path, file_name = 'default', copy: bool = True, record_path = None, backend: str = 'csv', metrics = None):
         """
         Initializes a flat_writer instance with source JSON data and an optional file name.
 
@@ -251,14 +864,32 @@ class flat_writer(csv_transformer.csv_transformer):
             source_data: The source JSON data to transform and write.
             output_path (str): The path to the output directory.
             file_name (str): The name of the CSV file for writing the data (default is 'default').
+            copy (bool): Flag to indicate whether a dict, list or tuple source is deep-copied before the
+                transformation. If it is False, the source is validated and used without a copy.
+            record_path (str or list): The key of the top-level array whose items are written as one row
+                each, the list of keys from the top level to a nested array, such as ['zoo', 'lion'], or ''
+                if the source itself is an array (default is None, which writes the whole data as one row).
+            backend (str): The backend which writes the CSV file (default is 'csv'). The 'pandas' backend
+                builds the rows as a DataFrame of Python objects and writes it with pandas, which gives
+                the same file as the 'csv' backend but more slowly, see `dataframe_backend`.
+            metrics (metrics.pipeline_metrics): The metrics which measure the stages of the conversion, and
+                the rows and the bytes of the file (default is None, which disables them).
 
         Returns: None
 
         Example: None
         """
-        super().__init__(source_data, output_path)
+        if backend not in ('csv', 'pandas'):
+            raise ValueError("The backend must be 'csv' or 'pandas'.")
+
+        with pipeline_metrics.measure(metrics, 'parse'):
+            super().__init__(source_data, output_path, copy)
+        self.__backend = backend
+        self.__metrics = metrics
         self.__formatted_data = {}
         self.__file_name = file_name
+        self.__record_path = record_path
+        self.__columns = None
     
     def transform(self):
         """
@@ -286,9 +917,44 @@ class flat_writer(csv_transformer.csv_transformer):
         >>> writer.write_to_file()
         >>> # The data is written to separate CSV files for each table.
         """
-        formatter = json_formatter.json_formatter(self.source_data)
-        formatter.flatten_json(self.source_data)
-        self.__formatted_data = formatter.store
+        if self.__record_path is not None:
+            with pipeline_metrics.measure(self.__metrics, 'discover'):
+                self.__discover_columns()
+            return
+
+        with pipeline_metrics.measure(self.__metrics, 'transform'):
+            formatter = json_formatter.json_formatter()
+            formatter.flatten_json(self.source_data)
+            self.__formatted_data = formatter.store
+
+    def __records(self):
+        record_path = self.__record_path
+        keys = [] if record_path == '' else [record_path] if isinstance(record_path, str) else record_path
+        records = self.source_data
+        for key in keys:
+            if type(records) is not dict:
+                raise TypeError("The source data must be a dictionary at every key of the record path.")
+            if key not in records:
+                raise KeyError("The record path " + repr(record_path) + " is not found in the source data.")
+            records = records[key]
+
+        if type(records) is not list:
+            raise TypeError("The record path must point to an array.")
+        return records
+
+    def __flatten_records(self):
+        # Only one flattened record is kept at a time.
+        formatter = json_formatter.json_formatter()
+        for record in self.__records():
+            formatter.flatten_json(record, reuse_keys=True)
+            yield formatter.store
+
+    def __discover_columns(self):
+        columns = {}
+        for flat_record in self.__flatten_records():
+            if not columns.keys() >= flat_record.keys():
+                columns.update(dict.fromkeys(flat_record))
+        self.__columns = list(columns)
 
     def write_to_file(self):
         """
@@ -310,6 +976,67 @@ class flat_writer(csv_transformer.csv_transformer):
         >>> writer.write_to_file()
         >>> # The data is written to a single CSV file.
         """
+        with pipeline_metrics.measure(self.__metrics, 'write'):
+            if self.__backend == 'pandas':
+                dataframe_backend.write_csv(self.to_dataframe(missing='', dtype=object), self.output_path + "/" + self.__file_name+'.csv')
+            elif self.__record_path is not None:
+                self.__write_records()
+            else:
+                with csv_file_manager.csv_file_manager(self.output_path + "/" + self.__file_name+'.csv', 'w') as csv_editor:
+                    csv_editor.writerow(self.__formatted_data.keys())
+                    csv_editor.writerow(self.__formatted_data.values())
+        if self.__metrics is not None:
+            rows = len(self.__records()) if self.__record_path is not None else 1
+            self.__metrics.record_table(self.__file_name, rows, self.output_path + "/" + self.__file_name+'.csv')
+
+    def __write_records(self):
+        if self.__columns is None:
+            self.__discover_columns()
+
+        columns = self.__columns
+        padding = itertools.repeat('')
         with csv_file_manager.csv_file_manager(self.output_path + "/" + self.__file_name+'.csv', 'w') as csv_editor:
-            csv_editor.writerow(self.__formatted_data.keys())
-            csv_editor.writerow(self.__formatted_data.values())
+            csv_editor.writerow(columns)
+            csv_editor.writerows(map(flat_record.get, columns, padding) for flat_record in self.__flatten_records())
+
+    @property
+    def metrics(self):
+        """
+        Property to access the metrics of the stages and the file.
+
+        Returns:
+            metrics.pipeline_metrics: The metrics given to the writer, or None if they are disabled.
+
+        Example: None
+        """
+        return self.__metrics
+
+    def to_dataframe(self, missing=None, dtype=None):
+        """
+        Method to build the transformed data as a pandas DataFrame.
+
+        pandas is imported when the method is called. The DataFrame has one row, or one row for each
+        item of the record path in the record-oriented mode.
+
+        Args:
+            missing: The value of the missing fields in the record-oriented mode (default is None).
+            dtype: The data type of the columns, or None to let pandas infer it (default is None).
+
+        Returns:
+            pandas.DataFrame: The flattened data.
+
+        Example:
+        >>> source_data = {"lion": [{"name": "leo", "meal": [6, 12]}, {"name": "noah", "age": 6}]}
+        >>> writer = flat_writer(source_data, './test/result', record_path='lion')
+        >>> writer.transform()
+        >>> print(writer.to_dataframe().columns.tolist())
+        ['name', 'meal_0', 'meal_1', 'age']
+        """
+        if self.__record_path is None:
+            return dataframe_backend.records_to_dataframe([self.__formatted_data], list(self.__formatted_data.keys()), dtype)
+
+        if self.__columns is None:
+            self.__discover_columns()
+        columns = self.__columns
+        return dataframe_backend.records_to_dataframe(
+            ({key: flat_record.get(key, missing) for key in columns} for flat_record in self.__flatten_records()), columns, dtype)
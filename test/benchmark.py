@@ -0,0 +1,182 @@
+"""
+Benchmark of the transformation stages on synthetic JSON payloads.
+
+It generates deterministic payloads for the JSON patterns of the readme (symmetrical lists,
+non-symmetrical lists, deep nesting, wide objects and lists of lists) and times each stage
+separately:
+
+    - `json_deconstructor`: the table and field pre-load of the data.
+    - `json_to_object_list`: the transformation of the data into tables.
+    - `flatten_json`: the transformation of the data into one flat row.
+    - `table_writer.write_to_file`: the writing of the tables to CSV files.
+    - `flat_writer.write_to_file`: the writing of the flat row to a CSV file.
+
+Every stage is timed without tracing first, and run again under tracemalloc for its peak memory.
+The writers of the write stages are built and transformed before the timer and the tracing start.
+The results are printed and written to a JSON file, so that two runs can be compared.
+
+Run it from the folder outside the json_to_csv folder:
+
+```
+python -m json_to_csv.test.benchmark --size 10000 --output benchmark.json
+```
+"""
+import argparse
+import json
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from ..lib.json_deconstructor import json_deconstructor
+from ..lib.json_formatter import json_formatter
+from ..lib.writer import table_writer, flat_writer
+
+def symmetrical_list(size, seed=0):
+    generator = random.Random(seed)
+    return {"lion": [{"years old": generator.randint(1, 30), "name": "lion" + str(index),
+                      "meal": [generator.randint(1, 20) for _ in range(3)],
+                      "zoo": {"city": generator.choice(["Rome", "Paris", "Tokyo"]), "zone": index % 7}}
+                     for index in range(size)]}
+
+def non_symmetrical_list(size, seed=0):
+    generator = random.Random(seed)
+    records = []
+    for index in range(size):
+        record = {"name": "lion" + str(index)}
+        for field in generator.sample(range(30), generator.randint(1, 10)):
+            record["field" + str(field)] = generator.random()
+        if index % 3 == 0:
+            record["meal"] = [{"food": "meat", "kg": generator.randint(1, 9)}]
+        records.append(record)
+    return {"lion": records}
+
+def deep_nesting(size, seed=0, depth=50):
+    generator = random.Random(seed)
+    branches = []
+    for index in range(max(size // depth, 1)):
+        node = {"value": generator.randint(0, 1000)}
+        for level in range(depth):
+            node = {"level" + str(level % 5): node, "index": index, "depth": level}
+        branches.append(node)
+    return {"branches": branches}
+
+def wide_object(size, seed=0, width=200):
+    generator = random.Random(seed)
+    return {"wide": [{"column" + str(column): generator.randint(0, 1000) for column in range(width)}
+                     for _ in range(max(size // 10, 1))]}
+
+def list_of_lists(size, seed=0):
+    generator = random.Random(seed)
+    return {"matrix": [[[{"x": generator.random(), "y": generator.random()} for _ in range(3)] for _ in range(4)]
+                       for _ in range(max(size // 12, 1))]}
+
+SHAPES = {
+    "symmetrical_list": symmetrical_list,
+    "non_symmetrical_list": non_symmetrical_list,
+    "deep_nesting": deep_nesting,
+    "wide_object": wide_object,
+    "list_of_lists": list_of_lists,
+}
+
+def count_table_rows(data):
+    formatter = json_formatter()
+    formatter.json_to_object_list(data)
+    return sum(len(table) for table in formatter.tables.values())
+
+def stages(data, output_path):
+    def deconstruct(_):
+        json_deconstructor(data)
+
+    def to_object_list(_):
+        formatter = json_formatter()
+        formatter.json_to_object_list(data)
+
+    def flatten(_):
+        formatter = json_formatter()
+        formatter.flatten_json(data)
+
+    # The writers are built and transformed outside the timer, so the write stages only time the writing.
+    def transformed_tables():
+        writer = table_writer(data, output_path, copy=False)
+        writer.transform()
+        return writer
+
+    def transformed_flat():
+        writer = flat_writer(data, output_path, copy=False)
+        writer.transform()
+        return writer
+
+    def write_to_file(writer):
+        writer.write_to_file()
+
+    # The flat stages produce one row, the other stages produce the rows of the tables.
+    return [("json_deconstructor", None, deconstruct, False), ("json_to_object_list", None, to_object_list, False),
+            ("flatten_json", None, flatten, True), ("table_writer.write_to_file", transformed_tables, write_to_file, False),
+            ("flat_writer.write_to_file", transformed_flat, write_to_file, True)]
+
+def measure(setup, stage, repeat):
+    seconds = None
+    for _ in range(repeat):
+        prepared = setup() if setup is not None else None
+        start = time.perf_counter()
+        stage(prepared)
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+        del prepared
+
+    prepared = setup() if setup is not None else None
+    tracemalloc.start()
+    try:
+        stage(prepared)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return seconds, peak
+
+def run(shapes, size, repeat, seed):
+    results = []
+    with tempfile.TemporaryDirectory() as output_path:
+        for shape in shapes:
+            data = SHAPES[shape](size, seed)
+            table_rows = count_table_rows(data)
+            for stage_name, setup, stage, is_flat in stages(data, output_path):
+                seconds, peak = measure(setup, stage, repeat)
+                rows = 1 if is_flat else table_rows
+                results.append({
+                    "shape": shape,
+                    "stage": stage_name,
+                    "seconds": seconds,
+                    "rows": rows,
+                    "rows_per_sec": rows / seconds if seconds else None,
+                    "peak_memory_bytes": peak,
+                })
+                print("%-22s %-28s %10.4f %10d %14.0f %12.1f" % (shape, stage_name, seconds, rows,
+                      rows / seconds if seconds else 0, peak / 1024 / 1024))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the transformation stages on synthetic JSON payloads.")
+    parser.add_argument('--size', type=int, default=10000, help="The approximate number of records of each payload.")
+    parser.add_argument('--repeat', type=int, default=3, help="The number of timed runs of each stage; the fastest is reported.")
+    parser.add_argument('--seed', type=int, default=0, help="The seed of the payload generators.")
+    parser.add_argument('--shapes', nargs='+', choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument('--output', default='benchmark.json', help="The JSON file for the results.")
+    args = parser.parse_args()
+
+    print("%-22s %-28s %10s %10s %14s %12s" % ("shape", "stage", "seconds", "rows", "rows/sec", "peak (MB)"))
+    results = run(args.shapes, args.size, args.repeat, args.seed)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "size": args.size,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as output_file:
+        json.dump(report, output_file, indent=4)
+
+if __name__ == '__main__':
+    main()
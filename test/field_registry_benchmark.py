@@ -0,0 +1,61 @@
+"""
+Benchmark of the field registry of json_deconstructor on a wide table.
+
+It registers the keys of every record of one wide table, once with the previous list based
+registry and once with `json_deconstructor.register_fields`, and prints the time of both for
+an increasing number of records.
+
+Run it from the folder outside the json_to_csv folder:
+
+```
+python -m json_to_csv.test.field_registry_benchmark --columns 500 --records 100000
+```
+"""
+import argparse
+import time
+from ..lib.json_deconstructor import json_deconstructor
+
+def register_fields_with_list(fields, name, keys):
+    # The registry before the ordered-set change: every key is checked against a plain list.
+    if name not in fields:
+        fields[name] = ["parent_id", name+"_id"]
+    for key in keys:
+        if key not in fields[name]:
+            fields[name].append(key)
+
+def run(columns, records):
+    keys = ["field" + str(index) for index in range(columns)]
+
+    start = time.perf_counter()
+    list_fields = {}
+    for _ in range(records):
+        register_fields_with_list(list_fields, 'wide', keys)
+    list_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    deconstructor = json_deconstructor()
+    for _ in range(records):
+        deconstructor.register_fields('wide', keys)
+    registry_time = time.perf_counter() - start
+
+    assert list_fields['wide'] == list(deconstructor.fields['wide'])
+    return list_time, registry_time
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the field registry of json_deconstructor.")
+    parser.add_argument('--columns', type=int, default=500)
+    parser.add_argument('--records', type=int, default=100000)
+    args = parser.parse_args()
+
+    print("%10s %10s %12s %12s %8s" % ("columns", "records", "list (s)", "registry (s)", "speedup"))
+    records = 1000
+    while True:
+        records = min(records, args.records)
+        list_time, registry_time = run(args.columns, records)
+        print("%10d %10d %12.3f %12.3f %7.1fx" % (args.columns, records, list_time, registry_time, list_time / registry_time))
+        if records == args.records:
+            break
+        records *= 10
+
+if __name__ == '__main__':
+    main()
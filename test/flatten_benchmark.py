@@ -0,0 +1,78 @@
+"""
+Benchmark of the column name construction of json_formatter.flatten_json on deep and wide data.
+
+It flattens a list of records which are both deep and wide, once with the previous flattener that
+concatenated the prefix of every value again, and once with `json_formatter.flatten_json` with
+`reuse_keys`, and prints the time and the peak memory of both. The records are flattened one by one, as the
+record-oriented flat_writer does, and the flattened records are kept, so the memory shows whether
+the records share their column names.
+
+Run it from the folder outside the json_to_csv folder:
+
+```
+python -m json_to_csv.test.flatten_benchmark --depth 20 --width 50 --records 2000
+```
+"""
+import argparse
+import time
+import tracemalloc
+from ..lib.json_formatter import json_formatter
+
+def flatten_with_concatenation(nested_json, store, name=''):
+    # The flattener before the prefix cache: every column name is concatenated from its full prefix.
+    if type(nested_json) is dict:
+        for a in nested_json:
+            flatten_with_concatenation(nested_json[a], store, name + a + '_')
+    elif type(nested_json) is list:
+        for i, a in enumerate(nested_json):
+            flatten_with_concatenation(a, store, name + str(i) + '_')
+    else:
+        store[name[:-1]] = nested_json
+
+def deep_and_wide_record(depth, width, seed):
+    node = {"field" + str(column): seed + column for column in range(width)}
+    for level in range(depth):
+        node = {"level" + str(level): node, "values" + str(level): [seed, level]}
+    return node
+
+def measure(flatten, records):
+    tracemalloc.start()
+    start = time.perf_counter()
+    flattened = [flatten(record) for record in records]
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, flattened
+
+def run(depth, width, records):
+    data = [deep_and_wide_record(depth, width, seed) for seed in range(records)]
+
+    def concatenation(record):
+        store = {}
+        flatten_with_concatenation(record, store)
+        return store
+
+    formatter = json_formatter()
+    def cached(record):
+        formatter.flatten_json(record, reuse_keys=True)
+        return formatter.store
+
+    concatenation_time, concatenation_peak, concatenation_rows = measure(concatenation, data)
+    cached_time, cached_peak, cached_rows = measure(cached, data)
+    assert concatenation_rows == cached_rows
+    return concatenation_time, concatenation_peak, cached_time, cached_peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the column name construction of flatten_json.")
+    parser.add_argument('--depth', type=int, default=20)
+    parser.add_argument('--width', type=int, default=50)
+    parser.add_argument('--records', type=int, default=2000)
+    args = parser.parse_args()
+
+    concatenation_time, concatenation_peak, cached_time, cached_peak = run(args.depth, args.width, args.records)
+    print("%-14s %12s %12s" % ("flattener", "time (s)", "peak (MB)"))
+    print("%-14s %12.3f %12.1f" % ("concatenation", concatenation_time, concatenation_peak / 1024 / 1024))
+    print("%-14s %12.3f %12.1f" % ("cached", cached_time, cached_peak / 1024 / 1024))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark of the multi-process conversion of a top-level array and of JSON Lines.
+
+It writes the items of a generated payload as one JSON array file and as one JSON Lines file, and
+measures two things:
+
+    - The first pass of `json_lines.write_chunks`, which counts the records of the items by table,
+      once with the previous first pass, which transformed every item, and once with
+      `json_formatter.count_item_records`, which does not build the records.
+    - The conversion of both files with one process and with several processes, with the wall time
+      and the CPU time of this process and of the worker processes.
+
+The speedup of several processes is bounded by the number of CPUs, which is printed first.
+
+Run it from the folder outside the json_to_csv folder:
+
+```
+python -m json_to_csv.test.multiprocess_benchmark --size 60000 --processes 2 4
+```
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from ..lib import json_array, json_lines
+from ..lib.json_formatter import json_formatter
+from ..lib.writer import table_writer
+from .benchmark import SHAPES
+
+def count_with_transform(items):
+    # The first pass before the count-only walk: every item is transformed and its records dropped.
+    formatter = json_formatter()
+    json_lines.convert_json_lines(items, formatter, lambda rows: None)
+    return formatter.table_states
+
+def count_with_walk(items):
+    formatter = json_formatter()
+    for index, item in enumerate(items):
+        formatter.count_item_records(item, index)
+    return formatter.table_states
+
+def first_pass(path):
+    chunks, _ = json_array.split_json_array(path, 1)
+    times = []
+    states = []
+    for count in (count_with_transform, count_with_walk):
+        start = time.perf_counter()
+        states.append(count(json_array._iter_array_items(path, *chunks[0])))
+        times.append(time.perf_counter() - start)
+    assert states[0] == states[1]
+    return times
+
+def convert(path, processes, is_json_lines):
+    with tempfile.TemporaryDirectory() as output_path:
+        before = os.times()
+        start = time.perf_counter()
+        with open(path, 'r', encoding='utf-8') as source_file:
+            writer = table_writer(source_file, output_path, is_json_lines=is_json_lines, max_processes=processes)
+            writer.transform()
+            writer.write_to_file()
+        wall = time.perf_counter() - start
+        after = os.times()
+    cpu = (after.user - before.user) + (after.system - before.system)
+    worker_cpu = (after.children_user - before.children_user) + (after.children_system - before.children_system)
+    return wall, cpu, worker_cpu
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the multi-process conversion of a top-level array and of JSON Lines.")
+    parser.add_argument('--size', type=int, default=60000, help="The approximate number of records of the payload.")
+    parser.add_argument('--shape', choices=list(SHAPES), default='symmetrical_list')
+    parser.add_argument('--processes', type=int, nargs='+', default=[2, 4])
+    args = parser.parse_args()
+
+    items = next(iter(SHAPES[args.shape](args.size).values()))
+    print("cpus: %d, items: %d" % (os.cpu_count(), len(items)))
+    with tempfile.TemporaryDirectory() as source_path:
+        array_path = os.path.join(source_path, 'items.json')
+        with open(array_path, 'w', encoding='utf-8') as array_file:
+            json.dump(items, array_file)
+        lines_path = os.path.join(source_path, 'items.jsonl')
+        with open(lines_path, 'w', encoding='utf-8') as lines_file:
+            lines_file.writelines(json.dumps(item) + '\n' for item in items)
+        del items
+
+        transform_time, walk_time = first_pass(array_path)
+        print("\n%-28s %10s" % ("first pass", "seconds"))
+        print("%-28s %10.3f" % ("transform", transform_time))
+        print("%-28s %10.3f %7.1fx" % ("count_item_records", walk_time, transform_time / walk_time))
+
+        print("\n%-12s %10s %10s %10s %12s %8s" % ("source", "processes", "wall (s)", "cpu (s)", "workers (s)", "speedup"))
+        for source, path, is_json_lines in (("array", array_path, False), ("json_lines", lines_path, True)):
+            serial_wall = None
+            for processes in [1] + args.processes:
+                wall, cpu, worker_cpu = convert(path, processes, is_json_lines)
+                serial_wall = wall if serial_wall is None else serial_wall
+                print("%-12s %10d %10.3f %10.3f %12.3f %7.2fx" % (source, processes, wall, cpu, worker_cpu, serial_wall / wall))
+
+if __name__ == '__main__':
+    main()
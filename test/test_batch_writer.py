@@ -0,0 +1,50 @@
+"""
+Tests of the batch conversion of many JSON files.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import json
+import pytest
+from ..lib.batch_writer import batch_writer, main
+from .test_writer_modes import RECORDS, read_files
+
+@pytest.fixture
+def sources(tmp_path):
+    # Two files with the same name in different folders.
+    paths = []
+    for folder, records in (('a', RECORDS[:2]), ('b', RECORDS[2:])):
+        (tmp_path / 'src' / folder).mkdir(parents=True)
+        path = tmp_path / 'src' / folder / 'data.json'
+        path.write_text(json.dumps(records), encoding='utf-8')
+        paths.append(str(path))
+    return paths
+
+def test_merged_output(sources, tmp_path):
+    batch_writer(str(tmp_path / 'src'), str(tmp_path / 'output'), max_workers=2).write_to_file()
+    files = read_files(tmp_path / 'output')
+    rows = files['root.csv'].splitlines()
+    assert rows[0] == 'parent_id,root_id,name,years old,meal,zoo,tags,cubs,note,alive'
+    assert [row.split(',')[1] for row in rows[1:]] == ['0_root_0', '0_root_1', '1_root_0', '1_root_1']
+    assert [row.split(',')[2] for row in rows[1:]] == [record['name'] for record in RECORDS]
+
+def test_per_file_output(sources, tmp_path):
+    batch_writer(sources, str(tmp_path / 'output'), max_workers=2, is_merged=False).write_to_file()
+    first = read_files(tmp_path / 'output' / 'a' / 'data')
+    second = read_files(tmp_path / 'output' / 'b' / 'data')
+    assert first['root.csv'].splitlines()[1].split(',')[1:3] == ['0_root_0', 'lion']
+    assert second['root.csv'].splitlines()[1].split(',')[1:3] == ['1_root_0', 'bear']
+
+def test_per_file_folder_collision(sources, tmp_path):
+    (tmp_path / 'src' / 'a' / 'data.JSON').write_text('[]', encoding='utf-8')
+    pattern = str(tmp_path / 'src' / 'a' / 'data.*')
+    with pytest.raises(ValueError):
+        batch_writer(pattern, str(tmp_path / 'output'), is_merged=False)
+    with pytest.raises(SystemExit):
+        main([pattern, str(tmp_path / 'output'), '--per-file'])
+    # The shards of the merged output are named by the index of the file, so the names do not collide.
+    batch_writer(pattern, str(tmp_path / 'merged')).write_to_file()
+    assert read_files(tmp_path / 'merged')['root.csv'].splitlines()[1].split(',')[1:3] == ['1_root_0', 'lion']
@@ -0,0 +1,38 @@
+"""
+Tests of the concurrent writing of the tables of table_writer, which must give the same files as
+writing the tables one by one.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import threading
+from ..lib.writer import table_writer
+from .test_writer_modes import RECORDS, payload, write_tables
+
+def test_concurrent_writing(tmp_path):
+    expected = write_tables(RECORDS, tmp_path / 'expected')
+    assert write_tables(RECORDS, tmp_path / 'output', max_workers=4) == expected
+
+def test_concurrent_writing_of_payloads(payload, tmp_path):
+    items, array_file, lines_file, expected = payload
+    assert write_tables(items, tmp_path / 'output', max_workers=3) == expected
+
+def test_table_timings(tmp_path, monkeypatch):
+    expected = write_tables(RECORDS, tmp_path / 'expected')
+    threads = set()
+    write_table = table_writer._table_writer__write_table
+
+    def recording_write_table(self, key, value):
+        threads.add(threading.get_ident())
+        return write_table(self, key, value)
+    monkeypatch.setattr(table_writer, '_table_writer__write_table', recording_write_table)
+
+    writer = table_writer(RECORDS, str(tmp_path), max_workers=4)
+    writer.transform()
+    writer.write_to_file()
+    # Each table is written by a thread of the pool, and its time is kept.
+    assert set(writer.table_timings) == {name[:-4] for name in expected}
+    assert threading.get_ident() not in threads
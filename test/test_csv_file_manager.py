@@ -0,0 +1,56 @@
+"""
+Tests of the batched CSV sink of csv_file_manager, which keeps at most a given number of files open
+and reopens the files which it has closed in append mode.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import builtins
+import json
+from ..lib import csv_file_manager
+from .test_writer_modes import RECORDS, read_files, write_tables
+
+TABLES = ['lion', 'tiger', 'bear', 'wolf']
+
+def test_evicted_files_are_appended(tmp_path, monkeypatch):
+    opened = []
+    open_files = set()
+
+    def recording_open(file_name, mode, *args, **kwargs):
+        opened.append((file_name[len(str(tmp_path)) + 1:], mode))
+        opened_file = builtins.open(file_name, mode, *args, **kwargs)
+        open_files.add(opened_file)
+        assert len([open_file for open_file in open_files if not open_file.closed]) <= 2
+        return opened_file
+    monkeypatch.setattr(csv_file_manager, 'open', recording_open, raising=False)
+
+    with csv_file_manager.csv_batch_sink(max_open_files=2, batch_size=1) as sink:
+        for name in TABLES:
+            sink.writerow(str(tmp_path / name), ['name', 'age'])
+        for age in range(3):
+            for name in TABLES:
+                sink.writerow(str(tmp_path / name), [name, age])
+
+    assert all(open_file.closed for open_file in open_files)
+    # Each file is created once, and every later batch reopens it in append mode.
+    for name in TABLES:
+        assert [mode for file_name, mode in opened if file_name == name] == ['w', 'a', 'a', 'a']
+        assert read_files(tmp_path)[name].splitlines() == ['name,age', name + ',0', name + ',1', name + ',2']
+
+def test_remaining_batches(tmp_path):
+    with csv_file_manager.csv_batch_sink(max_open_files=1, batch_size=2) as sink:
+        sink.writerows(str(tmp_path / 'lion'), [['name'], ['leo'], ['noah']])
+        sink.writerows(str(tmp_path / 'tiger'), [['name']])
+        sink.writerows(str(tmp_path / 'bear'), [])
+    assert read_files(tmp_path) == {'bear': '', 'lion': 'name\r\nleo\r\nnoah\r\n', 'tiger': 'name\r\n'}
+
+def test_streaming_with_one_open_file(tmp_path):
+    array_file = tmp_path / 'records.json'
+    array_file.write_text(json.dumps(RECORDS), encoding='utf-8')
+    expected = write_tables(RECORDS, tmp_path / 'expected')
+    with open(array_file, 'r', encoding='utf-8') as source_file:
+        files = write_tables(source_file, tmp_path / 'output', is_streaming=True, max_open_files=1)
+    assert files == expected
@@ -0,0 +1,126 @@
+"""
+Tests of the ingestion of the sources: dict, list and tuple sources without a copy, and source files,
+which are memory-mapped and parsed with orjson if it is installed and must give the same data as
+`json.load`.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import copy
+import json
+import pytest
+from ..lib import csv_transformer
+from ..lib.writer import table_writer
+from .test_writer_modes import RECORDS, write_tables
+
+class json_object(dict):
+    pass
+
+class json_array(list):
+    pass
+
+@pytest.mark.parametrize("container_type", [dict, json_object], ids=["dict", "subclass"])
+def test_cyclic_source(container_type, tmp_path):
+    item = container_type(name="lion")
+    item["self"] = item
+    for is_copied in (True, False):
+        with pytest.raises(ValueError):
+            table_writer([item], str(tmp_path), copy=is_copied)
+
+def test_cyclic_array_subclass(tmp_path):
+    items = json_array([1])
+    items.append(json_object(items=items))
+    with pytest.raises(ValueError):
+        table_writer({"items": items}, str(tmp_path), copy=False)
+
+def test_subclass_source(tmp_path):
+    expected = write_tables(RECORDS, tmp_path / 'expected')
+    source = [json_object(record, meal=json_array(record["meal"]) if "meal" in record else None) for record in RECORDS]
+    for record in source:
+        if record["meal"] is None:
+            del record["meal"]
+    assert write_tables(source, tmp_path / 'output', copy=False) == expected
+
+def test_source_is_not_mutated(tmp_path):
+    source = copy.deepcopy(RECORDS)
+    expected = write_tables(RECORDS, tmp_path / 'expected')
+    assert write_tables(source, tmp_path / 'output', copy=False) == expected
+    assert source == RECORDS
+
+DOCUMENTS = {
+    "records": json.dumps(RECORDS),
+    "long_integers": '[{"id": 12345678901234567890, "small": -1234567890123456789012, "float": 1.5}]',
+    "long_fractions": '[{"pi": 3.14159265358979323846, "tiny": 1e-12345678901234567890, "big": 2E+1234567890123456789}]',
+    "digits_in_strings": '[{"phone": "12345678901234567890", "name": "lion"}]',
+    "unicode": '[{"name": "\\u00e9l\\u00e9phant", "emoji": "\\ud83e\\udd81", "raw": "lion \u4e2d"}]',
+    "scalar": '12345678901234567890',
+}
+
+def load_file(path):
+    with open(path, 'r', encoding='utf-8') as source_file:
+        return table_writer(source_file, str(path.parent)).source_data
+
+@pytest.mark.parametrize("has_orjson", [True, False], ids=["orjson", "json"])
+@pytest.mark.parametrize("name", list(DOCUMENTS))
+def test_mapped_file(name, has_orjson, tmp_path, monkeypatch):
+    if has_orjson:
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(csv_transformer, 'orjson', None)
+    path = tmp_path / 'source.json'
+    path.write_text(DOCUMENTS[name], encoding='utf-8')
+    data = load_file(path)
+    assert data == json.loads(DOCUMENTS[name])
+    # The integers beyond 64 bits stay integers, like in json.load.
+    assert repr(data) == repr(json.loads(DOCUMENTS[name]))
+
+@pytest.mark.parametrize("name, is_parsed", [("records", True), ("long_integers", False), ("long_fractions", True)])
+def test_orjson_is_used(name, is_parsed, tmp_path, monkeypatch):
+    orjson = pytest.importorskip('orjson')
+    documents = []
+    monkeypatch.setattr(orjson, 'loads', lambda view, loads=orjson.loads: documents.append(bytes(view)) or loads(view))
+    path = tmp_path / 'source.json'
+    path.write_text(DOCUMENTS[name], encoding='utf-8')
+    load_file(path)
+    assert documents == ([DOCUMENTS[name].encode('utf-8')] if is_parsed else [])
+
+def test_long_integer_scan(monkeypatch):
+    assert csv_transformer._has_long_integer(b'[12345678901234567890]')
+    assert csv_transformer._has_long_integer(b'[-1234567890123456789]')
+    assert csv_transformer._has_long_integer(b'["1234567890123456789"]')
+    assert not csv_transformer._has_long_integer(b'[123456789012345678]')
+    assert not csv_transformer._has_long_integer(b'[0.1234567890123456789, 1e1234567890123456789, 1E-1234567890123456789]')
+    # A run which crosses a chunk boundary is found in the overlap of the next chunk.
+    monkeypatch.setattr(csv_transformer, '_SCAN_CHUNK_SIZE', 16)
+    assert csv_transformer._has_long_integer(b'[1, 2, 3, 4, 5, 12345678901234567890]')
+    assert not csv_transformer._has_long_integer(b'[1, 2, 3, 4, 5, 0.12345678901234567890]')
+
+@pytest.mark.parametrize("text", ['[NaN, 1]', '["\\ud800"]', '[1, 2,]'], ids=["nan", "lone_surrogate", "invalid"])
+def test_orjson_error_fallback(text, tmp_path):
+    orjson = pytest.importorskip('orjson')
+    with pytest.raises(orjson.JSONDecodeError):
+        orjson.loads(text)
+    path = tmp_path / 'source.json'
+    path.write_text(text, encoding='utf-8')
+    try:
+        expected = json.loads(text)
+    except json.JSONDecodeError:
+        with pytest.raises(json.JSONDecodeError):
+            load_file(path)
+        return
+    assert repr(load_file(path)) == repr(expected)
+
+@pytest.mark.parametrize("text", ['', '\ufeff[1]'], ids=["empty", "byte_order_mark"])
+def test_unmapped_file(text, tmp_path):
+    # The files which are not mapped are read by json.load, so they give its errors.
+    path = tmp_path / 'source.json'
+    path.write_text(text, encoding='utf-8')
+    with open(path, 'r', encoding='utf-8') as source_file:
+        with pytest.raises(json.JSONDecodeError) as expected:
+            json.load(source_file)
+    with pytest.raises(json.JSONDecodeError) as error:
+        load_file(path)
+    assert error.value.msg == expected.value.msg
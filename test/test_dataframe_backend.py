@@ -0,0 +1,34 @@
+"""
+Tests of the optional pandas backend against the in-memory table mode, and of its error without
+pandas.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import sys
+import pytest
+from ..lib import dataframe_backend
+from ..lib.writer import table_writer, flat_writer
+from .test_writer_modes import RECORDS, payload, write_tables
+
+def test_pandas_backend(payload, tmp_path):
+    pytest.importorskip('pandas')
+    items, array_file, lines_file, expected = payload
+    assert write_tables(items, tmp_path / 'output', backend='pandas') == expected
+
+def test_missing_pandas(monkeypatch, tmp_path):
+    # A None entry in sys.modules makes the import of pandas fail, whether it is installed or not.
+    monkeypatch.setitem(sys.modules, 'pandas', None)
+    writer = table_writer(RECORDS, str(tmp_path), backend='pandas')
+    writer.transform()
+    with pytest.raises(ImportError, match="pip install pandas"):
+        writer.write_to_file()
+    with pytest.raises(ImportError, match="pip install pandas"):
+        writer.to_dataframes()
+    with pytest.raises(ImportError, match="pip install pandas"):
+        flat_writer(RECORDS, str(tmp_path)).to_dataframe()
+    with pytest.raises(ImportError, match="pip install pandas"):
+        dataframe_backend.records_to_dataframe([], [])
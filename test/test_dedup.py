@@ -0,0 +1,50 @@
+"""
+Tests of the dedup mode of table_writer, which stores the sub-records with the same content once
+and keeps the least recently used digests up to the dedup size.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import pytest
+from ..lib.json_formatter import json_formatter
+from .test_writer_modes import write_tables
+
+ZOOS = [
+    {"name": "lion", "zoo": {"city": "Rome"}},
+    {"name": "tiger", "zoo": {"city": "Rome"}},
+    {"name": "bear", "zoo": {"city": "Paris"}},
+]
+
+def column(content, index):
+    return [row.split(',')[index] for row in content.splitlines()[1:]]
+
+def test_dedup_mode(tmp_path):
+    files = write_tables(ZOOS, tmp_path / 'output', dedup=True)
+    assert files['zoo.csv'].splitlines() == ['parent_id,zoo_id,city', 'root_0,zoo_0,Rome', 'root_2,zoo_1,Paris']
+    assert column(files['root.csv'], 3) == ['zoo_0', 'zoo_0', 'zoo_1']
+
+def test_dedup_of_arrays(tmp_path):
+    source = {"cages": [{"size": 2}, {"size": 3}], "pens": [{"size": 2}, {"size": 3}], "yards": [{"size": 2}, {"size": 3}]}
+    files = write_tables(source, tmp_path / 'output', dedup=True)
+    # The arrays of the same field are deduplicated, and the arrays of different fields are not.
+    assert sorted(files) == ['cages.csv', 'pens.csv', 'root.csv', 'yards.csv']
+    assert [len(files[name].splitlines()) for name in ('cages.csv', 'pens.csv', 'yards.csv')] == [3, 3, 3]
+    files = write_tables([{"cages": [{"size": 2}]}, {"cages": [{"size": 2}]}], tmp_path / 'items', dedup=True)
+    assert len(files['cages.csv'].splitlines()) == 2
+
+@pytest.mark.parametrize("dedup_size, cities", [(1, ['Rome', 'Paris', 'Rome']), (2, ['Rome', 'Paris'])])
+def test_dedup_size(dedup_size, cities, tmp_path):
+    # The digest of Rome is evicted by the digest of Paris when the index keeps one digest.
+    source = {"zoos": [{"zoo": {"city": "Rome"}}, {"zoo": {"city": "Paris"}}, {"zoo": {"city": "Rome"}}]}
+    files = write_tables(source, tmp_path / 'output', dedup=True, dedup_size=dedup_size)
+    assert column(files['zoo.csv'], 2) == cities
+    zoo_ids = column(files['zoos.csv'], 2)
+    assert len(set(zoo_ids)) == len(cities)
+    assert set(zoo_ids) == set(column(files['zoo.csv'], 1))
+
+def test_invalid_dedup_size():
+    with pytest.raises(ValueError):
+        json_formatter(dedup=True, dedup_size=0)
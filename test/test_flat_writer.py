@@ -0,0 +1,47 @@
+"""
+Tests of the record-oriented mode of flat_writer.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import pytest
+from ..lib.writer import flat_writer
+from .test_writer_modes import read_files
+
+LIONS = [{"name": "leo", "meal": [6, 12]}, {"name": "noah", "age": 6, "zoo": {"city": "Rome"}}]
+EXPECTED = 'name,meal_0,meal_1,age,zoo_city\r\nleo,6,12,,\r\nnoah,,,6,Rome\r\n'
+
+def write_flat(source, output_path, **options):
+    output_path.mkdir()
+    writer = flat_writer(source, str(output_path), file_name='lion', **options)
+    writer.transform()
+    writer.write_to_file()
+    return read_files(output_path)['lion.csv']
+
+def test_top_level_record_path(tmp_path):
+    assert write_flat({"lion": LIONS}, tmp_path / 'key', record_path='lion') == EXPECTED
+    assert write_flat(LIONS, tmp_path / 'array', record_path='') == EXPECTED
+
+def test_nested_record_path(tmp_path):
+    source = {"zoo": {"name": "Rome", "animals": {"lion": LIONS}}}
+    assert write_flat(source, tmp_path / 'output', record_path=['zoo', 'animals', 'lion']) == EXPECTED
+
+def test_single_row(tmp_path):
+    assert write_flat({"lion": LIONS}, tmp_path / 'output') == \
+        'lion_0_name,lion_0_meal_0,lion_0_meal_1,lion_1_name,lion_1_age,lion_1_zoo_city\r\nleo,6,12,noah,6,Rome\r\n'
+
+@pytest.mark.parametrize("source, record_path, error", [
+    ({"lion": LIONS}, 'tiger', KeyError),
+    ({"zoo": {"lion": LIONS}}, ['zoo', 'tiger'], KeyError),
+    ({"lion": {"name": "leo"}}, 'lion', TypeError),
+    ({"zoo": {"lion": LIONS}}, ['zoo'], TypeError),
+    ({"zoo": [{"lion": LIONS}]}, ['zoo', 'lion'], TypeError),
+    (LIONS, 'lion', TypeError),
+], ids=["missing_key", "missing_nested_key", "object_target", "nested_object_target", "array_on_path", "array_source"])
+def test_invalid_record_path(source, record_path, error, tmp_path):
+    writer = flat_writer(source, str(tmp_path), record_path=record_path)
+    with pytest.raises(error):
+        writer.transform()
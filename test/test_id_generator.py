@@ -0,0 +1,84 @@
+"""
+Tests of the ID strategies of the random ID mode.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import json
+import pytest
+import uuid
+from ..lib import id_generator
+from ..lib.writer import table_writer
+from .test_writer_modes import RECORDS, read_files, write_tables
+
+ZOOS = [
+    {"name": "lion", "zoo": {"city": "Rome"}},
+    {"name": "tiger", "zoo": {"city": "Rome"}},
+    {"name": "bear", "zoo": {"city": "Paris"}},
+]
+
+def test_content_ids(tmp_path):
+    first = write_tables(ZOOS, tmp_path / 'first', id_strategy='content')
+    assert write_tables(ZOOS, tmp_path / 'second', id_strategy='content') == first
+    root_ids = [row.split(',')[1] for row in first['root.csv'].splitlines()[1:]]
+    zoo_rows = [row.split(',') for row in first['zoo.csv'].splitlines()[1:]]
+    assert len(set(root_ids)) == 3
+    # The identical sub-records at different positions get different IDs, and keep their parents.
+    assert [row[0] for row in zoo_rows] == root_ids
+    assert len({row[1] for row in zoo_rows}) == 3
+
+def test_snowflake_ids(tmp_path):
+    files = write_tables(ZOOS, tmp_path / 'output', id_strategy='snowflake')
+    root_ids = [int(row.split(',')[1]) for row in files['root.csv'].splitlines()[1:]]
+    assert len(set(root_ids)) == len(ZOOS)
+    assert root_ids == sorted(root_ids)
+    zoo_parents = [int(row.split(',')[0]) for row in files['zoo.csv'].splitlines()[1:]]
+    assert zoo_parents == root_ids
+
+def test_uuid_ids(tmp_path):
+    files = write_tables(ZOOS, tmp_path / 'output', id_strategy='uuid')
+    root_ids = [row.split(',')[1] for row in files['root.csv'].splitlines()[1:]]
+    assert len({str(uuid.UUID(root_id)) for root_id in root_ids}) == len(ZOOS)
+    assert [row.split(',')[0] for row in files['zoo.csv'].splitlines()[1:]] == root_ids
+
+def test_snowflake_ids_of_distinct_workers(monkeypatch):
+    # All the IDs are generated in the same millisecond, where only the worker IDs tell them apart.
+    monkeypatch.setattr(id_generator.time, 'time_ns', lambda: 1700000000000000000)
+    first = id_generator.snowflake_id_generator(worker_id=1)
+    second = id_generator.snowflake_id_generator(worker_id=2)
+    first_ids = {first.next_id('lion', '', index, None) for index in range(10000)}
+    second_ids = {second.next_id('lion', '', index, None) for index in range(10000)}
+    assert len(first_ids) == len(second_ids) == 10000
+    assert not first_ids & second_ids
+
+def test_snowflake_worker_generator(monkeypatch):
+    monkeypatch.setattr(id_generator.time, 'time_ns', lambda: 1700000000000000000)
+    generator = id_generator.snowflake_id_generator(worker_id=0)
+    workers = [generator.for_worker(index) for index in range(4)]
+    assert [int(worker.next_id('lion', '', 0, None)) >> 12 & 0x3FF for worker in workers] == [0, 1, 2, 3]
+    with pytest.raises(ValueError):
+        generator.for_worker(1024)
+
+def test_seeded_random_worker_generators():
+    generator = id_generator.random_id_generator(seed=7)
+    first = [generator.for_worker(0).next_id('lion', '', index, None) for index in range(100)]
+    second = [generator.for_worker(1).next_id('lion', '', index, None) for index in range(100)]
+    assert first == [generator.for_worker(0).next_id('lion', '', index, None) for index in range(100)]
+    assert not set(first) & set(second)
+
+@pytest.mark.parametrize("id_strategy", ['random', 'snowflake'])
+def test_multiprocess_ids_are_unique(tmp_path, id_strategy):
+    array_file = tmp_path / 'records.json'
+    array_file.write_text(json.dumps(RECORDS * 50), encoding='utf-8')
+    output_path = tmp_path / 'output'
+    output_path.mkdir()
+    with open(array_file, 'r', encoding='utf-8') as source_file:
+        writer = table_writer(source_file, str(output_path), id_strategy=id_strategy, max_processes=2)
+        writer.transform()
+        writer.write_to_file()
+    lines = read_files(output_path)['root.csv'].splitlines()[1:]
+    ids = [line.split(',')[1] for line in lines]
+    assert len(ids) == len(RECORDS) * 50 and len(set(ids)) == len(ids)
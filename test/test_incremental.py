@@ -0,0 +1,34 @@
+"""
+Tests of the incremental mode of table_writer, which appends the records of the new documents to
+the CSV files of the earlier runs.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+from ..lib.writer import table_writer
+from .test_writer_modes import payload, read_files, write_tables
+
+def test_incremental_mode(payload, tmp_path):
+    items, array_file, lines_file, expected = payload
+    state_file = str(tmp_path / 'state.json')
+    middle = len(items) // 2
+    write_tables(items[:middle], tmp_path / 'output', state_file=state_file)
+    assert write_tables(items[middle:], tmp_path / 'output', state_file=state_file) == expected
+
+def test_new_fields(tmp_path):
+    state_file = str(tmp_path / 'state.json')
+    write_tables([{"name": "lion"}], tmp_path / 'output', state_file=state_file)
+    files = write_tables([{"name": "tiger", "age": 3}], tmp_path / 'output', state_file=state_file)
+    # The new field is added at the end of the header, and the row written before gets no value for it.
+    assert files['root.csv'].splitlines() == ['parent_id,root_id,name,age', ',root_0,lion,', ',root_1,tiger,3']
+
+def test_repeated_write(tmp_path):
+    state_file = str(tmp_path / 'state.json')
+    writer = table_writer([{"name": "lion"}], str(tmp_path), state_file=state_file)
+    writer.transform()
+    writer.write_to_file()
+    writer.write_to_file()
+    assert read_files(tmp_path)['root.csv'].splitlines() == ['parent_id,root_id,name', ',root_0,lion']
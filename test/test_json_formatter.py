@@ -0,0 +1,52 @@
+"""
+Tests of the flattening of json_formatter with the cached column names.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import random
+from ..lib.json_formatter import json_formatter
+from .benchmark import SHAPES
+from .test_writer_modes import RECORDS
+
+def random_value(generator, depth=0):
+    choice = generator.random()
+    if depth > 3 or choice < 0.3:
+        return generator.choice([1, 2.5, "x", None, True, ""])
+    if choice < 0.65:
+        # The keys "0" and "1" share their column names with the indexes of the arrays.
+        return {generator.choice(["a", "b", "0", "1", "a_b"]): random_value(generator, depth + 1) for _ in range(generator.randint(0, 3))}
+    return [random_value(generator, depth + 1) for _ in range(generator.randint(0, 3))]
+
+def documents():
+    yield from RECORDS
+    generator = random.Random(12)
+    yield from (random_value(generator) for _ in range(300))
+    for shape in SHAPES.values():
+        yield from next(iter(shape(20).values()))
+
+def flattened(value):
+    formatter = json_formatter()
+    formatter.flatten_json(value)
+    return list(formatter.store.items())
+
+def test_reused_keys_match_plain_keys():
+    # Each formatter flattens all the documents one after another, so the caches are shared by them,
+    # and a name other than '' adds the values to the store of the previous call.
+    reusing_formatter = json_formatter()
+    plain_formatter = json_formatter()
+    for document in documents():
+        for name in ('', 'lion_'):
+            reusing_formatter.flatten_json(document, name, reuse_keys=True)
+            plain_formatter.flatten_json(document, name)
+            assert list(reusing_formatter.store.items()) == list(plain_formatter.store.items())
+
+def test_repeated_documents():
+    formatter = json_formatter()
+    for _ in range(3):
+        for document in [RECORDS, {"items": RECORDS}, [[1, [2, {"a": 3}]], {"0": [4]}]]:
+            formatter.flatten_json(document, reuse_keys=True)
+            assert list(formatter.store.items()) == flattened(document)
@@ -0,0 +1,85 @@
+"""
+Tests of the JSON Lines mode of table_writer: the files of the lines must be the same as the files of
+the array of the lines, the temporary file of the records is closed after writing, and the source is
+read again by a later transformation.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import io
+import json
+import pytest
+from ..lib import json_lines, table_sink
+from ..lib.writer import table_writer
+from .test_writer_modes import RECORDS, payload, read_files, write_tables
+
+class unseekable_text(io.StringIO):
+    def seekable(self):
+        return False
+
+class failing_sink(table_sink.csv_sink):
+    def write(self, file_name, header, rows):
+        raise OSError("The disk is full.")
+
+@pytest.fixture
+def spools(monkeypatch):
+    created = []
+    row_spool = json_lines.row_spool
+
+    def recording_spool():
+        created.append(row_spool())
+        return created[-1]
+    monkeypatch.setattr(json_lines, 'row_spool', recording_spool)
+    return created
+
+def lines_text(items):
+    return ''.join(json.dumps(item) + '\n' for item in items)
+
+def test_json_lines_mode(payload, tmp_path):
+    items, array_file, lines_file, expected = payload
+    with open(lines_file, 'r', encoding='utf-8') as source_file:
+        assert write_tables(source_file, tmp_path / 'output', is_json_lines=True) == expected
+
+def test_row_spool_is_closed(spools, tmp_path):
+    write_tables(lines_text(RECORDS), tmp_path / 'output', is_json_lines=True)
+    assert len(spools) == 1
+    assert spools[0]._row_spool__file.closed
+
+def test_row_spool_is_closed_on_error(spools, tmp_path):
+    writer = table_writer(lines_text(RECORDS), str(tmp_path), is_json_lines=True, output_format=failing_sink())
+    writer.transform()
+    with pytest.raises(OSError):
+        writer.write_to_file()
+    assert len(spools) == 1
+    assert spools[0]._row_spool__file.closed
+
+@pytest.mark.parametrize("mode", ['is_json_lines', 'is_streaming'])
+@pytest.mark.parametrize("is_file", [True, False], ids=["file", "string"])
+def test_repeated_transformation(mode, is_file, tmp_path):
+    text = lines_text(RECORDS) if mode == 'is_json_lines' else json.dumps(RECORDS)
+    source_path = tmp_path / 'source.json'
+    source_path.write_text('\n' + text, encoding='utf-8')
+    expected = write_tables(RECORDS, tmp_path / 'expected')
+    with open(source_path, 'r', encoding='utf-8') as source_file:
+        # A file is transformed from where it was when the writer first read it.
+        source_file.readline()
+        (tmp_path / 'output').mkdir()
+        writer = table_writer(source_file if is_file else text, str(tmp_path / 'output'), **{mode: True})
+        for _ in range(2):
+            writer.transform()
+            writer.write_to_file()
+            assert read_files(tmp_path / 'output') == expected
+            for output_file in (tmp_path / 'output').iterdir():
+                output_file.unlink()
+
+def test_unseekable_source(tmp_path):
+    writer = table_writer(unseekable_text(lines_text(RECORDS)), str(tmp_path / 'output'), is_json_lines=True)
+    (tmp_path / 'output').mkdir()
+    writer.transform()
+    writer.write_to_file()
+    assert read_files(tmp_path / 'output') == write_tables(RECORDS, tmp_path / 'expected')
+    with pytest.raises(ValueError):
+        writer.transform()
@@ -0,0 +1,77 @@
+"""
+Tests of the passes which run on the explicit-stack traversal engine with documents nested deeper
+than the recursion limit.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import io
+import json
+import sys
+import pytest
+from ..lib import json_traverser
+from ..lib.json_deconstructor import json_deconstructor
+from ..lib.json_formatter import json_formatter
+from ..lib.writer import table_writer, flat_writer
+from .test_writer_modes import read_files, write_tables
+
+def nested_document(depth):
+    document = current = {}
+    for level in range(depth):
+        child = {"level": level}
+        current["child"] = [child] if level % 2 else child
+        current = child
+    return document
+
+def nested_text(depth):
+    # json.dumps is recursive, so the text of the nested document is built level by level.
+    opening = ['{']
+    closing = ['}']
+    for level in range(depth):
+        opening.append('"child": [{' if level % 2 else '"child": {')
+        opening.append('"level": ' + str(level) + ', ')
+        closing.append('}]' if level % 2 else '}')
+    opening[-1] = opening[-1][:-2]
+    return ''.join(opening) + ''.join(reversed(closing))
+
+@pytest.fixture
+def deep_document():
+    return nested_document(sys.getrecursionlimit() + 500)
+
+def test_deconstructor_passes(deep_document):
+    deconstructor = json_deconstructor(deep_document)
+    assert list(deconstructor.fields['child']) == ['parent_id', 'child_id', 'level', 'child']
+    deconstructor.check_pattern(deep_document)
+    with pytest.raises(Exception):
+        deconstructor.check_pattern({"child": nested_document(sys.getrecursionlimit() + 500), "list": [{"a": 1}, {"b": 2}]})
+
+def test_passes_match_shallow_walk(monkeypatch):
+    # The recursive walk and the walk on the explicit stack register the same fields in the same order.
+    document = {"a": [[{"x": 1}], [{"y": 2}, [{"z": 3}]]], "b": {"a": [{"w": 4}]}}
+    expected = {name: list(fields) for name, fields in json_deconstructor(document).fields.items()}
+    monkeypatch.setattr(json_traverser, 'RECURSION_DEPTH', 0)
+    assert {name: list(fields) for name, fields in json_deconstructor(document).fields.items()} == expected
+
+def test_formatter_passes(deep_document):
+    depth = sys.getrecursionlimit() + 500
+    formatter = json_formatter()
+    formatter.json_to_object_list(deep_document)
+    assert len(formatter.tables['child']) == depth
+    formatter = json_formatter()
+    formatter.flatten_json(deep_document)
+    assert len(formatter.store) == depth
+
+def test_writers(deep_document, tmp_path):
+    expected = write_tables(deep_document, tmp_path / 'expected')
+    assert len(expected['child.csv'].splitlines()) == sys.getrecursionlimit() + 501
+    assert json.loads(nested_text(20)) == nested_document(20)
+    with io.StringIO(nested_text(sys.getrecursionlimit() + 500)) as source:
+        assert write_tables(source, tmp_path / 'streaming', is_streaming=True) == expected
+    (tmp_path / 'flat').mkdir()
+    writer = flat_writer(deep_document, str(tmp_path / 'flat'))
+    writer.transform()
+    writer.write_to_file()
+    assert len(read_files(tmp_path / 'flat')) == 1
@@ -0,0 +1,48 @@
+"""
+Tests of the manual mode of table_writer, which writes formatted data given as tables of records,
+and of the validation of the formatted data.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import pytest
+from ..lib.writer import table_writer
+from .test_writer_modes import read_files
+
+TABLES = {
+    "lion": [{"name": "leo", "meal": [1, 2]}, {"name": "noah", "meal": []}],
+    "zoo": [{"city": "Rome"}],
+}
+
+def test_manual_mode(tmp_path):
+    writer = table_writer(TABLES, str(tmp_path), is_manual=True)
+    writer.transform()
+    writer.write_to_file()
+    assert read_files(tmp_path) == {'lion.csv': 'name,meal\r\nleo,"[1, 2]"\r\nnoah,[]\r\n', 'zoo.csv': 'city\r\nRome\r\n'}
+
+@pytest.mark.parametrize("formatted_data, message", [
+    ([{"name": "leo"}], "must be a dictionary"),
+    ({"lion": {"name": "leo"}}, "must be a list"),
+    ({"lion": [{"name": "leo"}, "noah"]}, "The row 1 of the table 'lion' is not"),
+    ({"lion": [{"name": "leo"}, {"name": "noah"}, {"age": 3}]}, "The row 2 of the table 'lion' has different keys"),
+    ({"lion": [{"name": "leo"}, {"name": "noah", "age": 3}]}, "The row 1 of the table 'lion' has different keys"),
+    ({"zoo": [{"city": "Rome"}], "lion": [{"zoo": {"city": "Rome"}}]}, "The field 'zoo' of the row 0 of the table 'lion'"),
+    ({"lion": [{"meal": [1]}, {"meal": [[{"food": "meat"}], [1]]}]}, "The field 'meal' of the row 1 of the table 'lion'"),
+], ids=['not_dictionary', 'not_list', 'not_record', 'missing_keys', 'extra_keys', 'object_value', 'nested_object_value'])
+def test_rejected_data(formatted_data, message, tmp_path):
+    with pytest.raises(TypeError, match=message):
+        table_writer(formatted_data, str(tmp_path), is_manual=True)
+    writer = table_writer(TABLES, str(tmp_path), is_manual=True)
+    with pytest.raises(TypeError, match=message):
+        writer.manual_data = formatted_data
+
+def test_unvalidated_data(tmp_path):
+    formatted_data = {"lion": [{"name": "leo"}, {"name": "noah", "age": 3}]}
+    writer = table_writer(formatted_data, str(tmp_path), is_manual=True, validate=False)
+    assert writer.manual_data is formatted_data
+    writer.manual_data = {"lion": [{"name": "leo"}, {"age": 3}]}
+    writer.write_to_file()
+    assert read_files(tmp_path)['lion.csv'].splitlines()[0] == 'name'
@@ -0,0 +1,23 @@
+"""
+Tests of the pipeline metrics of table_writer: the stages which are measured, and the rows and the
+bytes written for each table.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+from ..lib import metrics
+from .test_writer_modes import RECORDS, write_tables
+
+def test_metrics(tmp_path):
+    collected = metrics.pipeline_metrics()
+    files = write_tables(RECORDS, tmp_path / 'output', metrics=collected)
+    report = collected.report()
+    assert {'parse', 'transform', 'write'} <= set(report['stages'])
+    assert set(report['tables']) == {name[:-4] for name in files}
+    for name, content in files.items():
+        table = report['tables'][name[:-4]]
+        assert table['rows'] == len(content.splitlines()) - 1
+        assert table['bytes'] == len(content.encode('utf-8'))
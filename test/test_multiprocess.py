@@ -0,0 +1,84 @@
+"""
+Tests of the multi-process mode of table_writer: the chunks of a top-level array or of a JSON Lines
+file must give the same files as the in-memory table mode, the top-level array is split at the
+right commas in linear time, and the chunks are limited to the worker IDs of the ID generator.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import json
+import pytest
+import time
+from ..lib import id_generator, json_array, json_lines
+from .test_writer_modes import payload, read_files, write_tables
+
+@pytest.mark.parametrize("is_json_lines", [False, True], ids=["array", "json_lines"])
+def test_multiprocess_mode(payload, tmp_path, is_json_lines):
+    items, array_file, lines_file, expected = payload
+    with open(lines_file if is_json_lines else array_file, 'r', encoding='utf-8') as source_file:
+        assert write_tables(source_file, tmp_path / 'output', is_json_lines=is_json_lines, max_processes=2) == expected
+
+def test_multiprocess_mode_of_quoted_structure(tmp_path):
+    items = [{"a": 1}, "{", "},", 5, {"b": "[\"],{\\"}, ["\\\"", ",", {"c": "}]"}], {"d": [1, 2]}]
+    array_file = tmp_path / 'quoted.json'
+    array_file.write_text(json.dumps(items), encoding='utf-8')
+    chunks, item_counts = json_array.split_json_array(str(array_file), 4)
+    chunk_items = [json.loads(b'[' + array_file.read_bytes()[start:end] + b']') for start, end in chunks]
+    assert [item for chunk in chunk_items for item in chunk] == items
+    assert item_counts == [len(chunk) for chunk in chunk_items[:-1]]
+    expected = write_tables(items, tmp_path / 'expected')
+    with open(array_file, 'r', encoding='utf-8') as source_file:
+        assert write_tables(source_file, tmp_path / 'output', max_processes=2) == expected
+
+def test_split_of_scalar_array_is_linear(tmp_path):
+    array_file = tmp_path / 'scalars.json'
+    array_file.write_text(json.dumps([{"a": 1}] + list(range(200000)) + ["x,]"] * 1000), encoding='utf-8')
+    started = time.perf_counter()
+    chunks, item_counts = json_array.split_json_array(str(array_file), 4)
+    assert time.perf_counter() - started < 5
+    assert chunks == [(1, array_file.stat().st_size - 1)] and item_counts == []
+
+def test_limit_chunk_count():
+    assert json_lines.limit_chunk_count(4096, id_generator.snowflake_id_generator(worker_id=0)) == 1024
+    assert json_lines.limit_chunk_count(4096, id_generator.random_id_generator()) == 4096
+    assert json_lines.limit_chunk_count(4096) == 4096
+
+@pytest.mark.parametrize("is_json_lines", [False, True], ids=["array", "json_lines"])
+def test_chunks_of_snowflake_ids(is_json_lines, tmp_path, monkeypatch):
+    # A file of 64 GiB would be split into more than 1024 chunks of 64 MiB, which is modelled with
+    # chunks of 64 bytes and 3 worker IDs.
+    counts = []
+    for module, name in ((json_array, 'split_json_array'), (json_lines, 'split_json_lines')):
+        split = getattr(module, name)
+        monkeypatch.setattr(module, name, lambda path, count, split=split: counts.append(count) or split(path, count))
+    generator = id_generator.snowflake_id_generator(worker_id=0)
+    generator.max_workers = 3
+
+    items = [{"name": "lion", "zoo": {"city": "Rome"}}] * 100
+    source_file = tmp_path / 'source.json'
+    (tmp_path / 'output').mkdir()
+    if is_json_lines:
+        source_file.write_text(''.join(json.dumps(item) + '\n' for item in items), encoding='utf-8')
+        json_lines.write_json_lines(str(source_file), str(tmp_path / 'output'), 4, True, '', generator)
+    else:
+        source_file.write_text(json.dumps(items), encoding='utf-8')
+        json_array.write_json_array(str(source_file), str(tmp_path / 'output'), 2, True, '', generator, chunk_size=64)
+    assert counts == [3]
+    files = read_files(tmp_path / 'output')
+    root_ids = [row.split(',')[1] for row in files['root.csv'].splitlines()[1:]]
+    assert len(set(root_ids)) == len(items)
+    assert [row.split(',')[0] for row in files['zoo.csv'].splitlines()[1:]] == root_ids
+
+def test_too_many_chunks(tmp_path):
+    lines_file = tmp_path / 'source.jsonl'
+    lines_file.write_text('{"name": "lion"}\n' * 4, encoding='utf-8')
+    chunks = [(index * 17, index * 17 + 17) for index in range(4)]
+    generator = id_generator.snowflake_id_generator(worker_id=0)
+    generator.max_workers = 3
+    with pytest.raises(ValueError):
+        json_lines.write_chunks(json_lines._iter_file_lines, str(lines_file), chunks, json_lines._count_file_lines,
+                                str(tmp_path), 2, True, '', generator)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['source.jsonl']
@@ -0,0 +1,31 @@
+"""
+Tests of the schema cache of the streaming mode against the in-memory table mode.
+
+The streaming mode with a schema cache must write the same files as the in-memory table mode on a
+miss, on a hit of the in-memory entries and on a hit of the entries loaded from the cache directory,
+including the tables whose objects are all empty.
+"""
+import io
+import json
+import pytest
+from ..lib.schema_cache import schema_cache
+from .test_writer_modes import write_tables
+
+SOURCES = {
+    "empty_item": [{}],
+    "empty_child": {"e": {}},
+    "empty_items": {"a": 1, "e": {}, "l": [{}, {}], "m": [{"x": 1}, {}]},
+    "empty_children": [{"name": "lion", "zoo": {}}, {"name": "tiger", "zoo": {}, "meal": [{}]}],
+}
+
+@pytest.mark.parametrize("source", list(SOURCES.values()), ids=list(SOURCES))
+def test_schema_cache_of_empty_objects(source, tmp_path):
+    expected = write_tables(source, tmp_path / 'expected')
+    cache = schema_cache(path=str(tmp_path / 'cache'))
+    for run in range(2):
+        assert write_tables(io.StringIO(json.dumps(source)), tmp_path / ('output' + str(run)), is_streaming=True, schema_cache=cache) == expected
+    assert (cache.hits, cache.misses, cache.invalidations) == (1, 1, 0)
+
+    reloaded_cache = schema_cache(path=str(tmp_path / 'cache'))
+    assert write_tables(io.StringIO(json.dumps(source)), tmp_path / 'reloaded', is_streaming=True, schema_cache=reloaded_cache) == expected
+    assert reloaded_cache.hits == 1
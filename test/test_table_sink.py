@@ -0,0 +1,105 @@
+"""
+Tests of the output sinks of table_writer: a custom sink, the Parquet and Arrow sinks, which write
+the tables in batches of a fixed size, and the empty tables, which every sink writes as a file
+without columns.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import pytest
+from ..lib import table_sink
+from ..lib.writer import table_writer
+from .test_writer_modes import write_tables
+
+ZOOS = [
+    {"name": "lion", "zoo": {"city": "Rome"}},
+    {"name": "tiger", "zoo": {"city": "Rome"}},
+    {"name": "bear", "zoo": {"city": "Paris"}},
+]
+
+class tsv_sink(table_sink.table_sink):
+    extension = '.tsv'
+    missing = ''
+
+    def write(self, file_name, header, rows):
+        with open(file_name + self.extension, 'w', encoding='utf-8') as tsv_file:
+            if header is not None:
+                tsv_file.write('\t'.join(header) + '\n')
+                for row in rows:
+                    tsv_file.write('\t'.join(str(value) for value in row) + '\n')
+
+def read_arrow_table(output_format, path):
+    pyarrow = pytest.importorskip('pyarrow')
+    if output_format == 'parquet':
+        import pyarrow.parquet
+        return pyarrow.parquet.read_table(str(path))
+    import pyarrow.ipc
+    return pyarrow.ipc.open_file(str(path)).read_all()
+
+def test_custom_sink(tmp_path):
+    expected = write_tables(ZOOS, tmp_path / 'expected')
+    files = write_tables(ZOOS, tmp_path / 'output', output_format=tsv_sink())
+    assert {name[:-4]: content.replace('\t', ',') for name, content in files.items()} == \
+           {name[:-4]: content.replace('\r\n', '\n') for name, content in expected.items()}
+
+@pytest.mark.parametrize("output_format", ['parquet', 'arrow'])
+def test_arrow_sinks(output_format, tmp_path):
+    pytest.importorskip('pyarrow')
+    writer = table_writer(ZOOS, str(tmp_path), output_format=output_format)
+    writer.transform()
+    writer.write_to_file()
+    table = read_arrow_table(output_format, tmp_path / ('zoo.' + output_format))
+    assert table.column_names == ['parent_id', 'zoo_id', 'city']
+    assert table.column('city').to_pylist() == ['Rome', 'Rome', 'Paris']
+
+def test_row_source():
+    sources = []
+    rows = table_sink.row_source(lambda *args: sources.append(args) or iter([('leo', 6)]), 'lion', None)
+    assert list(rows) == list(rows) == [('leo', 6)]
+    assert sources == [('lion', None), ('lion', None)]
+
+@pytest.mark.parametrize("output_format", ['parquet', 'arrow'])
+def test_batched_arrow_sinks(output_format, tmp_path):
+    pyarrow = pytest.importorskip('pyarrow')
+    header = ['parent_id', 'lion_id', 'age', 'weight', 'tag', 'code', 'note']
+    # The types of the batches differ: ints and doubles make doubles, ints beyond the doubles and
+    # doubles, or ints and strings, make strings, and a column of nulls stays null.
+    rows = [('', 'lion_0', 1, 1, 1, 2**60, None), ('', 'lion_1', 2, None, 2, 2**60, None),
+            ('', 'lion_2', 3, 2.5, 'three', 1.5, None), ('', 'lion_3', None, 3.5, None, None, None),
+            ('', 'lion_4', 5, 4, 5, 5, None)]
+    sink = table_sink.get_sink(output_format)
+    if output_format == 'parquet':
+        sink.row_group_size = 2
+    else:
+        sink.batch_size = 2
+    sink.write(str(tmp_path / 'lion'), header, table_sink.row_source(iter, rows))
+
+    table = read_arrow_table(output_format, tmp_path / ('lion.' + output_format))
+    assert table.schema.types == [pyarrow.string(), pyarrow.string(), pyarrow.int64(), pyarrow.float64(),
+                                  pyarrow.string(), pyarrow.string(), pyarrow.null()]
+    assert table.column('weight').to_pylist() == [1.0, None, 2.5, 3.5, 4.0]
+    assert table.column('tag').to_pylist() == ['1', '2', 'three', None, '5']
+    assert table.column('code').to_pylist() == [str(2**60), str(2**60), '1.5', None, '5']
+    if output_format == 'parquet':
+        import pyarrow.parquet
+        assert pyarrow.parquet.ParquetFile(str(tmp_path / 'lion.parquet')).num_row_groups == 3
+    else:
+        import pyarrow.ipc
+        assert pyarrow.ipc.open_file(str(tmp_path / 'lion.arrow')).num_record_batches == 3
+
+@pytest.mark.parametrize("output_format", ['csv', 'parquet', 'arrow', tsv_sink()], ids=['csv', 'parquet', 'arrow', 'tsv'])
+def test_empty_tables(output_format, tmp_path):
+    if output_format in ('parquet', 'arrow'):
+        pytest.importorskip('pyarrow')
+    sink = table_sink.get_sink(output_format)
+    sink.write(str(tmp_path / 'lion'), None, ())
+    path = tmp_path / ('lion' + sink.extension)
+    assert path.exists()
+    if output_format in ('parquet', 'arrow'):
+        table = read_arrow_table(output_format, path)
+        assert (table.column_names, table.num_rows) == ([], 0)
+    else:
+        assert path.read_text() == ''
@@ -0,0 +1,58 @@
+"""
+Tests of the output modes of table_writer against the in-memory table mode.
+
+Every mode which converts the same source must write the same files as the in-memory table mode:
+the streaming mode here, and the other output modes in their own modules against the same payloads.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import json
+import os
+import pytest
+from ..lib.writer import table_writer
+from .benchmark import SHAPES
+
+RECORDS = [
+    {"name": "lion", "years old": 12, "meal": [1, 2, 3], "zoo": {"city": "Rome", "zone": 1}},
+    {"name": "tiger", "meal": [{"food": "meat", "kg": 4}, {"food": "fish"}], "tags": []},
+    {"name": "bear", "zoo": {}, "cubs": [[{"name": "a"}], [], [1, 2]], "note": None},
+    {"name": "wolf", "years old": 3.5, "alive": True, "zoo": {"city": "Paris", "keeper": {"name": "Ann"}}},
+]
+
+def payloads():
+    yield "records", RECORDS
+    for name, shape in SHAPES.items():
+        yield name, next(iter(shape(120).values()))
+
+def read_files(path):
+    files = {}
+    for name in sorted(os.listdir(path)):
+        with open(os.path.join(path, name), 'r', encoding='utf-8', newline='') as output_file:
+            files[name] = output_file.read()
+    return files
+
+def write_tables(source, output_path, **options):
+    os.makedirs(output_path, exist_ok=True)
+    writer = table_writer(source, str(output_path), **options)
+    writer.transform()
+    writer.write_to_file()
+    return read_files(output_path)
+
+@pytest.fixture(params=list(payloads()), ids=lambda payload: payload[0])
+def payload(request, tmp_path):
+    name, items = request.param
+    array_file = tmp_path / (name + '.json')
+    array_file.write_text(json.dumps(items), encoding='utf-8')
+    lines_file = tmp_path / (name + '.jsonl')
+    lines_file.write_text(''.join(json.dumps(item) + '\n' for item in items), encoding='utf-8')
+    expected = write_tables(items, tmp_path / 'expected')
+    return items, array_file, lines_file, expected
+
+def test_streaming_mode(payload, tmp_path):
+    items, array_file, lines_file, expected = payload
+    with open(array_file, 'r', encoding='utf-8') as source_file:
+        assert write_tables(source_file, tmp_path / 'output', is_streaming=True) == expected
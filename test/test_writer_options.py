@@ -0,0 +1,100 @@
+"""
+Tests of the options of table_writer: the combinations of options which are allowed and rejected.
+The behaviour of each mode is tested in its own module.
+
+Run them from the folder outside the json_to_csv folder:
+
+```
+python -m pytest json_to_csv/test
+```
+"""
+import json
+import pytest
+from ..lib import writer
+from ..lib.schema_cache import schema_cache
+from ..lib.writer import table_writer
+from .test_writer_modes import RECORDS
+
+ALLOWED = {
+    "defaults": {},
+    "dedup_content_ids": {"dedup": True, "id_strategy": 'content'},
+    "streaming_schema_cache": {"is_streaming": True, "schema_cache": schema_cache()},
+    "streaming_snowflake_ids": {"is_streaming": True, "id_strategy": 'snowflake'},
+    "json_lines_processes": {"is_json_lines": True, "max_processes": 2},
+    "processes_random_ids": {"max_processes": 2, "id_strategy": 'random', "max_workers": 4},
+    "incremental_uuid_ids": {"state_file": 'state.json', "id_strategy": 'uuid'},
+    "parquet_workers": {"output_format": 'parquet', "max_workers": 4},
+}
+
+REJECTED = {
+    "unknown_backend": ({"backend": 'numpy'}, ValueError),
+    "unknown_output_format": ({"output_format": 'xlsx'}, ValueError),
+    "unknown_id_strategy": ({"id_strategy": 'counter'}, ValueError),
+    "pandas_streaming": ({"backend": 'pandas', "is_streaming": True}, ValueError),
+    "parquet_streaming": ({"output_format": 'parquet', "is_streaming": True}, ValueError),
+    "arrow_pandas": ({"output_format": 'arrow', "backend": 'pandas'}, ValueError),
+    "content_ids_streaming": ({"id_strategy": 'content', "is_streaming": True}, ValueError),
+    "dedup_streaming": ({"dedup": True, "is_streaming": True}, ValueError),
+    "incremental_streaming": ({"state_file": 'state.json', "is_streaming": True}, ValueError),
+    "incremental_manual": ({"state_file": 'state.json', "is_manual": True}, ValueError),
+    "incremental_pandas": ({"state_file": 'state.json', "backend": 'pandas'}, ValueError),
+    "incremental_arrow": ({"state_file": 'state.json', "output_format": 'arrow'}, ValueError),
+    "schema_cache_in_memory": ({"schema_cache": schema_cache()}, ValueError),
+    "json_lines_streaming": ({"is_json_lines": True, "is_streaming": True}, ValueError),
+    "json_lines_pandas": ({"is_json_lines": True, "backend": 'pandas'}, ValueError),
+    "json_lines_incremental": ({"is_json_lines": True, "state_file": 'state.json'}, ValueError),
+    "no_processes": ({"max_processes": 0}, ValueError),
+    "processes_incremental": ({"max_processes": 2, "state_file": 'state.json'}, ValueError),
+    "processes_streaming": ({"max_processes": 2, "is_streaming": True}, ValueError),
+    "processes_pandas": ({"max_processes": 2, "backend": 'pandas'}, ValueError),
+    "processes_parquet": ({"max_processes": 2, "output_format": 'parquet'}, ValueError),
+    "processes_dedup": ({"max_processes": 2, "dedup": True}, ValueError),
+    "no_workers": ({"max_workers": 0}, ValueError),
+    "schema_cache_pandas": ({"backend": 'pandas', "schema_cache": schema_cache()}, ValueError),
+    "manual_processes": ({"is_manual": True, "max_processes": 2}, ValueError),
+}
+
+@pytest.fixture
+def source_file(tmp_path):
+    array_file = tmp_path / 'records.json'
+    array_file.write_text(json.dumps(RECORDS), encoding='utf-8')
+    with open(array_file, 'r', encoding='utf-8') as opened_file:
+        yield opened_file
+
+def with_state_file(options, tmp_path):
+    if 'state_file' in options:
+        options = dict(options, state_file=str(tmp_path / options['state_file']))
+    return options
+
+@pytest.mark.parametrize("options", list(ALLOWED.values()), ids=list(ALLOWED))
+def test_allowed_options(options, source_file, tmp_path):
+    table_writer(source_file, str(tmp_path), **with_state_file(options, tmp_path))
+
+@pytest.mark.parametrize("options, error", list(REJECTED.values()), ids=list(REJECTED))
+def test_rejected_options(options, error, source_file, tmp_path):
+    with pytest.raises(error):
+        table_writer(source_file, str(tmp_path), **with_state_file(options, tmp_path))
+
+def test_rejected_sources(tmp_path):
+    with pytest.raises(TypeError):
+        table_writer(RECORDS, str(tmp_path), is_streaming=True)
+    with pytest.raises(TypeError):
+        table_writer(json.dumps(RECORDS), str(tmp_path), max_processes=2)
+    object_file = tmp_path / 'object.json'
+    object_file.write_text(json.dumps({"records": RECORDS}), encoding='utf-8')
+    with open(object_file, 'r', encoding='utf-8') as source_file:
+        with pytest.raises(ValueError):
+            table_writer(source_file, str(tmp_path), max_processes=2)
+
+def test_rejection_messages(source_file, tmp_path):
+    with pytest.raises(ValueError, match="^The streaming mode cannot be combined with the pandas backend.$"):
+        table_writer(source_file, str(tmp_path), is_streaming=True, backend='pandas')
+    with pytest.raises(ValueError, match="^Several processes cannot be combined with the dedup mode.$"):
+        table_writer(source_file, str(tmp_path), max_processes=2, dedup=True)
+
+@pytest.mark.parametrize("mode, conflict", [(mode, conflict) for mode, conflicts in writer._MODE_CONFLICTS.items() for conflict in conflicts])
+def test_mode_conflicts(mode, conflict):
+    modes = dict.fromkeys(writer._MODE_NAMES, False)
+    modes[mode] = modes[conflict] = True
+    with pytest.raises(ValueError, match="cannot be combined with " + writer._MODE_NAMES[conflict]):
+        writer._check_modes(modes)